@@ -1,12 +1,20 @@
 """PCGS Public API client module."""
 
-from .pcgs_api import PCGSApiClient, PCGSApiError, AuthenticationError, QuotaExceededError
+from .pcgs_api import PCGSApiClient, PCGSApiError, AuthenticationError, QuotaExceededError, BatchResult
+from .response_extractor import CoinFacts, AuctionRecord, extract_coin_facts, extract_auction_records
+from .token_store import TokenStore
 
 __all__ = [
     'PCGSApiClient',
     'PCGSApiError',
     'AuthenticationError',
     'QuotaExceededError',
+    'BatchResult',
+    'CoinFacts',
+    'AuctionRecord',
+    'extract_coin_facts',
+    'extract_auction_records',
+    'TokenStore',
 ]
 
 # QuotaTracker imported lazily to avoid circular imports during initial creation
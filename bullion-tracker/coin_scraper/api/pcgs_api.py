@@ -12,13 +12,18 @@ API Documentation: https://api.pcgs.com/publicapi/swagger/ui/index
 """
 
 import os
+import time
 import asyncio
 import logging
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, Tuple, AsyncIterator
 
 import httpx
 
+from .response_cache import ResponseCache, make_cache_key
+from .token_store import TokenStore
+
 logger = logging.getLogger(__name__)
 
 
@@ -45,6 +50,20 @@ class RateLimitError(PCGSApiError):
     pass
 
 
+@dataclass
+class BatchResult:
+    """Outcome of one (pcgs_number, grade) lookup in a batch."""
+    pcgs_number: int
+    grade: str
+    data: Optional[Dict[str, Any]] = None
+    error: Optional[PCGSApiError] = None
+    elapsed: float = 0.0  # Seconds spent on the lookup (near zero for cache hits)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.data is not None
+
+
 class PCGSApiClient:
     """
     Async client for PCGS Public API.
@@ -53,27 +72,69 @@ class PCGSApiClient:
         async with PCGSApiClient() as client:
             await client.authenticate()
             coin = await client.get_coin_by_cert("12345678")
+
+            async for result in client.get_coins_by_pcgs_and_grade(pairs):
+                ...
     """
 
     BASE_URL = "https://api.pcgs.com/publicapi"
     TOKEN_EXPIRY_BUFFER = timedelta(minutes=5)  # Refresh 5 min before expiry
+    TOKEN_REFRESH_AHEAD = timedelta(hours=1)  # Start background refresh this long before the buffer
     MAX_RETRIES = 3
     RETRY_BACKOFF = 2  # seconds
+    DEFAULT_CONCURRENCY = 4
+    DEFAULT_REQUESTS_PER_SECOND = 4.0
 
-    def __init__(self, quota_tracker=None):
+    def __init__(self, quota_tracker=None, max_concurrency: Optional[int] = None,
+                 requests_per_second: Optional[float] = None,
+                 cache: Optional[ResponseCache] = None, bypass_cache: bool = False,
+                 token_store: Optional[TokenStore] = None, rate_limiter=None):
         """
         Initialize PCGS API client.
 
         Args:
             quota_tracker: Optional QuotaTracker instance for rate limiting
+            max_concurrency: Max in-flight requests for batch lookups
+            requests_per_second: Max request start rate across all callers
+            cache: Response cache to use. Defaults to data/api_cache.db
+            bypass_cache: If True, never read cached responses (fresh
+                responses are still written to the cache)
+            token_store: Where the access token is persisted across
+                processes. Defaults to data/pcgs_token.json
+            rate_limiter: Optional limiter shared with other processes (e.g.
+                shared_limits.RedisTokenBucket); each request start awaits
+                its acquire() after the local requests_per_second spacing
         """
         self.username = os.getenv("PCGS_USERNAME")
         self.password = os.getenv("PCGS_PASSWORD")
         self.quota_tracker = quota_tracker
+        self.cache = cache or ResponseCache()
+        self.bypass_cache = bypass_cache
+        self.stats = {
+            'requests': 0,
+            'api_calls': 0,
+            'cache_hits': 0,
+            'cache_misses': 0,
+            'coalesced': 0,
+        }
+        self.max_concurrency = max_concurrency or self.DEFAULT_CONCURRENCY
+        self.requests_per_second = requests_per_second or self.DEFAULT_REQUESTS_PER_SECOND
+        self.rate_limiter = rate_limiter
 
         self._access_token: Optional[str] = None
         self._token_expires_at: Optional[datetime] = None
         self._client: Optional[httpx.AsyncClient] = None
+        self.token_store = token_store or TokenStore()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+        # Concurrency state (all access happens on one event loop)
+        self._auth_lock = asyncio.Lock()
+        self._rate_lock = asyncio.Lock()
+        self._next_request_at = 0.0
+
+        # Single-flight: request key -> shared task / number of waiters
+        self._pending: Dict[str, asyncio.Task] = {}
+        self._pending_waiters: Dict[str, int] = {}
 
     async def __aenter__(self):
         """Async context manager entry."""
@@ -88,6 +149,9 @@ class PCGSApiClient:
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
+        if self._refresh_task and not self._refresh_task.done():
+            self._refresh_task.cancel()
+            await asyncio.gather(self._refresh_task, return_exceptions=True)
         if self._client:
             await self._client.aclose()
             self._client = None
@@ -99,21 +163,30 @@ class PCGSApiClient:
                 "PCGS credentials not set. Please set PCGS_USERNAME and PCGS_PASSWORD environment variables."
             )
 
-    def _check_quota(self):
-        """Check if API quota is available."""
+    def _reserve_quota(self):
+        """
+        Count a call against the daily quota before sending it.
+
+        The tracker checks and counts in one step, so concurrent requests
+        (and, with RedisQuotaTracker, other workers) can't overshoot the limit.
+        """
+        if self.quota_tracker and not self.quota_tracker.reserve_call():
+            status = self.quota_tracker.get_status()
+            raise QuotaExceededError(
+                f"Daily API quota exceeded. {status['calls_made']}/{status['daily_limit']} calls used. "
+                f"Resets at midnight (next day: {status['date']})."
+            )
+
+    def _release_quota(self):
+        """Give back a reserved call whose request did not complete."""
         if self.quota_tracker:
-            if not self.quota_tracker.check_quota():
-                status = self.quota_tracker.get_status()
-                raise QuotaExceededError(
-                    f"Daily API quota exceeded. {status['calls_made']}/{status['daily_limit']} calls used. "
-                    f"Resets at midnight (next day: {status['date']})."
-                )
+            self.quota_tracker.release_call()
 
     def _record_call(self):
-        """Record an API call to quota tracker."""
+        """Count a completed API call (its quota was reserved before sending)."""
+        self.stats['api_calls'] += 1
         if self.quota_tracker:
-            remaining = self.quota_tracker.record_call()
-            logger.info(f"API call recorded. {remaining} calls remaining today.")
+            logger.info(f"API call recorded. {self.quota_tracker.get_remaining()} calls remaining today.")
 
     def _is_token_valid(self) -> bool:
         """Check if current token is still valid."""
@@ -122,10 +195,38 @@ class PCGSApiClient:
         # Add buffer to refresh before actual expiry
         return datetime.now() < (self._token_expires_at - self.TOKEN_EXPIRY_BUFFER)
 
-    async def authenticate(self) -> str:
+    def _should_refresh_ahead(self) -> bool:
+        """Check if a still-valid token is close enough to expiry to refresh in background."""
+        if not self._token_expires_at:
+            return False
+        refresh_at = self._token_expires_at - self.TOKEN_EXPIRY_BUFFER - self.TOKEN_REFRESH_AHEAD
+        return datetime.now() >= refresh_at
+
+    def _load_persisted_token(self) -> bool:
+        """Adopt a token persisted by this or another process, if still valid."""
+        stored = self.token_store.load(self.username)
+        if not stored:
+            return False
+
+        self._access_token, self._token_expires_at = stored
+        if self._is_token_valid():
+            logger.debug(f"Using persisted token (expires at {self._token_expires_at})")
+            return True
+
+        self._access_token = None
+        self._token_expires_at = None
+        return False
+
+    async def authenticate(self, force: bool = False) -> str:
         """
         Authenticate with PCGS API using OAuth2 password grant.
 
+        A valid token held in memory or persisted on disk is reused without
+        a network call unless force is True.
+
+        Args:
+            force: Always request a new token from the API
+
         Returns:
             Access token string
 
@@ -134,9 +235,12 @@ class PCGSApiClient:
         """
         self._check_credentials()
 
-        if self._is_token_valid():
-            logger.debug("Using cached valid token")
-            return self._access_token
+        if not force:
+            if self._is_token_valid():
+                logger.debug("Using cached valid token")
+                return self._access_token
+            if self._load_persisted_token():
+                return self._access_token
 
         logger.info("Authenticating with PCGS API...")
 
@@ -162,6 +266,7 @@ class PCGSApiClient:
             self._token_expires_at = datetime.now() + timedelta(seconds=expires_in)
 
             logger.info(f"Authentication successful. Token expires at {self._token_expires_at}")
+            self.token_store.save(self.username, self._access_token, self._token_expires_at)
             return self._access_token
 
         except httpx.HTTPStatusError as e:
@@ -172,23 +277,154 @@ class PCGSApiClient:
     async def _ensure_authenticated(self):
         """Ensure we have a valid token, refreshing if needed."""
         if not self._is_token_valid():
-            await self.authenticate()
+            async with self._auth_lock:
+                # Another coroutine may have refreshed while we waited
+                if not self._is_token_valid():
+                    await self.authenticate()
+
+        if self._should_refresh_ahead() and not (self._refresh_task and not self._refresh_task.done()):
+            self._refresh_task = asyncio.ensure_future(self._refresh_ahead())
 
-    async def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+    async def _refresh_ahead(self):
+        """Replace a soon-to-expire token in the background without blocking requests."""
+        async with self._auth_lock:
+            # Another process may already have refreshed the persisted token
+            if self._load_persisted_token() and not self._should_refresh_ahead():
+                return
+            try:
+                logger.info("Token nearing expiry, refreshing in background...")
+                await self.authenticate(force=True)
+            except PCGSApiError as e:
+                # The current token is still valid; the next request retries
+                logger.warning(f"Background token refresh failed: {e}")
+
+    async def _throttle(self):
+        """Space request starts to at most requests_per_second."""
+        interval = 1.0 / self.requests_per_second
+        async with self._rate_lock:
+            now = time.monotonic()
+            wait = self._next_request_at - now
+            if wait > 0:
+                await asyncio.sleep(wait)
+                now = time.monotonic()
+            self._next_request_at = now + interval
+            if self.rate_limiter:
+                await self.rate_limiter.acquire()
+
+    def get_stats(self) -> Dict[str, Any]:
         """
-        Make an authenticated API request with retry logic.
+        Get request statistics for this client.
+
+        Returns:
+            Dict with requests, api_calls, cache_hits, cache_misses, coalesced,
+            hit_rate and quota_saved (API calls avoided by the cache or by
+            sharing an identical in-flight request)
+        """
+        lookups = self.stats['cache_hits'] + self.stats['cache_misses']
+        return {
+            **self.stats,
+            'hit_rate': self.stats['cache_hits'] / lookups if lookups else 0.0,
+            'quota_saved': self.stats['cache_hits'] + self.stats['coalesced'],
+        }
+
+    async def _make_request(self, method: str, endpoint: str, bypass_cache: bool = False,
+                            **kwargs) -> Dict[str, Any]:
+        """
+        Make an authenticated API request with caching and retry logic.
+
+        GET responses are served from the response cache when fresh, which
+        costs no authentication, network round-trip or quota call. Concurrent
+        identical GETs share one in-flight request and one quota charge.
 
         Args:
             method: HTTP method (GET, POST, etc.)
             endpoint: API endpoint (without base URL)
+            bypass_cache: Skip the cache read for this request
             **kwargs: Additional arguments to pass to httpx
 
         Returns:
             JSON response as dict
         """
+        self.stats['requests'] += 1
+        cacheable = method.upper() == "GET"
+        params = kwargs.get("params")
+
+        if cacheable and not (bypass_cache or self.bypass_cache):
+            cached = self.cache.get(endpoint, params)
+            if cached is not None:
+                self.stats['cache_hits'] += 1
+                return cached
+            self.stats['cache_misses'] += 1
+
+        if not cacheable:
+            return await self._fetch(method, endpoint, **kwargs)
+
+        return await self._single_flight(
+            f"{method.upper()} {make_cache_key(endpoint, params)}",
+            lambda: self._fetch_and_cache(method, endpoint, **kwargs),
+        )
+
+    async def _fetch_and_cache(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+        """Fetch from the API and store the response in the cache."""
+        data = await self._fetch(method, endpoint, **kwargs)
+
+        # Don't cache "not found"/invalid responses; they may be transient
+        if not (isinstance(data, dict) and data.get("IsValidRequest") is False):
+            self.cache.set(endpoint, kwargs.get("params"), data)
+
+        return data
+
+    async def _single_flight(self, key: str, factory) -> Dict[str, Any]:
+        """
+        Run factory() once per key among concurrent callers.
+
+        The first caller starts the request; later callers with the same key
+        await the same task. The shared task is only cancelled once every
+        waiter has gone away.
+        """
+        task = self._pending.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._pending[key] = task
+            self._pending_waiters[key] = 0
+
+            def _cleanup(done: asyncio.Task):
+                if self._pending.get(key) is done:
+                    del self._pending[key]
+                    del self._pending_waiters[key]
+                # Mark exceptions retrieved in case every waiter was cancelled
+                if not done.cancelled():
+                    done.exception()
+
+            task.add_done_callback(_cleanup)
+        else:
+            self.stats['coalesced'] += 1
+            logger.debug(f"Coalesced with in-flight request: {key}")
+
+        self._pending_waiters[key] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done():
+                self._pending_waiters[key] -= 1
+                if self._pending_waiters[key] == 0:
+                    task.cancel()
+            raise
+
+    async def _fetch(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+        """Authenticate, reserve quota and send a request to the API."""
         await self._ensure_authenticated()
-        self._check_quota()
+        self._reserve_quota()
 
+        try:
+            return await self._send_with_retries(method, endpoint, **kwargs)
+        except BaseException:
+            # Failed or cancelled: the reservation isn't a completed call
+            self._release_quota()
+            raise
+
+    async def _send_with_retries(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+        """Send a request, retrying server and network errors with backoff."""
         url = f"{self.BASE_URL}/{endpoint.lstrip('/')}"
         headers = {
             "Authorization": f"bearer {self._access_token}",
@@ -197,6 +433,7 @@ class PCGSApiClient:
 
         last_error = None
         for attempt in range(self.MAX_RETRIES):
+            await self._throttle()
             try:
                 response = await self._client.request(
                     method, url, headers=headers, **kwargs
@@ -206,8 +443,11 @@ class PCGSApiClient:
                 if response.status_code == 401:
                     # Token expired, re-authenticate and retry
                     logger.warning("Token expired, re-authenticating...")
-                    self._access_token = None
-                    await self.authenticate()
+                    rejected = headers["Authorization"].split(" ", 1)[1]
+                    self.token_store.clear(rejected)
+                    if rejected == self._access_token:
+                        self._access_token = None
+                    await self._ensure_authenticated()
                     headers["Authorization"] = f"bearer {self._access_token}"
                     continue
 
@@ -239,12 +479,13 @@ class PCGSApiClient:
 
         raise PCGSApiError(f"Request failed after {self.MAX_RETRIES} retries: {last_error}")
 
-    async def get_coin_by_cert(self, cert_no: str) -> Dict[str, Any]:
+    async def get_coin_by_cert(self, cert_no: str, bypass_cache: bool = False) -> Dict[str, Any]:
         """
         Get coin data by certificate number.
 
         Args:
             cert_no: PCGS certificate number (7-8 digits)
+            bypass_cache: Fetch from the API even if a cached response exists
 
         Returns:
             Coin data including price guide values
@@ -255,16 +496,19 @@ class PCGSApiClient:
         logger.info(f"Fetching coin by cert number: {cert_no}")
         return await self._make_request(
             "GET",
-            f"/coindetail/GetCoinFactsByCertNo/{cert_no}"
+            f"/coindetail/GetCoinFactsByCertNo/{cert_no}",
+            bypass_cache=bypass_cache,
         )
 
-    async def get_coin_by_pcgs_and_grade(self, pcgs_number: int, grade: str) -> Dict[str, Any]:
+    async def get_coin_by_pcgs_and_grade(self, pcgs_number: int, grade: str,
+                                         bypass_cache: bool = False) -> Dict[str, Any]:
         """
         Get coin data by PCGS number and grade.
 
         Args:
             pcgs_number: PCGS catalog number
             grade: Grade string (e.g., "MS65", "PR70")
+            bypass_cache: Fetch from the API even if a cached response exists
 
         Returns:
             Coin data for the specified grade
@@ -278,16 +522,19 @@ class PCGSApiClient:
         return await self._make_request(
             "GET",
             f"/coindetail/GetCoinFactsByGrade",
-            params={"PCGSNo": pcgs_number, "Grade": grade}
+            params={"PCGSNo": pcgs_number, "Grade": grade},
+            bypass_cache=bypass_cache,
         )
 
-    async def get_auction_prices(self, pcgs_number: int, grade: Optional[str] = None) -> Dict[str, Any]:
+    async def get_auction_prices(self, pcgs_number: int, grade: Optional[str] = None,
+                                 bypass_cache: bool = False) -> Dict[str, Any]:
         """
         Get auction prices realized for a coin.
 
         Args:
             pcgs_number: PCGS catalog number
             grade: Optional grade filter
+            bypass_cache: Fetch from the API even if a cached response exists
 
         Returns:
             Auction price history
@@ -300,5 +547,66 @@ class PCGSApiClient:
         return await self._make_request(
             "GET",
             "/auctionprices/GetAuctionPrices",
-            params=params
+            params=params,
+            bypass_cache=bypass_cache,
         )
+
+    async def get_coins_by_pcgs_and_grade(
+        self,
+        pairs: Iterable[Tuple[int, str]],
+        max_concurrency: Optional[int] = None,
+    ) -> AsyncIterator[BatchResult]:
+        """
+        Look up many (pcgs_number, grade) pairs concurrently.
+
+        Requests run under a semaphore of max_concurrency and the client-wide
+        rate limit. Results are yielded as they complete, not in input order.
+        Once the quota tracker reports no calls remaining, lookups that have
+        not started are dropped, requests already in flight are allowed to
+        finish, and the lookup that hit the limit is yielded with a
+        QuotaExceededError.
+
+        Args:
+            pairs: Iterable of (pcgs_number, grade) tuples
+            max_concurrency: Override the client's max_concurrency
+
+        Yields:
+            BatchResult for each pair that was attempted
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+        quota_exhausted = asyncio.Event()
+
+        async def fetch(pcgs_number: int, grade: str) -> Optional[BatchResult]:
+            async with semaphore:
+                if quota_exhausted.is_set():
+                    return None
+                started = time.monotonic()
+                try:
+                    data = await self.get_coin_by_pcgs_and_grade(pcgs_number, grade)
+                    return BatchResult(pcgs_number, grade, data=data,
+                                       elapsed=time.monotonic() - started)
+                except QuotaExceededError as e:
+                    quota_exhausted.set()
+                    return BatchResult(pcgs_number, grade, error=e)
+                except PCGSApiError as e:
+                    return BatchResult(pcgs_number, grade, error=e,
+                                       elapsed=time.monotonic() - started)
+                except ValueError as e:
+                    return BatchResult(pcgs_number, grade, error=PCGSApiError(str(e)),
+                                       elapsed=time.monotonic() - started)
+
+        tasks = [asyncio.ensure_future(fetch(pcgs, grade)) for pcgs, grade in pairs]
+        logger.info(f"Batch lookup: {len(tasks)} requests, concurrency "
+                    f"{max_concurrency or self.max_concurrency}, {self.requests_per_second}/s")
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                if result is None:
+                    continue
+                yield result
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -129,6 +129,29 @@ class QuotaTracker:
         logger.info(f"API call recorded. {remaining} calls remaining today.")
         return remaining
 
+    def reserve_call(self) -> bool:
+        """
+        Count a call before it is sent, if the quota allows it.
+
+        Returns:
+            True if the call was counted, False if the quota is exhausted
+        """
+        self._reset_if_new_day()
+        if self._data["calls_made"] >= self._data["daily_limit"]:
+            return False
+
+        self._data["calls_made"] += 1
+        self._data["last_call_at"] = datetime.now().isoformat()
+        self._save()
+        return True
+
+    def release_call(self):
+        """Give back a reserved call whose request did not complete."""
+        self._reset_if_new_day()
+        if self._data["calls_made"] > 0:
+            self._data["calls_made"] -= 1
+            self._save()
+
     def get_status(self) -> Dict[str, Any]:
         """
         Get current quota status.
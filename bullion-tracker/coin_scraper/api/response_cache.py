@@ -0,0 +1,199 @@
+"""
+PCGS API Response Cache
+
+SQLite-backed TTL cache for PCGS API responses, keyed by endpoint and params.
+A cache hit costs no network round-trip and no quota call, so repeated cert
+lookups and (PCGS#, grade) requests within the TTL are free.
+
+TTLs are per endpoint: cert details never change once graded, so they are
+kept for weeks; price guide values move and are kept for hours.
+"""
+
+import json
+import sqlite3
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATA_DIR = Path(__file__).parent.parent / "data"
+DEFAULT_CACHE_FILE = DEFAULT_DATA_DIR / "api_cache.db"
+
+# Endpoint prefix (lowercase) -> time to live
+ENDPOINT_TTLS = {
+    "coindetail/getcoinfactsbycertno": timedelta(days=30),
+    "coindetail/getcoinfactsbygrade": timedelta(hours=12),
+    "auctionprices/getauctionprices": timedelta(days=1),
+}
+DEFAULT_TTL = timedelta(hours=6)
+
+
+def make_cache_key(endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Build a stable key from endpoint and params (param order doesn't matter)."""
+    normalized = endpoint.strip('/').lower()
+    if not params:
+        return normalized
+    return f"{normalized}?{json.dumps(params, sort_keys=True, default=str)}"
+
+
+def ttl_for_endpoint(endpoint: str) -> timedelta:
+    """Look up the TTL for an endpoint."""
+    normalized = endpoint.strip('/').lower()
+    for prefix, ttl in ENDPOINT_TTLS.items():
+        if normalized.startswith(prefix):
+            return ttl
+    return DEFAULT_TTL
+
+
+class ResponseCache:
+    """
+    Persistent TTL cache for API responses.
+
+    Usage:
+        cache = ResponseCache()
+        data = cache.get(endpoint, params)
+        if data is None:
+            data = ...  # make API call
+            cache.set(endpoint, params, data)
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        """
+        Initialize response cache.
+
+        Args:
+            db_path: Path to SQLite file. Defaults to data/api_cache.db
+        """
+        self.db_path = Path(db_path or DEFAULT_CACHE_FILE)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_db()
+
+    def _init_db(self):
+        """Initialize database schema."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS api_responses (
+                    cache_key TEXT PRIMARY KEY,
+                    endpoint TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    fetched_at TIMESTAMP NOT NULL,
+                    expires_at TIMESTAMP NOT NULL,
+                    hit_count INTEGER DEFAULT 0
+                )
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_api_responses_expires
+                ON api_responses(expires_at)
+            """)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """Get a database connection with row factory."""
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """
+        Return the cached response, or None if missing or expired.
+
+        Each hit is counted toward the quota-saved metric.
+        """
+        key = make_cache_key(endpoint, params)
+        conn = self._get_conn()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT response FROM api_responses WHERE cache_key = ? AND expires_at > ?",
+                (key, datetime.now())
+            )
+            row = cursor.fetchone()
+            if not row:
+                return None
+
+            cursor.execute(
+                "UPDATE api_responses SET hit_count = hit_count + 1 WHERE cache_key = ?",
+                (key,)
+            )
+            conn.commit()
+            logger.debug(f"Cache hit: {key}")
+            return json.loads(row['response'])
+        finally:
+            conn.close()
+
+    def set(self, endpoint: str, params: Optional[Dict[str, Any]], response: Any,
+            ttl: Optional[timedelta] = None):
+        """Store a response with the endpoint's TTL (or an explicit one)."""
+        key = make_cache_key(endpoint, params)
+        now = datetime.now()
+        expires_at = now + (ttl or ttl_for_endpoint(endpoint))
+
+        conn = self._get_conn()
+        try:
+            conn.execute("""
+                INSERT INTO api_responses (cache_key, endpoint, response, fetched_at, expires_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(cache_key) DO UPDATE SET
+                    response = excluded.response,
+                    fetched_at = excluded.fetched_at,
+                    expires_at = excluded.expires_at
+            """, (key, endpoint.strip('/'), json.dumps(response, default=str), now, expires_at))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def invalidate(self, endpoint: str, params: Optional[Dict[str, Any]] = None):
+        """Remove one cached response."""
+        conn = self._get_conn()
+        try:
+            conn.execute(
+                "DELETE FROM api_responses WHERE cache_key = ?",
+                (make_cache_key(endpoint, params),)
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def purge_expired(self) -> int:
+        """Delete expired entries. Returns number removed."""
+        conn = self._get_conn()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM api_responses WHERE expires_at <= ?", (datetime.now(),))
+            conn.commit()
+            return cursor.rowcount
+        finally:
+            conn.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get lifetime cache statistics.
+
+        Returns:
+            Dict with entries, live_entries, quota_saved (total hits), cache_file
+        """
+        conn = self._get_conn()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT
+                    COUNT(*) as entries,
+                    SUM(CASE WHEN expires_at > ? THEN 1 ELSE 0 END) as live,
+                    SUM(hit_count) as hits
+                FROM api_responses
+            """, (datetime.now(),))
+            row = cursor.fetchone()
+            return {
+                "entries": row['entries'] or 0,
+                "live_entries": row['live'] or 0,
+                "quota_saved": row['hits'] or 0,
+                "cache_file": str(self.db_path),
+            }
+        finally:
+            conn.close()
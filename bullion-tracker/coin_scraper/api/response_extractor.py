@@ -0,0 +1,407 @@
+"""
+PCGS API Response Extractor
+
+Pulls every grade price, population count and coin metadata field out of a
+PCGS Public API payload, regardless of which endpoint produced it. Auction
+prices realized are extracted separately, one record per auction lot.
+
+A single GetCoinFactsByGrade or GetCoinFactsByCertNo response often carries
+more than the one price the caller asked for (nested price guide tables,
+population rows, mintage, variety). Extracting all of it lets each
+quota-limited call refresh as many CoinPriceGuide rows as possible.
+"""
+
+import re
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Any, Optional, Iterable, List
+
+logger = logging.getLogger(__name__)
+
+# Keys that identify the grade of a record
+GRADE_KEYS = ('Grade', 'GradeCode', 'GradeName', 'grade')
+
+# Keys that carry a price guide value, in order of preference
+PRICE_KEYS = ('PriceGuideValue', 'Price', 'Value', 'PriceGuide', 'price')
+
+# Keys that carry population data
+POPULATION_KEYS = ('Population', 'Pop', 'PopulationCount', 'population')
+POP_HIGHER_KEYS = ('PopHigher', 'PopulationHigher')
+
+# Keys that identify an auction lot
+SALE_DATE_KEYS = ('SaleDate', 'AuctionDate', 'DateSold', 'Date')
+REALIZED_PRICE_KEYS = ('PriceRealized', 'SalePrice', 'Price', 'Amount')
+AUCTION_HOUSE_KEYS = ('AuctionHouse', 'Auctioneer', 'Company')
+SALE_NAME_KEYS = ('SaleName', 'AuctionName', 'Sale')
+LOT_NUMBER_KEYS = ('LotNo', 'LotNumber', 'Lot')
+CERT_NUMBER_KEYS = ('CertNo', 'CertNumber')
+
+# Container keys whose subtree holds auction lots, never price guide values
+AUCTION_CONTAINER_PATTERN = re.compile(r'auction|^lots?$|^lotlist', re.IGNORECASE)
+
+SALE_DATE_FORMATS = ('%Y-%m-%d', '%m/%d/%Y', '%m/%d/%y', '%Y/%m/%d', '%b %d, %Y')
+
+# API field name -> CoinReference-style metadata key
+METADATA_FIELDS = {
+    'PCGSNo': 'pcgs_number',
+    'CertNo': 'cert_number',
+    'Year': 'year',
+    'MintMark': 'mint_mark',
+    'Denomination': 'denomination',
+    'FullName': 'full_name',
+    'Name': 'full_name',
+    'Mintage': 'mintage',
+    'MajorVariety': 'variety',
+    'MinorVariety': 'minor_variety',
+    'DieVariety': 'die_variety',
+    'Designation': 'designation',
+    'SeriesName': 'series_name',
+    'CategoryName': 'category_name',
+    'SpeciesName': 'species_name',
+    'DesignerName': 'designer',
+    'EdgeDescription': 'edge',
+    'MetalContent': 'metal',
+    'Weight': 'weight',
+    'Diameter': 'diameter',
+    'PriceSource': 'price_source',
+    'CoinFactsLink': 'coinfacts_url',
+}
+
+# Grade prefixes used by ValidGrade, with common aliases
+GRADE_PREFIX_ALIASES = {
+    'PF': 'PR',
+    'XF': 'EF',
+    'P': 'PO',
+    'FA': 'FR',
+}
+
+GRADE_PATTERN = re.compile(r'^([A-Z]+)[\s\-]?(\d{1,2})')
+
+
+@dataclass
+class CoinFacts:
+    """Everything extracted from one API payload."""
+    pcgs_number: Optional[int] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    prices: Dict[str, Decimal] = field(default_factory=dict)
+    populations: Dict[str, int] = field(default_factory=dict)
+    pop_higher: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def grades(self) -> set:
+        """All grade codes with any extracted data."""
+        return set(self.prices) | set(self.populations)
+
+    def merge(self, other: 'CoinFacts'):
+        """Merge another extraction into this one (other wins on conflicts)."""
+        if other.pcgs_number and not self.pcgs_number:
+            self.pcgs_number = other.pcgs_number
+        for key, value in other.metadata.items():
+            self.metadata.setdefault(key, value)
+        self.prices.update(other.prices)
+        self.populations.update(other.populations)
+        self.pop_higher.update(other.pop_higher)
+
+
+@dataclass
+class AuctionRecord:
+    """One auction lot (price realized) extracted from an API payload."""
+    pcgs_number: int
+    sale_date: date
+    price: Decimal
+    grade: Optional[str] = None
+    auction_house: Optional[str] = None
+    sale_name: Optional[str] = None
+    lot_number: Optional[str] = None
+    cert_number: Optional[str] = None
+
+    @property
+    def lot_key(self) -> str:
+        """
+        Stable identity of the lot, used to dedupe repeated fetches.
+
+        House, sale date and lot number identify a lot; the cert number and
+        price are included so lots without a lot number still dedupe exactly.
+        """
+        parts = [
+            str(self.pcgs_number),
+            (self.auction_house or '').strip().lower(),
+            self.sale_date.isoformat(),
+            (self.lot_number or '').strip().lower(),
+            (self.cert_number or '').strip(),
+            '' if self.lot_number else f"{self.grade or ''}:{self.price}",
+        ]
+        return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()
+
+
+def normalize_grade(grade: Any, grade_numeric: Any = None) -> Optional[str]:
+    """
+    Normalize an API grade string to a ValidGrade code.
+
+    Examples:
+        "MS65"      -> "MS65"
+        "MS-65 RD"  -> "MS65"
+        "PF70DCAM"  -> "PR70"
+        "G4"        -> "G04"
+        "65" + 65   -> None (no prefix, ambiguous between MS and PR)
+
+    Returns:
+        Grade code like "MS65", or None if it can't be determined
+    """
+    if grade is None:
+        return None
+
+    text = str(grade).upper().strip()
+    match = GRADE_PATTERN.match(text)
+    if not match:
+        return None
+
+    prefix, number = match.group(1), int(match.group(2))
+    prefix = GRADE_PREFIX_ALIASES.get(prefix, prefix)
+
+    if grade_numeric is not None:
+        try:
+            number = int(grade_numeric)
+        except (TypeError, ValueError):
+            pass
+
+    if number < 1 or number > 70:
+        return None
+
+    return f"{prefix}{number:02d}"
+
+
+def _to_decimal(value: Any) -> Optional[Decimal]:
+    """Parse a price value, ignoring zero/blank placeholders."""
+    if value is None or value == '':
+        return None
+    try:
+        price = Decimal(str(value).replace('$', '').replace(',', '').strip())
+    except (InvalidOperation, ValueError):
+        return None
+    return price if price > 0 else None
+
+
+def _to_int(value: Any) -> Optional[int]:
+    """Parse an integer count, ignoring blanks."""
+    if value is None or value == '':
+        return None
+    try:
+        return int(str(value).replace(',', '').strip())
+    except ValueError:
+        return None
+
+
+def _to_date(value: Any) -> Optional[date]:
+    """Parse a sale date from ISO timestamps or common US formats."""
+    if value is None or value == '':
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+
+    text = str(value).strip()
+    try:
+        return datetime.fromisoformat(text.replace('Z', '+00:00')).date()
+    except ValueError:
+        pass
+    for fmt in SALE_DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _to_text(value: Any) -> Optional[str]:
+    """Stringify an optional identifier field."""
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text or None
+
+
+def _first(record: Dict[str, Any], keys: Iterable[str]) -> Any:
+    """Return the first present, non-empty value for any of the keys."""
+    for key in keys:
+        value = record.get(key)
+        if value not in (None, ''):
+            return value
+    return None
+
+
+def _extract_grade_record(record: Dict[str, Any], facts: CoinFacts, fallback_grade: Optional[str],
+                          overwrite: bool = True):
+    """
+    Extract price/population for a single record that describes one grade.
+
+    With overwrite=False (nested records) grades already extracted, e.g.
+    from the top-level record, keep their values.
+    """
+    grade = normalize_grade(_first(record, GRADE_KEYS), record.get('GradeNumeric'))
+    if not grade:
+        grade = fallback_grade
+    if not grade:
+        return
+
+    def put(values: Dict, value):
+        if value is not None and (overwrite or grade not in values):
+            values[grade] = value
+
+    put(facts.prices, _to_decimal(_first(record, PRICE_KEYS)))
+    put(facts.populations, _to_int(_first(record, POPULATION_KEYS)))
+    put(facts.pop_higher, _to_int(_first(record, POP_HIGHER_KEYS)))
+
+
+def _walk(node: Any, facts: CoinFacts, fallback_grade: Optional[str], depth: int = 0):
+    """
+    Recursively visit a payload, extracting every grade-shaped record.
+
+    Auction lots (records with a sale date, or anything under an
+    auction/lot container) are skipped: their prices are realized sales,
+    not price guide values (see extract_auction_records).
+    """
+    if depth > 6:
+        return
+
+    if isinstance(node, list):
+        for item in node:
+            # Nested records never inherit the requested grade
+            _walk(item, facts, None, depth + 1)
+        return
+
+    if not isinstance(node, dict):
+        return
+
+    # Dict keyed directly by grade code: {"MS65": 45.0, "MS66": 80.0}
+    if node and all(normalize_grade(k) for k in node.keys()) and \
+            all(not isinstance(v, (dict, list)) for v in node.values()):
+        for key, value in node.items():
+            price = _to_decimal(value)
+            if price is not None:
+                facts.prices.setdefault(normalize_grade(key), price)
+        return
+
+    if depth > 0 and _to_date(_first(node, SALE_DATE_KEYS)):
+        return
+
+    for api_key, meta_key in METADATA_FIELDS.items():
+        value = node.get(api_key)
+        if value not in (None, '') and meta_key not in facts.metadata:
+            facts.metadata[meta_key] = value
+
+    has_grade_data = any(k in node for k in PRICE_KEYS + POPULATION_KEYS + POP_HIGHER_KEYS)
+    if has_grade_data:
+        _extract_grade_record(node, facts, fallback_grade, overwrite=depth == 0)
+
+    for key, value in node.items():
+        if isinstance(value, (dict, list)) and not AUCTION_CONTAINER_PATTERN.search(str(key)):
+            _walk(value, facts, None, depth + 1)
+
+
+def extract_coin_facts(payload: Any, requested_grade: Optional[str] = None) -> CoinFacts:
+    """
+    Extract every price, population and metadata field from an API payload.
+
+    Args:
+        payload: Decoded JSON from any PCGS API endpoint
+        requested_grade: Grade passed to the request; used when the top-level
+            record carries a price but no parseable grade of its own
+
+    Returns:
+        CoinFacts (empty if the payload is not a valid response)
+    """
+    facts = CoinFacts()
+
+    if not payload or not isinstance(payload, (dict, list)):
+        return facts
+
+    if isinstance(payload, dict) and payload.get('IsValidRequest') is False:
+        logger.debug(f"Invalid API response: {payload.get('ServerMessage')}")
+        return facts
+
+    _walk(payload, facts, normalize_grade(requested_grade))
+
+    for key in ('pcgs_number', 'year', 'mintage'):
+        if key in facts.metadata:
+            facts.metadata[key] = _to_int(facts.metadata[key])
+
+    pcgs_number = facts.metadata.get('pcgs_number')
+    if pcgs_number and pcgs_number > 0:
+        facts.pcgs_number = pcgs_number
+
+    logger.debug(
+        f"Extracted PCGS#{facts.pcgs_number}: {len(facts.prices)} prices, "
+        f"{len(facts.populations)} populations, {len(facts.metadata)} metadata fields"
+    )
+    return facts
+
+
+def _walk_auction_lots(node: Any, pcgs_number: int, records: List[AuctionRecord], depth: int = 0):
+    """Recursively collect every record that has both a sale date and a price."""
+    if depth > 6:
+        return
+
+    if isinstance(node, list):
+        for item in node:
+            _walk_auction_lots(item, pcgs_number, records, depth + 1)
+        return
+
+    if not isinstance(node, dict):
+        return
+
+    sale_date = _to_date(_first(node, SALE_DATE_KEYS))
+    price = _to_decimal(_first(node, REALIZED_PRICE_KEYS))
+    if sale_date and price is not None:
+        lot_pcgs = _to_int(node.get('PCGSNo'))
+        if lot_pcgs and lot_pcgs != pcgs_number:
+            # Related lots for other coins aren't ours to store
+            return
+        records.append(AuctionRecord(
+            pcgs_number=pcgs_number,
+            sale_date=sale_date,
+            price=price,
+            grade=normalize_grade(_first(node, GRADE_KEYS), node.get('GradeNumeric')),
+            auction_house=_to_text(_first(node, AUCTION_HOUSE_KEYS)),
+            sale_name=_to_text(_first(node, SALE_NAME_KEYS)),
+            lot_number=_to_text(_first(node, LOT_NUMBER_KEYS)),
+            cert_number=_to_text(_first(node, CERT_NUMBER_KEYS)),
+        ))
+        return
+
+    for value in node.values():
+        if isinstance(value, (dict, list)):
+            _walk_auction_lots(value, pcgs_number, records, depth + 1)
+
+
+def extract_auction_records(payload: Any, pcgs_number: int) -> List[AuctionRecord]:
+    """
+    Extract every auction lot from a GetAuctionPrices payload.
+
+    Lots repeated within one payload are returned once.
+
+    Args:
+        payload: Decoded JSON from the auction prices endpoint
+        pcgs_number: PCGS number the request was made for; used when a lot
+            doesn't carry its own
+
+    Returns:
+        AuctionRecords sorted by sale date (empty if the payload is invalid)
+    """
+    if not payload or not isinstance(payload, (dict, list)):
+        return []
+
+    if isinstance(payload, dict) and payload.get('IsValidRequest') is False:
+        logger.debug(f"Invalid API response: {payload.get('ServerMessage')}")
+        return []
+
+    records: List[AuctionRecord] = []
+    _walk_auction_lots(payload, pcgs_number, records)
+
+    unique = {record.lot_key: record for record in records}
+    logger.debug(f"Extracted {len(unique)} auction lots for PCGS#{pcgs_number}")
+    return sorted(unique.values(), key=lambda r: r.sale_date)
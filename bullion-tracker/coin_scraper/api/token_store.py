@@ -0,0 +1,123 @@
+"""
+PCGS API Token Store
+
+Persists the PCGS OAuth access token and its expiry to disk so short-lived
+jobs (refresh runs, test scripts, Celery tasks) reuse one token for its
+~24h lifetime instead of calling GetToken on every startup.
+
+The token file is written atomically with 0600 permissions and ignored if
+its permissions are loosened or it belongs to a different PCGS account.
+"""
+
+import os
+import json
+import stat
+import logging
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATA_DIR = Path(__file__).parent.parent / "data"
+DEFAULT_TOKEN_FILE = DEFAULT_DATA_DIR / "pcgs_token.json"
+
+
+class TokenStore:
+    """
+    File-backed store for one PCGS access token.
+
+    Usage:
+        store = TokenStore()
+        cached = store.load(username)
+        if cached:
+            token, expires_at = cached
+        else:
+            store.save(username, token, expires_at)
+    """
+
+    def __init__(self, token_file: Optional[Path] = None):
+        """
+        Initialize token store.
+
+        Args:
+            token_file: Path to token JSON file. Defaults to data/pcgs_token.json
+        """
+        self.token_file = Path(token_file or DEFAULT_TOKEN_FILE)
+
+    def load(self, username: str) -> Optional[Tuple[str, datetime]]:
+        """
+        Load a persisted token for this account.
+
+        Returns:
+            (access_token, expires_at), or None if missing, unreadable,
+            insecure or issued to another account
+        """
+        if not self.token_file.exists():
+            return None
+
+        try:
+            mode = self.token_file.stat().st_mode
+            if mode & (stat.S_IRWXG | stat.S_IRWXO):
+                logger.warning(f"Ignoring token file with insecure permissions: {self.token_file}")
+                return None
+
+            with open(self.token_file, 'r') as f:
+                data = json.load(f)
+
+            if data.get("username") != username:
+                return None
+
+            return data["access_token"], datetime.fromisoformat(data["expires_at"])
+
+        except (json.JSONDecodeError, KeyError, ValueError, OSError) as e:
+            logger.warning(f"Failed to load token file: {e}")
+            return None
+
+    def save(self, username: str, access_token: str, expires_at: datetime):
+        """Persist a token atomically with owner-only permissions."""
+        self.token_file.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "username": username,
+            "access_token": access_token,
+            "expires_at": expires_at.isoformat(),
+            "saved_at": datetime.now().isoformat(),
+        }
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.token_file.parent, prefix=".pcgs_token.")
+        try:
+            # mkstemp creates the file 0600; chmod guards against odd umasks
+            os.chmod(tmp_path, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, self.token_file)
+            logger.debug(f"Saved token to {self.token_file} (expires {expires_at})")
+        except OSError as e:
+            logger.error(f"Failed to save token file: {e}")
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def clear(self, access_token: Optional[str] = None):
+        """
+        Delete the persisted token.
+
+        Args:
+            access_token: If given, only delete when the stored token matches
+                (so a token another process just refreshed is kept)
+        """
+        if not self.token_file.exists():
+            return
+
+        if access_token is not None:
+            try:
+                with open(self.token_file, 'r') as f:
+                    if json.load(f).get("access_token") != access_token:
+                        return
+            except (json.JSONDecodeError, OSError):
+                pass
+
+        try:
+            self.token_file.unlink()
+        except OSError as e:
+            logger.warning(f"Failed to remove token file: {e}")
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+In-memory CoinReference Name Index
+
+Resolves free-text coin names (cert lookups, CSV imports, scraped rows with
+no PCGS link) to CoinReference rows without a Postgres round-trip.
+
+- Token inverted index over searchTokens/fullName picks candidates by
+  intersecting postings smallest first, so common words like "dollar" only
+  narrow the set and never scan thousands of coins
+- Trigram similarity (pg_trgm style) ranks candidates and catches typos
+- Year / mint mark / denomination facets filter results
+- Pickled to data/coin_index.pkl and refreshed incrementally from updatedAt
+
+Usage:
+    python coin_index.py "1881-S Morgan Dollar"
+    python coin_index.py "morgn dollar" --year 1881 --mint S -k 5
+    python coin_index.py --rebuild
+"""
+
+import os
+import re
+import sys
+import pickle
+import argparse
+import heapq
+import logging
+from dataclasses import astuple, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Set
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import text
+
+from models.coin_reference import CoinReference
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_FILE = Path(__file__).parent / "data" / "coin_index.pkl"
+
+# Rarest query trigrams used for candidates when no query token is indexed
+FALLBACK_TRIGRAMS = 6
+
+TOKEN_RE = re.compile(r"[a-z0-9$]+(?:[./][a-z0-9]+)*")
+
+
+def tokenize(value: str) -> List[str]:
+    """Lowercase word tokens; keeps $2.50 and 1/2C style denominations whole."""
+    return TOKEN_RE.findall((value or '').lower())
+
+
+def trigrams(value: str) -> FrozenSet[str]:
+    """pg_trgm-style trigrams: each word padded with two leading and one trailing space."""
+    grams = set()
+    for word in re.findall(r"[a-z0-9]+", (value or '').lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def _norm_facet(value) -> Optional[str]:
+    return str(value).strip().upper() if value not in (None, '') else None
+
+
+@dataclass
+class CoinMatch:
+    """A search result."""
+    coin_id: str
+    pcgs_number: int
+    full_name: str
+    score: float
+
+
+@dataclass
+class _Doc:
+    coin_id: str
+    pcgs_number: int
+    full_name: str
+    year: Optional[int]
+    mint_mark: Optional[str]
+    denomination: Optional[str]
+    tokens: FrozenSet[str]
+    grams: FrozenSet[str]
+
+
+class CoinIndex:
+    """
+    Token + trigram index over CoinReference names.
+
+    Usage:
+        index = CoinIndex.load_or_build(engine)
+        matches = index.search("1881-S Morgan", k=5)
+    """
+
+    VERSION = 1
+
+    def __init__(self):
+        self.docs: Dict[str, _Doc] = {}
+        self.token_postings: Dict[str, Set[str]] = {}
+        self.trigram_postings: Dict[str, Set[str]] = {}
+        self.facets: Dict[str, Dict[str, Set[str]]] = {'year': {}, 'mint_mark': {}, 'denomination': {}}
+        self.watermark: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    # ===== Maintenance =====
+
+    def add(self, coin: Dict):
+        """Index (or re-index) one coin dict with CoinReference column names."""
+        coin_id = coin['id']
+        if coin_id in self.docs:
+            self.remove(coin_id)
+
+        search_text = coin.get('searchTokens') or CoinReference.generate_search_tokens(
+            coin.get('year'), coin.get('mintMark'), coin.get('denomination'),
+            coin.get('series'), coin.get('variety'), coin.get('fullName'),
+        )
+        doc = _Doc(
+            coin_id=coin_id,
+            pcgs_number=coin.get('pcgsNumber'),
+            full_name=coin.get('fullName') or '',
+            year=coin.get('year'),
+            mint_mark=_norm_facet(coin.get('mintMark')),
+            denomination=_norm_facet(coin.get('denomination')),
+            tokens=frozenset(tokenize(search_text) + tokenize(coin.get('fullName'))),
+            grams=trigrams(coin.get('fullName')),
+        )
+        self.docs[coin_id] = doc
+
+        for token in doc.tokens:
+            self.token_postings.setdefault(token, set()).add(coin_id)
+        for gram in doc.grams:
+            self.trigram_postings.setdefault(gram, set()).add(coin_id)
+        for facet, value in self._facet_values(doc).items():
+            if value is not None:
+                self.facets[facet].setdefault(value, set()).add(coin_id)
+
+    def remove(self, coin_id: str):
+        """Drop a coin from every posting list."""
+        doc = self.docs.pop(coin_id, None)
+        if doc is None:
+            return
+        for postings, keys in ((self.token_postings, doc.tokens), (self.trigram_postings, doc.grams)):
+            for key in keys:
+                postings[key].discard(coin_id)
+                if not postings[key]:
+                    del postings[key]
+        for facet, value in self._facet_values(doc).items():
+            if value is not None:
+                self.facets[facet][value].discard(coin_id)
+
+    @staticmethod
+    def _facet_values(doc: _Doc) -> Dict[str, Optional[str]]:
+        return {
+            'year': str(doc.year) if doc.year is not None else None,
+            'mint_mark': doc.mint_mark,
+            'denomination': doc.denomination,
+        }
+
+    def refresh(self, engine) -> int:
+        """
+        Load coins changed since the watermark (everything on first run).
+
+        Coins deleted from the database are dropped when the indexed count
+        no longer matches. Returns the number of coins added, updated or removed.
+        """
+        with engine.connect() as conn:
+            params = {}
+            where = ''
+            if self.watermark:
+                where = 'WHERE "updatedAt" >= :since'
+                params['since'] = self.watermark
+
+            result = conn.execute(text(f"""
+                SELECT id, "pcgsNumber", year, "mintMark", denomination, series,
+                       variety, "fullName", "searchTokens", "updatedAt"
+                FROM "CoinReference"
+                {where}
+            """), params)
+
+            changed = 0
+            since = self.watermark
+            for row in result.mappings():
+                # Rows at exactly the watermark are re-read every time; only count real changes
+                if not (row['updatedAt'] == since and row['id'] in self.docs):
+                    changed += 1
+                self.add(dict(row))
+                if row['updatedAt'] and (self.watermark is None or row['updatedAt'] > self.watermark):
+                    self.watermark = row['updatedAt']
+
+            total = conn.execute(text('SELECT COUNT(*) FROM "CoinReference"')).scalar()
+            if total != len(self.docs):
+                live = {row[0] for row in conn.execute(text('SELECT id FROM "CoinReference"'))}
+                for coin_id in [c for c in self.docs if c not in live]:
+                    self.remove(coin_id)
+                    changed += 1
+
+        logger.info(f"Coin index: {changed} coins changed, {len(self.docs)} indexed")
+        return changed
+
+    # ===== Search =====
+
+    def search(self, query: str, k: int = 10, year: Optional[int] = None,
+               mint_mark: Optional[str] = None, denomination: Optional[str] = None) -> List[CoinMatch]:
+        """
+        Top-k coins for a free-text name.
+
+        Score is the mean of trigram similarity (fullName) and the fraction
+        of query tokens the coin contains, both in [0, 1].
+        """
+        q_tokens = set(tokenize(query))
+        q_grams = trigrams(query)
+        if not q_tokens and not q_grams:
+            return []
+
+        allowed = self._facet_filter(year, mint_mark, denomination)
+        candidates = self._candidates(q_tokens, q_grams)
+        if allowed is not None:
+            candidates = candidates & allowed if candidates else allowed
+
+        def score(coin_id: str) -> float:
+            doc = self.docs[coin_id]
+            shared = len(q_grams & doc.grams)
+            similarity = shared / (len(q_grams) + len(doc.grams) - shared) if shared else 0.0
+            coverage = len(q_tokens & doc.tokens) / len(q_tokens) if q_tokens else 0.0
+            return (similarity + coverage) / 2
+
+        best = heapq.nlargest(k, ((score(c), c) for c in candidates))
+        return [
+            CoinMatch(coin_id=c, pcgs_number=self.docs[c].pcgs_number,
+                      full_name=self.docs[c].full_name, score=round(s, 4))
+            for s, c in best if s > 0
+        ]
+
+    def _candidates(self, q_tokens: Set[str], q_grams: FrozenSet[str]) -> Set[str]:
+        """
+        Coins containing as many query tokens as possible, else a rare query trigram.
+
+        Token postings are intersected smallest first; a token that would empty
+        the set (a typo, or a word the coin lacks) is skipped instead.
+        """
+        postings = sorted((self.token_postings[t] for t in q_tokens if t in self.token_postings), key=len)
+        candidates: Optional[Set[str]] = None
+        for docs in postings:
+            narrowed = set(docs) if candidates is None else candidates & docs
+            if narrowed:
+                candidates = narrowed
+        if candidates:
+            return candidates
+
+        candidates = set()
+
+        gram_postings = sorted((self.trigram_postings[g] for g in q_grams if g in self.trigram_postings), key=len)
+        for docs in gram_postings[:FALLBACK_TRIGRAMS]:
+            candidates |= docs
+        return candidates
+
+    def _facet_filter(self, year, mint_mark, denomination) -> Optional[Set[str]]:
+        """Coins matching every given facet, or None if no facet is given."""
+        allowed = None
+        for facet, value in (('year', year), ('mint_mark', mint_mark), ('denomination', denomination)):
+            value = _norm_facet(value)
+            if value is None:
+                continue
+            docs = self.facets[facet].get(value, set())
+            allowed = set(docs) if allowed is None else allowed & docs
+        return allowed
+
+    # ===== Persistence =====
+
+    def save(self, path: Optional[Path] = None):
+        """Write the index atomically."""
+        path = Path(path or DEFAULT_INDEX_FILE)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Builtins only, so the file loads the same from the CLI or an import
+        state = {
+            'version': self.VERSION,
+            'watermark': self.watermark,
+            'docs': {coin_id: astuple(doc) for coin_id, doc in self.docs.items()},
+            'token_postings': self.token_postings,
+            'trigram_postings': self.trigram_postings,
+            'facets': self.facets,
+        }
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> Optional['CoinIndex']:
+        """Load a saved index, or None if missing, unreadable or from another version."""
+        path = Path(path or DEFAULT_INDEX_FILE)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'rb') as f:
+                state = pickle.load(f)
+        except (pickle.UnpicklingError, EOFError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable coin index {path}: {e}")
+            return None
+        if not isinstance(state, dict) or state.get('version') != cls.VERSION:
+            return None
+
+        index = cls()
+        index.watermark = state['watermark']
+        index.docs = {coin_id: _Doc(*fields) for coin_id, fields in state['docs'].items()}
+        index.token_postings = state['token_postings']
+        index.trigram_postings = state['trigram_postings']
+        index.facets = state['facets']
+        return index
+
+    @classmethod
+    def load_or_build(cls, engine, path: Optional[Path] = None) -> 'CoinIndex':
+        """Load the saved index, bring it up to date, and save it back if changed."""
+        index = cls.load(path) or cls()
+        if index.refresh(engine) or not Path(path or DEFAULT_INDEX_FILE).exists():
+            index.save(path)
+        return index
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Match free-text coin names to CoinReference',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('query', nargs='?', help='Coin name to look up')
+    parser.add_argument('-k', type=int, default=10, help='Number of matches (default: 10)')
+    parser.add_argument('--year', type=int, help='Only coins from this year')
+    parser.add_argument('--mint', type=str, help='Only coins with this mint mark')
+    parser.add_argument('--denomination', type=str, help='Only coins with this denomination')
+    parser.add_argument('--rebuild', action='store_true', help='Discard the saved index and rebuild')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    from database import engine
+
+    if args.rebuild and DEFAULT_INDEX_FILE.exists():
+        DEFAULT_INDEX_FILE.unlink()
+    index = CoinIndex.load_or_build(engine)
+
+    if not args.query:
+        print(f"Coin index: {len(index)} coins, watermark {index.watermark}")
+        return
+
+    for match in index.search(args.query, k=args.k, year=args.year,
+                              mint_mark=args.mint, denomination=args.denomination):
+        print(f"{match.score:.3f}  PCGS #{match.pcgs_number:<8} {match.full_name}")
+
+
+if __name__ == '__main__':
+    main()
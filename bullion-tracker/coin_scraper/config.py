@@ -134,11 +134,22 @@ COIN_SERIES = [
     {"name": "First Spouse Gold", "slug": "first-spouse-gold", "category_id": 104, "priority": "P3", "est_coins": 45},
 ]
 
+# Series name -> priority tier number (P0 -> 0), stored in CoinReference."priorityTier"
+# by scripts/sync_priorities.py and the scraper
+SERIES_PRIORITY_TIERS = {s["name"]: int(s["priority"][1:]) for s in COIN_SERIES}
+
 # Rate limiting
 REQUEST_DELAY_MIN = 1.0  # seconds
 REQUEST_DELAY_MAX = 2.0  # seconds
 MAX_RETRIES = 3
 RETRY_BACKOFF = 2  # exponential backoff multiplier
+CATEGORY_PREFETCH_CONCURRENCY = 3  # category pages fetched in parallel when planning a run
+
+# Redis: Celery broker, and rate limit / circuit breaker / API quota shared
+# across workers (shared_limits.py). SHARED_LIMITS=1 makes scripts use the
+# shared limits too; Celery tasks always do.
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+SHARED_LIMITS = os.getenv("SHARED_LIMITS", "").lower() in ("1", "true", "yes")
 
 # User agent
 USER_AGENT = "BullionTracker/1.0 (Personal Collection App)"
@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+"""
+Auction Prices Ingestion for Coin Reference Database
+
+Pulls realized auction prices from the PCGS API into CoinAuctionPrice so
+auction data can be used for valuation alongside the price guide.
+
+Ingestion is incremental:
+- Coins checked within --min-age-days are skipped (tracked in a local
+  SQLite fetch log), so re-runs don't re-spend quota on the same coins
+- Only lots sold on or after the latest stored sale date for a coin are
+  written, and lots are deduped by lot identity (house, date, lot number)
+
+Usage:
+    python ingest_auctions.py --status              # Show fetch log and quota
+    python ingest_auctions.py --limit 25            # Ingest up to 25 coins
+    python ingest_auctions.py --priority P0         # Only P0 series coins
+    python ingest_auctions.py --pcgs 7172 7174      # Specific coins
+    python ingest_auctions.py --dry-run             # Fetch but don't write
+
+Environment:
+    DATABASE_URL: PostgreSQL connection string
+    PCGS_USERNAME: PCGS API credentials
+    PCGS_PASSWORD: PCGS API credentials
+"""
+
+import argparse
+import asyncio
+import sqlite3
+import sys
+import logging
+from datetime import datetime, date, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Add parent dir to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import DATABASE_URL
+from api.pcgs_api import PCGSApiClient, PCGSApiError, QuotaExceededError
+from api.response_extractor import extract_auction_records
+from shared_limits import make_quota_tracker, api_rate_limiter
+from run_lock import add_lock_arguments, acquire_for_cli, lock_status
+from price_store import load_last_sale_dates, store_auction_records
+
+# Database
+from sqlalchemy import create_engine, text, bindparam
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Paths
+DATA_DIR = Path(__file__).parent / "data"
+FETCH_LOG_FILE = DATA_DIR / "auction_ingest.db"
+
+DEFAULT_LIMIT = 25
+DEFAULT_MIN_AGE_DAYS = 7
+
+
+class AuctionFetchLog:
+    """
+    SQLite log of when each coin's auction prices were last fetched.
+
+    Lets coins with no new sales (or no auction history at all) be skipped
+    until they are due again, which the CoinAuctionPrice table alone can't
+    express.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        """
+        Initialize fetch log.
+
+        Args:
+            db_path: Path to SQLite file. Defaults to data/auction_ingest.db
+        """
+        self.db_path = Path(db_path or FETCH_LOG_FILE)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_db()
+
+    def _init_db(self):
+        """Initialize database schema."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS auction_fetches (
+                    pcgs_number INTEGER PRIMARY KEY,
+                    last_fetched_at TIMESTAMP NOT NULL,
+                    last_sale_date DATE,
+                    lots_seen INTEGER DEFAULT 0,
+                    lots_stored INTEGER DEFAULT 0
+                )
+            """)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """Get a database connection with row factory."""
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def get_last_fetched(self) -> Dict[int, datetime]:
+        """Last fetch time per PCGS number."""
+        conn = self._get_conn()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT pcgs_number, last_fetched_at FROM auction_fetches")
+            return {
+                row['pcgs_number']: datetime.fromisoformat(row['last_fetched_at'])
+                for row in cursor.fetchall()
+            }
+        finally:
+            conn.close()
+
+    def record_fetch(self, pcgs_number: int, last_sale_date: Optional[date],
+                     lots_seen: int, lots_stored: int):
+        """Record a completed fetch for one coin."""
+        conn = self._get_conn()
+        try:
+            conn.execute("""
+                INSERT INTO auction_fetches (pcgs_number, last_fetched_at, last_sale_date, lots_seen, lots_stored)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(pcgs_number) DO UPDATE SET
+                    last_fetched_at = excluded.last_fetched_at,
+                    last_sale_date = COALESCE(excluded.last_sale_date, auction_fetches.last_sale_date),
+                    lots_seen = excluded.lots_seen,
+                    lots_stored = auction_fetches.lots_stored + excluded.lots_stored
+            """, (
+                pcgs_number,
+                datetime.now().isoformat(),
+                last_sale_date.isoformat() if last_sale_date else None,
+                lots_seen,
+                lots_stored,
+            ))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get_stats(self) -> Dict:
+        """Summary of the fetch log."""
+        conn = self._get_conn()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT
+                    COUNT(*) as coins,
+                    SUM(CASE WHEN last_sale_date IS NOT NULL THEN 1 ELSE 0 END) as with_sales,
+                    SUM(lots_stored) as lots_stored,
+                    MAX(last_fetched_at) as last_fetch
+                FROM auction_fetches
+            """)
+            row = cursor.fetchone()
+            return {
+                "coins_fetched": row['coins'] or 0,
+                "coins_with_sales": row['with_sales'] or 0,
+                "lots_stored": row['lots_stored'] or 0,
+                "last_fetch": row['last_fetch'],
+            }
+        finally:
+            conn.close()
+
+
+class AuctionIngester:
+    """Incrementally ingests auction prices realized from the PCGS API."""
+
+    def __init__(self, dry_run: bool = False, concurrency: Optional[int] = None,
+                 requests_per_second: Optional[float] = None, bypass_cache: bool = False,
+                 min_age_days: int = DEFAULT_MIN_AGE_DAYS):
+        self.dry_run = dry_run
+        self.concurrency = concurrency
+        self.requests_per_second = requests_per_second
+        self.bypass_cache = bypass_cache
+        self.min_age = timedelta(days=min_age_days)
+        self.quota_tracker = make_quota_tracker()
+        self.fetch_log = AuctionFetchLog()
+        self.start_time = datetime.now()
+
+        # Stats
+        self.coins_fetched = 0
+        self.coins_failed = 0
+        self.lots_seen = 0
+        self.lots_new = 0
+        self.lots_stored = 0
+        self.api_calls_made = 0
+        self.cache_hits = 0
+        self.errors: List[str] = []
+
+    def select_coins(self, engine, limit: int, priority: Optional[str] = None,
+                     series: Optional[str] = None,
+                     pcgs_numbers: Optional[List[int]] = None) -> List[Dict]:
+        """Pick coins to fetch: never-fetched first, then least recently fetched.
+
+        Coins fetched within min_age are skipped unless requested explicitly
+        with pcgs_numbers.
+        """
+        filters = []
+        params = {}
+        if pcgs_numbers:
+            filters.append('"pcgsNumber" IN :pcgs_numbers')
+            params["pcgs_numbers"] = pcgs_numbers
+        if series:
+            filters.append('series = :series')
+            params["series"] = series
+        if priority:
+            filters.append('"priorityTier" = :tier')
+            params["tier"] = int(priority[1:])
+
+        query = text(f"""
+            SELECT id, "pcgsNumber", "fullName", series
+            FROM "CoinReference"
+            {'WHERE ' + ' AND '.join(filters) if filters else ''}
+        """)
+        if pcgs_numbers:
+            query = query.bindparams(bindparam("pcgs_numbers", expanding=True))
+
+        with engine.connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+
+        last_fetched = self.fetch_log.get_last_fetched()
+        cutoff = datetime.now() - self.min_age
+
+        coins = []
+        for row in rows:
+            fetched_at = last_fetched.get(row[1])
+            if fetched_at and fetched_at > cutoff and not pcgs_numbers:
+                continue
+            coins.append({
+                "coin_id": row[0],
+                "pcgs_number": row[1],
+                "full_name": row[2],
+                "series": row[3],
+                "last_fetched": fetched_at,
+            })
+
+        coins.sort(key=lambda c: c['last_fetched'] or datetime.min)
+        return coins[:limit]
+
+    def handle_payload(self, engine, coin: Dict, payload: Dict, last_sale: Optional[date]):
+        """Extract lots from one response and store those newer than the watermark."""
+        pcgs_number = coin['pcgs_number']
+        records = extract_auction_records(payload, pcgs_number)
+
+        # Same-day lots may be missing from an earlier fetch; lot keys dedupe them
+        new_records = [r for r in records if last_sale is None or r.sale_date >= last_sale]
+
+        stored = 0
+        if new_records and not self.dry_run:
+            stored = store_auction_records(engine, coin['coin_id'], new_records)
+
+        self.lots_seen += len(records)
+        self.lots_new += len(new_records)
+        self.lots_stored += stored
+
+        latest = records[-1].sale_date if records else None
+        if not self.dry_run:
+            self.fetch_log.record_fetch(pcgs_number, latest, len(records), stored)
+
+        logger.info(f"PCGS#{pcgs_number} {coin['full_name']}: {len(records)} lots, "
+                    f"{len(new_records)} since {last_sale or 'start'}, {stored} stored")
+
+    async def ingest(self, engine, coins: List[Dict], client: PCGSApiClient):
+        """Fetch auction prices for coins concurrently and store new lots.
+
+        Once the quota is exhausted no new fetches start; fetches already in
+        flight are still stored.
+        """
+        last_sales = load_last_sale_dates(engine, [c['pcgs_number'] for c in coins])
+        semaphore = asyncio.Semaphore(self.concurrency or client.max_concurrency)
+        quota_exhausted = asyncio.Event()
+
+        async def fetch(coin: Dict):
+            async with semaphore:
+                if quota_exhausted.is_set():
+                    return coin, None, None
+                try:
+                    data = await client.get_auction_prices(coin['pcgs_number'],
+                                                           bypass_cache=self.bypass_cache)
+                    return coin, data, None
+                except QuotaExceededError as e:
+                    quota_exhausted.set()
+                    return coin, None, e
+                except PCGSApiError as e:
+                    return coin, None, e
+
+        tasks = [asyncio.ensure_future(fetch(coin)) for coin in coins]
+        for next_done in asyncio.as_completed(tasks):
+            coin, data, error = await next_done
+            if isinstance(error, QuotaExceededError):
+                continue
+            if error:
+                self.coins_failed += 1
+                self.errors.append(f"PCGS#{coin['pcgs_number']}: {error}")
+                continue
+            if data is None:
+                continue
+
+            self.coins_fetched += 1
+            try:
+                self.handle_payload(engine, coin, data, last_sales.get(coin['pcgs_number']))
+            except Exception as e:
+                logger.error(f"Error storing auctions for PCGS#{coin['pcgs_number']}: {e}")
+                self.coins_failed += 1
+                self.errors.append(f"PCGS#{coin['pcgs_number']}: {str(e)}")
+
+        if quota_exhausted.is_set():
+            logger.warning("Quota exhausted, stopped early")
+
+    async def run(self, limit: int = DEFAULT_LIMIT, priority: Optional[str] = None,
+                  series: Optional[str] = None, pcgs_numbers: Optional[List[int]] = None):
+        """Run auction ingestion."""
+        engine = create_engine(DATABASE_URL)
+
+        logger.info(f"Mode: {'DRY RUN' if self.dry_run else 'LIVE'}")
+        logger.info(f"Quota remaining: {self.quota_tracker.get_remaining()}")
+
+        coins = self.select_coins(engine, limit, priority, series, pcgs_numbers)
+        if not coins:
+            logger.info("No coins due for auction ingestion.")
+            return
+
+        logger.info(f"Fetching auction prices for {len(coins)} coins")
+
+        async with PCGSApiClient(
+            quota_tracker=self.quota_tracker,
+            max_concurrency=self.concurrency,
+            requests_per_second=self.requests_per_second,
+            rate_limiter=api_rate_limiter(self.requests_per_second or PCGSApiClient.DEFAULT_REQUESTS_PER_SECOND),
+        ) as client:
+            try:
+                await client.authenticate()
+                await self.ingest(engine, coins, client)
+            except Exception as e:
+                logger.error(f"Fatal error: {e}")
+                self.errors.append(str(e))
+
+            client_stats = client.get_stats()
+            self.api_calls_made = client_stats['api_calls']
+            self.cache_hits = client_stats['cache_hits']
+
+        self.print_report()
+
+    def print_report(self):
+        """Print end-of-run summary."""
+        elapsed = str(datetime.now() - self.start_time).split('.')[0]
+
+        print("\n" + "=" * 50)
+        print("        AUCTION INGESTION COMPLETE")
+        print("=" * 50)
+        print(f"Duration: {elapsed}")
+        print(f"Mode: {'DRY RUN' if self.dry_run else 'LIVE'}")
+        print(f"Coins fetched: {self.coins_fetched}")
+        print(f"Failures: {self.coins_failed}")
+        print(f"Lots seen: {self.lots_seen}")
+        print(f"Lots since last sale: {self.lots_new}")
+        print(f"Lots stored: {self.lots_stored}")
+        print(f"API calls made: {self.api_calls_made}")
+        print(f"Cache hits (quota saved): {self.cache_hits}")
+
+        if self.errors:
+            print("\n--- Errors ---")
+            for error in self.errors[:10]:
+                print(error)
+            if len(self.errors) > 10:
+                print(f"... and {len(self.errors) - 10} more")
+        print("=" * 50 + "\n")
+
+
+def show_status():
+    """Show fetch log and quota status."""
+    stats = AuctionFetchLog().get_stats()
+    quota = make_quota_tracker().get_status()
+
+    print("\n" + "=" * 50)
+    print("        AUCTION INGESTION STATUS")
+    print("=" * 50)
+    print(f"Coins fetched: {stats['coins_fetched']}")
+    print(f"Coins with auction sales: {stats['coins_with_sales']}")
+    print(f"Lots stored: {stats['lots_stored']}")
+    print(f"Last fetch: {stats['last_fetch'] or 'never'}")
+    print("\n--- API Quota ---")
+    print(f"Calls today: {quota['calls_made']}/{quota['daily_limit']}")
+    print(f"Remaining: {quota['calls_remaining']}")
+    print(f"\n{lock_status()}")
+    print("=" * 50 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Auction Ingestion - Load realized auction prices from PCGS API',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python ingest_auctions.py --status             Show fetch log and quota
+  python ingest_auctions.py                      Ingest up to 25 due coins
+  python ingest_auctions.py --limit 100          Ingest up to 100 due coins
+  python ingest_auctions.py --priority P0        Only P0 priority coins
+  python ingest_auctions.py --series "Morgan Dollars"
+  python ingest_auctions.py --pcgs 7172 7174     Specific coins (ignores --min-age-days)
+        """
+    )
+
+    parser.add_argument('--status', action='store_true',
+                        help='Show fetch log and quota status')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Fetch and parse without writing to the database')
+    parser.add_argument('--limit', type=int, default=DEFAULT_LIMIT,
+                        help=f'Maximum coins to fetch (default: {DEFAULT_LIMIT})')
+    parser.add_argument('--priority', type=str, choices=['P0', 'P1', 'P2', 'P3'],
+                        help='Only coins in specific priority tier')
+    parser.add_argument('--series', type=str,
+                        help='Only coins in this series (CoinReference.series)')
+    parser.add_argument('--pcgs', type=int, nargs='+',
+                        help='Specific PCGS numbers to fetch')
+    parser.add_argument('--min-age-days', type=int, default=DEFAULT_MIN_AGE_DAYS,
+                        help=f'Skip coins fetched within this many days (default: {DEFAULT_MIN_AGE_DAYS})')
+    parser.add_argument('--concurrency', type=int,
+                        help=f'Max concurrent API requests (default: {PCGSApiClient.DEFAULT_CONCURRENCY})')
+    parser.add_argument('--rate', type=float,
+                        help=f'Max API requests per second (default: {PCGSApiClient.DEFAULT_REQUESTS_PER_SECOND})')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Bypass the API response cache (always call the API)')
+    parser.add_argument('--debug', action='store_true',
+                        help='Enable debug logging')
+    add_lock_arguments(parser)
+
+    args = parser.parse_args()
+
+    if args.debug:
+        logging.getLogger().setLevel(logging.DEBUG)
+
+    if args.status:
+        show_status()
+        return
+
+    lock = acquire_for_cli("ingest_auctions", args)
+    ingester = AuctionIngester(
+        dry_run=args.dry_run,
+        concurrency=args.concurrency,
+        requests_per_second=args.rate,
+        bypass_cache=args.no_cache,
+        min_age_days=args.min_age_days,
+    )
+    try:
+        asyncio.run(ingester.run(
+            limit=args.limit,
+            priority=args.priority,
+            series=args.series,
+            pcgs_numbers=args.pcgs,
+        ))
+    finally:
+        lock.release()
+
+
+if __name__ == '__main__':
+    main()
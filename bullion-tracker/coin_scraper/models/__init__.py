@@ -3,5 +3,7 @@
 from .coin_reference import CoinReference
 from .valid_grade import ValidGrade
 from .coin_price_guide import CoinPriceGuide
+from .coin_latest_price import CoinLatestPrice
+from .coin_auction_price import CoinAuctionPrice
 
-__all__ = ['CoinReference', 'ValidGrade', 'CoinPriceGuide']
+__all__ = ['CoinReference', 'ValidGrade', 'CoinPriceGuide', 'CoinLatestPrice', 'CoinAuctionPrice']
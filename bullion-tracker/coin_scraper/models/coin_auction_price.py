@@ -0,0 +1,30 @@
+from sqlalchemy import Column, String, Integer, Numeric, Date, DateTime, ForeignKey, func, Index
+from sqlalchemy.orm import relationship
+import sys
+sys.path.append('..')
+from database import Base
+
+class CoinAuctionPrice(Base):
+    __tablename__ = 'CoinAuctionPrice'
+
+    id = Column(String, primary_key=True)
+    coinReferenceId = Column('coinReferenceId', String, ForeignKey('CoinReference.id', ondelete='CASCADE'), nullable=False)
+    pcgsNumber = Column('pcgsNumber', Integer, nullable=False)
+    gradeCode = Column('gradeCode', String(10))
+    saleDate = Column('saleDate', Date, nullable=False)
+    price = Column(Numeric(12, 2), nullable=False)
+    auctionHouse = Column('auctionHouse', String(100))
+    saleName = Column('saleName', String(200))
+    lotNumber = Column('lotNumber', String(30))
+    certNumber = Column('certNumber', String(20))
+    lotKey = Column('lotKey', String(40), unique=True, nullable=False)
+    createdAt = Column('createdAt', DateTime, server_default=func.now())
+
+    coinReference = relationship("CoinReference", back_populates="auctionPrices")
+
+    __table_args__ = (
+        Index('CoinAuctionPrice_pcgsNumber_gradeCode_saleDate_idx', 'pcgsNumber', 'gradeCode', 'saleDate'),
+    )
+
+    def __repr__(self):
+        return f"<CoinAuctionPrice {self.pcgsNumber} {self.gradeCode} {self.saleDate}: ${self.price}>"
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, String, Integer, Numeric, Date, DateTime, ForeignKey, func, Index
+from sqlalchemy.orm import relationship
+import sys
+sys.path.append('..')
+from database import Base
+
+class CoinLatestPrice(Base):
+    """Latest known price per coin and grade.
+
+    Maintained by the coin_latest_price_trigger on CoinPriceGuide; never
+    written directly.
+    """
+    __tablename__ = 'CoinLatestPrice'
+
+    coinReferenceId = Column('coinReferenceId', String, ForeignKey('CoinReference.id', ondelete='CASCADE'), primary_key=True)
+    gradeCode = Column('gradeCode', String(10), primary_key=True)
+    pcgsPrice = Column('pcgsPrice', Numeric(12, 2))
+    population = Column(Integer)
+    priceDate = Column('priceDate', Date, nullable=False)
+    updatedAt = Column('updatedAt', DateTime, server_default=func.now())
+
+    coinReference = relationship("CoinReference", back_populates="latestPrices")
+
+    __table_args__ = (
+        Index('CoinLatestPrice_priceDate_idx', 'priceDate'),
+    )
+
+    def __repr__(self):
+        return f"<CoinLatestPrice {self.coinReferenceId} {self.gradeCode}: ${self.pcgsPrice} ({self.priceDate})>"
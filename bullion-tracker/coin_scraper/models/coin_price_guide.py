@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Numeric, Date, DateTime, ForeignKey, UniqueConstraint, func, Index
+from sqlalchemy import Column, String, Integer, Numeric, Date, DateTime, ForeignKey, UniqueConstraint, func, Index
 from sqlalchemy.orm import relationship
 import sys
 sys.path.append('..')
@@ -11,6 +11,7 @@ class CoinPriceGuide(Base):
     coinReferenceId = Column('coinReferenceId', String, ForeignKey('CoinReference.id', ondelete='CASCADE'), nullable=False)
     gradeCode = Column('gradeCode', String(10), ForeignKey('ValidGrade.gradeCode'), nullable=False)
     pcgsPrice = Column('pcgsPrice', Numeric(12, 2))
+    population = Column(Integer)
     priceDate = Column('priceDate', Date, nullable=False)
     createdAt = Column('createdAt', DateTime, server_default=func.now())
 
@@ -14,6 +14,7 @@ class CoinReference(Base):
     mintMark = Column('mintMark', String(5))
     denomination = Column(String(50), nullable=False)
     series = Column(String(100), nullable=False, index=True)
+    priorityTier = Column('priorityTier', Integer, index=True)
     variety = Column(String(200))
     metal = Column(String(20))
     weightOz = Column('weightOz', Numeric(10, 4))
@@ -21,10 +22,14 @@ class CoinReference(Base):
     mintage = Column(Integer)
     fullName = Column('fullName', String(300), nullable=False)
     searchTokens = Column('searchTokens', String)
+    contentHash = Column('contentHash', String(64))
+    lastVerifiedAt = Column('lastVerifiedAt', DateTime)
     createdAt = Column('createdAt', DateTime, server_default=func.now())
     updatedAt = Column('updatedAt', DateTime, server_default=func.now(), onupdate=func.now())
 
     priceGuides = relationship("CoinPriceGuide", back_populates="coinReference")
+    auctionPrices = relationship("CoinAuctionPrice", back_populates="coinReference")
+    latestPrices = relationship("CoinLatestPrice", back_populates="coinReference")
 
     def __repr__(self):
         return f"<CoinReference {self.pcgsNumber}: {self.fullName}>"
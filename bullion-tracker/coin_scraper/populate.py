@@ -24,8 +24,9 @@ from typing import Dict, Optional, List
 sys.path.insert(0, str(Path(__file__).parent))
 
 from config import COIN_SERIES, DATABASE_URL
-from scrapers.pcgs_scraper import PCGSScraper
-from scrapers.progress_tracker import ProgressTracker
+from scrapers.pcgs_scraper import PCGSScraper, WorkPlan
+from scrapers.progress_tracker import ProgressTracker, SeenCoins
+from run_lock import add_lock_arguments, acquire_for_cli, lock_status
 
 # Database
 from sqlalchemy import create_engine, text
@@ -143,6 +144,7 @@ class PopulationRunner:
             est_total = sum(s.get('est_coins', 0) for s in series_list)
             print(f"  {priority}: {tier_count:,} / ~{est_total:,} estimated")
 
+        print("\n" + lock_status())
         print("=" * 60 + "\n")
 
     def show_progress_report(self):
@@ -180,14 +182,10 @@ class PopulationRunner:
             self.logger.info(f"All {priority} series already complete!")
             return
 
-        # Calculate estimates
-        est_coins = sum(s.get('est_coins', 0) for s in pending_series)
-
         self.logger.info("=" * 60)
         self.logger.info(f"  STARTING {priority} POPULATION RUN")
         self.logger.info("=" * 60)
         self.logger.info(f"Series to scrape: {len(pending_series)}")
-        self.logger.info(f"Estimated coins: ~{est_coins:,}")
         if self.dry_run:
             self.logger.info(f"DRY RUN MODE - no database writes")
             if limit:
@@ -198,6 +196,9 @@ class PopulationRunner:
         self.initial_counts = self.get_db_counts()
         self.logger.info(f"Initial database count: {self.initial_counts.get('__total__', 0):,} coins")
 
+        # Fetch every pending category page up front for exact totals
+        plan = await self.plan_run(pending_series)
+
         # Start run tracking
         run_id = self.tracker.start_run(priority_filter=priority)
 
@@ -207,6 +208,9 @@ class PopulationRunner:
         else:
             db = self.get_db_session()
 
+        # One seen-set for the whole run: a coin listed in several series is fetched once
+        seen_coins = SeenCoins(self.tracker)
+
         try:
             # Process each series
             if HAS_TQDM and not self.dry_run:
@@ -220,15 +224,17 @@ class PopulationRunner:
 
                 self.logger.info(f"\n[{i+1}/{len(pending_series)}] {series['name']}")
 
-                scraper = PCGSScraper(db, progress_tracker=self.tracker)
+                scraper = PCGSScraper(db, progress_tracker=self.tracker, seen_coins=seen_coins)
                 try:
                     if self.dry_run:
-                        await self._dry_run_series(scraper, series, limit)
+                        await self._dry_run_series(scraper, series, limit,
+                                                   plan.series_coins.get(series['slug']))
                     else:
                         await scraper.scrape_and_save_series(
                             series['name'],
                             series['slug'],
-                            series['category_id']
+                            series['category_id'],
+                            coins=plan.series_coins.get(series['slug'])
                         )
                         self.coins_scraped += scraper.stats['coins_scraped']
                         self.coins_failed += scraper.stats['coins_failed']
@@ -254,14 +260,32 @@ class PopulationRunner:
         # Generate end-of-run report
         self._generate_report(priority)
 
-    async def _dry_run_series(self, scraper: PCGSScraper, series: Dict, limit: Optional[int]):
+    async def plan_run(self, pending_series: List[Dict]) -> WorkPlan:
+        """Prefetch all pending category pages and log the exact work list and ETA."""
+        est_coins = sum(s.get('est_coins', 0) for s in pending_series)
+
+        scraper = PCGSScraper(MockDB(), progress_tracker=self.tracker)
+        try:
+            plan = await scraper.plan_series(pending_series)
+        finally:
+            await scraper.close()
+
+        self.logger.info(f"Planned in {plan.planning_seconds:.0f}s (config estimate was ~{est_coins:,} coins)")
+        for line in plan.summary().split("\n"):
+            self.logger.info(line)
+        self.logger.info("")
+        return plan
+
+    async def _dry_run_series(self, scraper: PCGSScraper, series: Dict, limit: Optional[int],
+                              coins: Optional[List[Dict]] = None):
         """Run series in dry-run mode."""
-        self.logger.info(f"  Fetching series page...")
-        coins = await scraper.scrape_series(
-            series['name'],
-            series['slug'],
-            series['category_id']
-        )
+        if coins is None:
+            self.logger.info("  Fetching series page...")
+            coins = await scraper.scrape_series(
+                series['name'],
+                series['slug'],
+                series['category_id']
+            )
 
         if not coins:
             self.logger.warning(f"  No coins found for {series['name']}")
@@ -374,6 +398,7 @@ Examples:
                         help='Show full progress report')
     parser.add_argument('--debug', action='store_true',
                         help='Enable debug logging')
+    add_lock_arguments(parser)
 
     args = parser.parse_args()
 
@@ -400,8 +425,12 @@ Examples:
         logging.getLogger().setLevel(logging.DEBUG)
 
     # Run population
+    lock = acquire_for_cli("populate", args)
     runner = PopulationRunner(dry_run=args.dry_run)
-    asyncio.run(runner.run_population(args.priority, limit=args.limit))
+    try:
+        asyncio.run(runner.run_population(args.priority, limit=args.limit))
+    finally:
+        lock.release()
 
 
 if __name__ == '__main__':
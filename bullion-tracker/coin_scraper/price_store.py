@@ -0,0 +1,207 @@
+"""
+Price Store
+
+Shared write path for CoinPriceGuide rows coming from the PCGS API.
+Used by refresh_prices.py and scripts/test_pcgs_api.py so every API payload
+(grade lookups and cert lookups alike) is persisted the same way.
+Auction prices realized are written to CoinAuctionPrice by ingest_auctions.py.
+"""
+
+import uuid
+import logging
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import text, bindparam
+
+from api.response_extractor import CoinFacts, AuctionRecord
+
+logger = logging.getLogger(__name__)
+
+
+def generate_id() -> str:
+    """Generate a cuid-length id for Prisma-managed tables."""
+    return str(uuid.uuid4()).replace('-', '')[:25]
+
+
+def load_valid_grades(engine) -> Set[str]:
+    """Load grade codes accepted by the CoinPriceGuide foreign key."""
+    with engine.connect() as conn:
+        result = conn.execute(text('SELECT "gradeCode" FROM "ValidGrade"'))
+        return {row[0] for row in result}
+
+
+def find_coin_id(engine, pcgs_number: int) -> Optional[str]:
+    """Look up a CoinReference id by PCGS number."""
+    with engine.connect() as conn:
+        result = conn.execute(text("""
+            SELECT id FROM "CoinReference" WHERE "pcgsNumber" = :pcgs_number
+        """), {"pcgs_number": pcgs_number})
+        row = result.fetchone()
+        return row[0] if row else None
+
+
+def upsert_price_guide(conn, coin_id: str, grade: str, price: Optional[Decimal],
+                       source: str, population: Optional[int] = None,
+                       price_date: Optional[date] = None):
+    """
+    Insert or update one CoinPriceGuide row for (coin, grade, date).
+
+    A NULL price or population never overwrites an existing value.
+    CoinLatestPrice is updated from this row by a database trigger.
+    """
+    conn.execute(text("""
+        INSERT INTO "CoinPriceGuide"
+        (id, "coinReferenceId", "gradeCode", "pcgsPrice", population, "priceSource", "priceDate", "createdAt")
+        VALUES (:id, :coin_id, :grade, :price, :population, :source, :price_date, NOW())
+        ON CONFLICT ("coinReferenceId", "gradeCode", "priceDate") DO UPDATE SET
+            "pcgsPrice" = COALESCE(EXCLUDED."pcgsPrice", "CoinPriceGuide"."pcgsPrice"),
+            population = COALESCE(EXCLUDED.population, "CoinPriceGuide".population),
+            "priceSource" = EXCLUDED."priceSource"
+    """), {
+        "id": generate_id(),
+        "coin_id": coin_id,
+        "grade": grade,
+        "price": price,
+        "population": population,
+        "source": source,
+        "price_date": price_date or date.today(),
+    })
+
+
+def update_latest_population(conn, coin_id: str, grade: str, population: int) -> bool:
+    """
+    Set the population on a grade's most recent CoinPriceGuide row.
+
+    Used for grades that came back without a price: a new row dated today
+    would make the coin look freshly priced (CoinLatestPrice.priceDate)
+    when it isn't.
+
+    Returns:
+        False if the grade has no price guide row yet
+    """
+    result = conn.execute(text("""
+        UPDATE "CoinPriceGuide" SET population = :population
+        WHERE id = (
+            SELECT id FROM "CoinPriceGuide"
+            WHERE "coinReferenceId" = :coin_id AND "gradeCode" = :grade
+            ORDER BY "priceDate" DESC
+            LIMIT 1
+        )
+    """), {"coin_id": coin_id, "grade": grade, "population": population})
+    return result.rowcount > 0
+
+
+def store_coin_facts(engine, coin_id: str, facts: CoinFacts, valid_grades: Set[str],
+                     source: str = "pcgs") -> int:
+    """
+    Persist everything extracted from an API payload.
+
+    Upserts a CoinPriceGuide row dated today for every grade with a price.
+    Population-only grades update their latest existing row instead (and
+    are skipped if there is none), so they don't bump the price date.
+    Also fills CoinReference metadata columns that are still empty.
+
+    Returns:
+        Number of CoinPriceGuide rows written
+    """
+    written = 0
+
+    with engine.connect() as conn:
+        for grade in sorted(facts.grades):
+            if grade not in valid_grades:
+                logger.debug(f"Skipping unknown grade {grade} for coin {coin_id}")
+                continue
+
+            if grade not in facts.prices:
+                if update_latest_population(conn, coin_id, grade, facts.populations[grade]):
+                    written += 1
+                continue
+
+            upsert_price_guide(
+                conn,
+                coin_id,
+                grade,
+                facts.prices[grade],
+                source,
+                population=facts.populations.get(grade),
+            )
+            written += 1
+
+        metadata = facts.metadata
+        if metadata.get('mintage') or metadata.get('variety'):
+            conn.execute(text("""
+                UPDATE "CoinReference"
+                SET mintage = COALESCE(mintage, :mintage),
+                    variety = COALESCE(variety, :variety)
+                WHERE id = :coin_id
+            """), {
+                "mintage": metadata.get('mintage'),
+                "variety": metadata.get('variety'),
+                "coin_id": coin_id,
+            })
+
+        conn.commit()
+
+    return written
+
+
+def load_last_sale_dates(engine, pcgs_numbers: Iterable[int]) -> Dict[int, date]:
+    """
+    Latest stored auction sale date per coin (the incremental watermark).
+
+    Coins with no stored auction lots are absent from the result.
+    """
+    pcgs_numbers = list(pcgs_numbers)
+    if not pcgs_numbers:
+        return {}
+
+    query = text("""
+        SELECT "pcgsNumber", MAX("saleDate")
+        FROM "CoinAuctionPrice"
+        WHERE "pcgsNumber" IN :pcgs_numbers
+        GROUP BY "pcgsNumber"
+    """).bindparams(bindparam("pcgs_numbers", expanding=True))
+
+    with engine.connect() as conn:
+        result = conn.execute(query, {"pcgs_numbers": pcgs_numbers})
+        return {row[0]: row[1] for row in result}
+
+
+def store_auction_records(engine, coin_id: str, records: List[AuctionRecord]) -> int:
+    """
+    Insert auction lots, skipping any lot already stored.
+
+    Returns:
+        Number of new CoinAuctionPrice rows
+    """
+    inserted = 0
+
+    with engine.connect() as conn:
+        for record in records:
+            result = conn.execute(text("""
+                INSERT INTO "CoinAuctionPrice"
+                (id, "coinReferenceId", "pcgsNumber", "gradeCode", "saleDate", price,
+                 "auctionHouse", "saleName", "lotNumber", "certNumber", "lotKey", "createdAt")
+                VALUES (:id, :coin_id, :pcgs_number, :grade, :sale_date, :price,
+                        :auction_house, :sale_name, :lot_number, :cert_number, :lot_key, NOW())
+                ON CONFLICT ("lotKey") DO NOTHING
+            """), {
+                "id": generate_id(),
+                "coin_id": coin_id,
+                "pcgs_number": record.pcgs_number,
+                "grade": record.grade,
+                "sale_date": record.sale_date,
+                "price": record.price,
+                "auction_house": (record.auction_house or '')[:100] or None,
+                "sale_name": (record.sale_name or '')[:200] or None,
+                "lot_number": (record.lot_number or '')[:30] or None,
+                "cert_number": (record.cert_number or '')[:20] or None,
+                "lot_key": record.lot_key,
+            })
+            inserted += result.rowcount
+
+        conn.commit()
+
+    return inserted
@@ -11,6 +11,7 @@ Usage:
     python refresh_prices.py --limit 50            # Update up to 50 coins
     python refresh_prices.py --priority P0         # Only update P0 priority coins
     python refresh_prices.py --report              # Show last 7 days activity
+    python refresh_prices.py --concurrency 8       # Up to 8 API requests in flight
 
 Environment:
     DATABASE_URL: PostgreSQL connection string
@@ -22,18 +23,22 @@ import argparse
 import asyncio
 import sys
 import logging
-import json
+import time
 from datetime import datetime, date, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-from decimal import Decimal
+from typing import Dict, List, Optional, Set
 
 # Add parent dir to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from config import DATABASE_URL, COIN_SERIES
-from api.pcgs_api import PCGSApiClient, PCGSApiError, QuotaExceededError
-from api.quota_tracker import QuotaTracker
+from config import DATABASE_URL
+from api.pcgs_api import PCGSApiClient, BatchResult, QuotaExceededError
+from api.response_cache import ResponseCache
+from api.response_extractor import CoinFacts, extract_coin_facts
+from price_store import load_valid_grades, store_coin_facts
+from shared_limits import make_quota_tracker, api_rate_limiter
+from run_lock import add_lock_arguments, acquire_for_cli, lock_status
+from run_ledger import RunLedger, OUTCOME_UPDATED, OUTCOME_NO_DATA, OUTCOME_ERROR, OUTCOME_QUOTA
 
 # Database
 from sqlalchemy import create_engine, text
@@ -45,7 +50,6 @@ logger = logging.getLogger(__name__)
 # Paths
 DATA_DIR = Path(__file__).parent / "data"
 LOGS_DIR = Path(__file__).parent / "logs"
-HISTORY_FILE = DATA_DIR / "price_refresh_history.json"
 
 # Target grades to fetch prices for (most common collectible grades)
 TARGET_GRADES = ["MS65", "MS66", "MS67", "PR70", "MS64", "AU58"]
@@ -54,17 +58,27 @@ TARGET_GRADES = ["MS65", "MS66", "MS67", "PR70", "MS64", "AU58"]
 class PriceRefresher:
     """Refreshes coin prices from PCGS API with quota management."""
 
-    def __init__(self, dry_run: bool = False):
+    def __init__(self, dry_run: bool = False, concurrency: Optional[int] = None,
+                 requests_per_second: Optional[float] = None, bypass_cache: bool = False):
         self.dry_run = dry_run
-        self.quota_tracker = QuotaTracker()
+        self.concurrency = concurrency
+        self.requests_per_second = requests_per_second
+        self.bypass_cache = bypass_cache
+        self.quota_tracker = make_quota_tracker()
+        self.ledger = RunLedger()
+        self.ledger.import_legacy_history()
+        self.run_id: Optional[int] = None
         self.start_time = datetime.now()
 
         # Stats
         self.coins_updated = 0
         self.coins_skipped = 0
-        self.coins_failed = 0
+        self.coins_failed = 0  # Distinct coins, not lookups
         self.api_calls_made = 0
+        self.cache_hits = 0
+        self.coalesced = 0
         self.errors: List[str] = []
+        self._valid_grades: Optional[Set[str]] = None
 
         # Setup logging
         self._setup_logging()
@@ -126,21 +140,28 @@ class PriceRefresher:
 
         return min(daily_budget, remaining)
 
-    def get_coins_needing_update(self, engine, limit: int, priority: Optional[str] = None) -> List[Dict]:
+    def get_coins_needing_update(self, engine, limit: int, priority: Optional[str] = None,
+                                 exclude: Optional[List[int]] = None) -> List[Dict]:
         """Get coins that need price updates.
 
         Order by:
-        1. Priority tier (P0, P1, P2, P3)
+        1. Priority tier (P0, P1, P2, P3; series not in COIN_SERIES last)
         2. Last update date (oldest first)
         3. No price guide entry at all
+
+        Last update dates come from CoinLatestPrice (one row per coin and
+        grade), so the query doesn't scan the full price history. PCGS
+        numbers in exclude (e.g. recently attempted) are skipped.
         """
-        # Build priority filter
+        # Priority tiers are synced from COIN_SERIES by scripts/sync_priorities.py
+        params = {"limit": limit}
         priority_filter = ""
         if priority:
-            series_names = [s['name'] for s in COIN_SERIES if s.get('priority') == priority]
-            if series_names:
-                series_list = ", ".join([f"'{name}'" for name in series_names])
-                priority_filter = f'AND cr.series IN ({series_list})'
+            priority_filter = 'AND cr."priorityTier" = :tier'
+            params["tier"] = int(priority[1:])
+        if exclude:
+            priority_filter += ' AND NOT (cr."pcgsNumber" = ANY(:exclude))'
+            params["exclude"] = list(exclude)
 
         query = text(f"""
             WITH priority_order AS (
@@ -149,35 +170,25 @@ class PriceRefresher:
                     cr."pcgsNumber",
                     cr."fullName",
                     cr.series,
-                    CASE
-                        WHEN cr.series IN (SELECT unnest(array['Silver Eagles', 'Gold Eagles', 'Platinum Eagles',
-                            'American Gold Buffalo', 'Morgan Dollars', 'Peace Dollars',
-                            'Lincoln Cents Wheat Reverse', 'Mercury Dimes', 'Walking Liberty Halves']))
-                        THEN 0
-                        WHEN cr.series LIKE 'Jefferson%' OR cr.series LIKE 'Buffalo%' OR
-                             cr.series LIKE 'Roosevelt%' OR cr.series LIKE 'Washington%'
-                        THEN 1
-                        WHEN cr.series LIKE 'Barber%' OR cr.series LIKE 'Indian%' OR
-                             cr.series LIKE 'Lincoln%' OR cr.series LIKE 'Seated%'
-                        THEN 2
-                        ELSE 3
-                    END as priority_tier,
-                    MAX(cpg."priceDate") as last_update
+                    cr."priorityTier" as priority_tier,
+                    lp.last_update
                 FROM "CoinReference" cr
-                LEFT JOIN "CoinPriceGuide" cpg ON cr.id = cpg."coinReferenceId"
-                WHERE 1=1 {priority_filter}
-                GROUP BY cr.id, cr."pcgsNumber", cr."fullName", cr.series
-                HAVING MAX(cpg."priceDate") IS NULL
-                    OR MAX(cpg."priceDate") < CURRENT_DATE - INTERVAL '7 days'
+                LEFT JOIN (
+                    SELECT "coinReferenceId", MAX("priceDate") as last_update
+                    FROM "CoinLatestPrice"
+                    GROUP BY "coinReferenceId"
+                ) lp ON cr.id = lp."coinReferenceId"
+                WHERE (lp.last_update IS NULL OR lp.last_update < CURRENT_DATE - INTERVAL '7 days')
+                    {priority_filter}
             )
             SELECT coin_id, "pcgsNumber", "fullName", series, priority_tier, last_update
             FROM priority_order
-            ORDER BY priority_tier ASC, last_update ASC NULLS FIRST
+            ORDER BY priority_tier ASC NULLS LAST, last_update ASC NULLS FIRST
             LIMIT :limit
         """)
 
         with engine.connect() as conn:
-            result = conn.execute(query, {"limit": limit})
+            result = conn.execute(query, params)
             coins = []
             for row in result:
                 coins.append({
@@ -190,110 +201,104 @@ class PriceRefresher:
                 })
         return coins
 
-    async def fetch_price_from_api(self, client: PCGSApiClient, pcgs_number: int, grade: str) -> Optional[Dict]:
-        """Fetch price data from PCGS API for a specific grade."""
-        try:
-            data = await client.get_coin_by_pcgs_and_grade(pcgs_number, grade)
-            self.api_calls_made += 1
-
-            if data and isinstance(data, dict):
-                # Extract price from response
-                price = data.get('PriceGuideValue') or data.get('Price') or data.get('Value')
-                if price:
-                    return {
-                        "grade": grade,
-                        "price": Decimal(str(price)),
-                        "source": "pcgs"
-                    }
-            return None
-
-        except QuotaExceededError:
-            self.logger.warning(f"Quota exceeded while fetching PCGS#{pcgs_number}")
-            raise
-        except PCGSApiError as e:
-            self.logger.debug(f"API error for PCGS#{pcgs_number} {grade}: {e}")
-            return None
-        except Exception as e:
-            self.logger.error(f"Unexpected error fetching PCGS#{pcgs_number} {grade}: {e}")
-            return None
-
-    def upsert_price_guide(self, engine, coin_id: str, grade: str, price: Decimal, source: str):
-        """Insert or update CoinPriceGuide entry."""
-        today = date.today()
+    def get_valid_grades(self, engine) -> Set[str]:
+        """Grade codes that can be written to CoinPriceGuide (cached per run)."""
+        if self._valid_grades is None:
+            self._valid_grades = load_valid_grades(engine)
+        return self._valid_grades
 
-        with engine.connect() as conn:
-            # Check if entry exists for today
-            check = conn.execute(text("""
-                SELECT id FROM "CoinPriceGuide"
-                WHERE "coinReferenceId" = :coin_id
-                AND "gradeCode" = :grade
-                AND "priceDate" = :today
-            """), {"coin_id": coin_id, "grade": grade, "today": today})
-
-            existing = check.fetchone()
-
-            if existing:
-                # Update existing
-                conn.execute(text("""
-                    UPDATE "CoinPriceGuide"
-                    SET "pcgsPrice" = :price, "priceSource" = :source
-                    WHERE id = :id
-                """), {"price": price, "source": source, "id": existing[0]})
-            else:
-                # Insert new - need to generate cuid-like id
-                import uuid
-                new_id = str(uuid.uuid4()).replace('-', '')[:25]
-
-                conn.execute(text("""
-                    INSERT INTO "CoinPriceGuide"
-                    (id, "coinReferenceId", "gradeCode", "pcgsPrice", "priceSource", "priceDate", "createdAt")
-                    VALUES (:id, :coin_id, :grade, :price, :source, :today, NOW())
-                """), {
-                    "id": new_id,
-                    "coin_id": coin_id,
-                    "grade": grade,
-                    "price": price,
-                    "source": source,
-                    "today": today
-                })
+    def handle_api_result(self, engine, coin: Dict, result: BatchResult, harvested: CoinFacts) -> int:
+        """Extract and store everything in one API result, recording it in the ledger.
 
-            conn.commit()
+        Returns the number of grades not already harvested for this coin.
+        """
+        api_ms = result.elapsed * 1000
+
+        if not result.ok:
+            self.logger.debug(f"API error for PCGS#{result.pcgs_number} {result.grade}: {result.error}")
+            self._record_lookup(result, OUTCOME_ERROR, api_ms, error=str(result.error))
+            return 0
+
+        facts = extract_coin_facts(result.data, requested_grade=result.grade)
+        if not facts.grades:
+            self._record_lookup(result, OUTCOME_NO_DATA, api_ms)
+            return 0
+
+        new_grades = facts.grades - harvested.grades
+        harvested.merge(facts)
+        db_ms = None
+        if not self.dry_run:
+            db_started = time.monotonic()
+            store_coin_facts(engine, coin['coin_id'], facts, self.get_valid_grades(engine))
+            db_ms = (time.monotonic() - db_started) * 1000
+
+        for g in sorted(new_grades):
+            self.logger.debug(f"    PCGS#{coin['pcgs_number']} {g}: ${facts.prices.get(g)} "
+                              f"(pop {facts.populations.get(g)})")
+        self._record_lookup(result, OUTCOME_UPDATED if new_grades else OUTCOME_NO_DATA,
+                            api_ms, db_ms, grades_fetched=len(new_grades))
+        return len(new_grades)
+
+    def _record_lookup(self, result: BatchResult, outcome: str, api_ms: Optional[float] = None,
+                       db_ms: Optional[float] = None, grades_fetched: int = 0,
+                       error: Optional[str] = None):
+        """Append one lookup to the run ledger (no-op outside run())."""
+        if self.run_id is None:
+            return
+        self.ledger.record_lookup(self.run_id, result.pcgs_number, result.grade, outcome,
+                                  api_ms=api_ms, db_ms=db_ms, grades_fetched=grades_fetched,
+                                  error=error)
 
-    async def refresh_coin_prices(self, engine, coin: Dict, client: PCGSApiClient) -> Tuple[int, int]:
-        """Refresh prices for a single coin across target grades.
+    async def refresh_prices(self, engine, coins: List[Dict], client: PCGSApiClient):
+        """Refresh prices for many coins across target grades.
 
-        Returns: (updated_count, failed_count)
+        Grades are fetched in waves: each wave requests one target grade for
+        every coin concurrently through the client's batch API. Any grade
+        already harvested from an earlier response is not requested again.
         """
-        updated = 0
-        failed = 0
-
-        self.logger.info(f"  Refreshing PCGS#{coin['pcgs_number']}: {coin['full_name'][:50]}")
+        coins_by_pcgs = {coin['pcgs_number']: coin for coin in coins}
+        harvested = {pcgs: CoinFacts() for pcgs in coins_by_pcgs}
+        updated = {pcgs: 0 for pcgs in coins_by_pcgs}
+        failed = set()  # Coins with at least one lookup that added nothing
 
         for grade in TARGET_GRADES:
-            if not self.quota_tracker.check_quota():
-                self.logger.warning("Quota exhausted, stopping")
+            pairs = [(pcgs, grade) for pcgs in coins_by_pcgs if grade not in harvested[pcgs].prices]
+            if not pairs:
+                continue
+
+            self.logger.info(f"Fetching {grade} for {len(pairs)} coins...")
+            quota_hit = False
+
+            async for result in client.get_coins_by_pcgs_and_grade(pairs):
+                if isinstance(result.error, QuotaExceededError):
+                    # Let in-flight requests drain; the batch stops launching new ones
+                    quota_hit = True
+                    self._record_lookup(result, OUTCOME_QUOTA)
+                    continue
+
+                coin = coins_by_pcgs[result.pcgs_number]
+                try:
+                    new_count = self.handle_api_result(engine, coin, result, harvested[result.pcgs_number])
+                except Exception as e:
+                    self.logger.error(f"Error storing PCGS#{result.pcgs_number} {grade}: {e}")
+                    self.errors.append(f"PCGS#{result.pcgs_number}: {str(e)}")
+                    self._record_lookup(result, OUTCOME_ERROR, result.elapsed * 1000, error=str(e))
+                    new_count = 0
+
+                if new_count:
+                    updated[result.pcgs_number] += new_count
+                else:
+                    failed.add(result.pcgs_number)
+
+            if quota_hit:
+                self.logger.warning("Quota exhausted, stopping early")
                 break
 
-            price_data = await self.fetch_price_from_api(client, coin['pcgs_number'], grade)
-
-            if price_data:
-                if not self.dry_run:
-                    self.upsert_price_guide(
-                        engine,
-                        coin['coin_id'],
-                        price_data['grade'],
-                        price_data['price'],
-                        price_data['source']
-                    )
-                updated += 1
-                self.logger.debug(f"    {grade}: ${price_data['price']}")
-            else:
-                failed += 1
-
-            # Small delay between API calls
-            await asyncio.sleep(0.5)
-
-        return updated, failed
+        self.coins_failed += len(failed)
+        for pcgs, count in updated.items():
+            self.coins_updated += count
+            if count == 0:
+                self.coins_skipped += 1
 
     async def run(self, limit: Optional[int] = None, priority: Optional[str] = None):
         """Run the price refresh process."""
@@ -319,41 +324,29 @@ class PriceRefresher:
             return
 
         self.logger.info(f"Found {len(coins)} coins needing price updates")
+        self.run_id = self.ledger.start_run(self.dry_run, priority, budget)
 
         # Process coins
-        async with PCGSApiClient(quota_tracker=self.quota_tracker) as client:
+        async with PCGSApiClient(
+            quota_tracker=self.quota_tracker,
+            max_concurrency=self.concurrency,
+            requests_per_second=self.requests_per_second,
+            bypass_cache=self.bypass_cache,
+            rate_limiter=api_rate_limiter(self.requests_per_second or PCGSApiClient.DEFAULT_REQUESTS_PER_SECOND),
+        ) as client:
             try:
                 await client.authenticate()
-
-                for i, coin in enumerate(coins):
-                    if not self.quota_tracker.check_quota():
-                        self.logger.warning("Quota exhausted, stopping early")
-                        break
-
-                    self.logger.info(f"\n[{i+1}/{len(coins)}] Processing...")
-
-                    try:
-                        updated, failed = await self.refresh_coin_prices(engine, coin, client)
-                        self.coins_updated += updated
-                        self.coins_failed += failed
-
-                        if updated > 0:
-                            self.logger.info(f"    Updated {updated} grades")
-                        else:
-                            self.coins_skipped += 1
-
-                    except QuotaExceededError:
-                        self.logger.error("Quota exceeded, stopping")
-                        break
-                    except Exception as e:
-                        self.logger.error(f"Error processing coin: {e}")
-                        self.errors.append(f"PCGS#{coin['pcgs_number']}: {str(e)}")
-                        self.coins_failed += 1
+                await self.refresh_prices(engine, coins, client)
 
             except Exception as e:
                 self.logger.error(f"Fatal error: {e}")
                 self.errors.append(str(e))
 
+            client_stats = client.get_stats()
+            self.api_calls_made = client_stats['api_calls']
+            self.cache_hits = client_stats['cache_hits']
+            self.coalesced = client_stats['coalesced']
+
         # Generate report
         self._generate_report()
         self._save_history()
@@ -377,8 +370,10 @@ class PriceRefresher:
             "--- Results ---",
             f"Price updates: {self.coins_updated}",
             f"Coins skipped: {self.coins_skipped}",
-            f"Failures: {self.coins_failed}",
+            f"Coins with failed lookups: {self.coins_failed}",
             f"API calls made: {self.api_calls_made}",
+            f"Cache hits (quota saved): {self.cache_hits}",
+            f"Coalesced duplicate requests: {self.coalesced}",
             "",
             "--- Quota ---",
             f"Calls today: {quota_status['calls_made']}/{quota_status['daily_limit']}",
@@ -416,42 +411,23 @@ class PriceRefresher:
         md_path.write_text("\n".join(content))
 
     def _save_history(self):
-        """Save run to history file."""
-        history = self._load_history()
-
-        run_record = {
-            "timestamp": datetime.now().isoformat(),
+        """Record run counters in the ledger."""
+        if self.run_id is None:
+            return
+        self.ledger.complete_run(self.run_id, {
             "coins_updated": self.coins_updated,
             "coins_skipped": self.coins_skipped,
             "coins_failed": self.coins_failed,
             "api_calls": self.api_calls_made,
-            "dry_run": self.dry_run,
-            "errors_count": len(self.errors)
-        }
-
-        history["runs"].append(run_record)
-
-        # Keep only last 30 runs
-        history["runs"] = history["runs"][-30:]
-        history["last_run"] = run_record["timestamp"]
-
-        with open(HISTORY_FILE, 'w') as f:
-            json.dump(history, f, indent=2)
-
-    def _load_history(self) -> Dict:
-        """Load run history from file."""
-        if HISTORY_FILE.exists():
-            try:
-                with open(HISTORY_FILE, 'r') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError):
-                pass
-        return {"runs": [], "last_run": None}
+            "cache_hits": self.cache_hits,
+            "coalesced": self.coalesced,
+            "errors_count": len(self.errors),
+        })
 
 
 def show_status():
     """Show current quota and run status."""
-    tracker = QuotaTracker()
+    tracker = make_quota_tracker()
     status = tracker.get_status()
 
     print("\n" + "=" * 50)
@@ -465,18 +441,28 @@ def show_status():
     if status['last_call_at']:
         print(f"Last call: {status['last_call_at']}")
 
-    # Load history
-    if HISTORY_FILE.exists():
-        with open(HISTORY_FILE, 'r') as f:
-            history = json.load(f)
-
-        if history.get('runs'):
-            last_run = history['runs'][-1]
-            print("\n--- Last Run ---")
-            print(f"Time: {last_run['timestamp']}")
-            print(f"Coins updated: {last_run['coins_updated']}")
-            print(f"API calls: {last_run['api_calls']}")
-            print(f"Mode: {'DRY RUN' if last_run.get('dry_run') else 'LIVE'}")
+    print(f"\n{lock_status()}")
+
+    cache_stats = ResponseCache().get_stats()
+    print("\n--- Response Cache ---")
+    print(f"Live entries: {cache_stats['live_entries']}/{cache_stats['entries']}")
+    print(f"Quota saved (lifetime hits): {cache_stats['quota_saved']}")
+
+    ledger = RunLedger()
+    ledger.import_legacy_history()
+    last_run = ledger.get_last_run()
+    if last_run:
+        print("\n--- Last Run ---")
+        print(f"Time: {last_run['started_at']}")
+        print(f"Coins updated: {last_run['coins_updated']}")
+        print(f"API calls: {last_run['api_calls']}")
+        print(f"Mode: {'DRY RUN' if last_run['dry_run'] else 'LIVE'}")
+
+        totals = ledger.get_totals()
+        print("\n--- Lifetime (live runs) ---")
+        print(f"Runs: {totals['runs']} since {totals['first_run']}")
+        print(f"Price updates: {totals['coins_updated']}")
+        print(f"API calls: {totals['api_calls']} (+{totals['cache_hits']} served from cache)")
 
     print("=" * 50 + "\n")
 
@@ -487,43 +473,46 @@ def show_report():
     print("        PRICE REFRESH ACTIVITY REPORT")
     print("=" * 60)
 
-    if not HISTORY_FILE.exists():
-        print("\nNo history found. Run some price refreshes first.")
-        return
-
-    with open(HISTORY_FILE, 'r') as f:
-        history = json.load(f)
-
-    runs = history.get('runs', [])
-    if not runs:
-        print("\nNo runs recorded yet.")
-        return
+    ledger = RunLedger()
+    ledger.import_legacy_history()
 
     # Filter to last 7 days
     week_ago = datetime.now() - timedelta(days=7)
-    recent_runs = [
-        r for r in runs
-        if datetime.fromisoformat(r['timestamp']) > week_ago
-    ]
+    recent_runs = ledger.get_runs(since=week_ago)
+    if not recent_runs:
+        print("\nNo runs in the last 7 days. Run some price refreshes first.")
+        return
 
     print(f"\n--- Last 7 Days ({len(recent_runs)} runs) ---")
-    print(f"{'Date':<12} {'Updated':<10} {'Failed':<10} {'API Calls':<10}")
-    print("-" * 45)
+    print(f"{'Date':<12} {'Updated':<10} {'Failed':<10} {'API Calls':<10} {'Cache Hits':<10}")
+    print("-" * 56)
 
     total_updated = 0
     total_failed = 0
     total_calls = 0
 
     for run in recent_runs:
-        ts = datetime.fromisoformat(run['timestamp'])
-        print(f"{ts.strftime('%Y-%m-%d'):<12} {run['coins_updated']:<10} {run['coins_failed']:<10} {run['api_calls']:<10}")
+        ts = datetime.fromisoformat(str(run['started_at']))
+        mode = " (dry)" if run['dry_run'] else ""
+        print(f"{ts.strftime('%Y-%m-%d'):<12} {run['coins_updated']:<10} {run['coins_failed']:<10} "
+              f"{run['api_calls']:<10} {run['cache_hits']:<10}{mode}")
         total_updated += run['coins_updated']
         total_failed += run['coins_failed']
         total_calls += run['api_calls']
 
-    print("-" * 45)
+    print("-" * 56)
     print(f"{'TOTAL':<12} {total_updated:<10} {total_failed:<10} {total_calls:<10}")
 
+    throughput = ledger.get_daily_throughput(days=7)
+    if throughput:
+        print("\n--- Lookup Throughput & Latency ---")
+        print(f"{'Date':<12} {'Lookups':<9} {'Updated':<9} {'Grades':<8} {'API avg/max ms':<16} {'DB avg ms':<10}")
+        print("-" * 66)
+        for day in throughput:
+            api = f"{day['avg_api_ms'] or 0:.0f}/{day['max_api_ms'] or 0:.0f}"
+            print(f"{day['day']:<12} {day['lookups']:<9} {day['updated']:<9} {day['grades_fetched'] or 0:<8} "
+                  f"{api:<16} {day['avg_db_ms'] or 0:<10.1f}")
+
     # Estimate time to full refresh
     engine = create_engine(DATABASE_URL)
     with engine.connect() as conn:
@@ -538,18 +527,22 @@ def show_report():
             print(f"Total coins in database: {total_coins}")
             print(f"Average updates per day: {avg_per_day:.1f}")
             print(f"Days to complete full refresh: {days_to_complete:.0f}")
+            print("(Naive average; run simulate_refresh.py to compare budget policies)")
 
     # Check for stale coins
     with engine.connect() as conn:
         result = conn.execute(text("""
-            SELECT COUNT(DISTINCT cr.id)
+            SELECT COUNT(*)
             FROM "CoinReference" cr
-            LEFT JOIN "CoinPriceGuide" cpg ON cr.id = cpg."coinReferenceId"
-            GROUP BY cr.id
-            HAVING MAX(cpg."priceDate") IS NULL
-                OR MAX(cpg."priceDate") < CURRENT_DATE - INTERVAL '14 days'
+            LEFT JOIN (
+                SELECT "coinReferenceId", MAX("priceDate") as last_update
+                FROM "CoinLatestPrice"
+                GROUP BY "coinReferenceId"
+            ) lp ON cr.id = lp."coinReferenceId"
+            WHERE lp.last_update IS NULL
+                OR lp.last_update < CURRENT_DATE - INTERVAL '14 days'
         """))
-        stale_count = len(list(result))
+        stale_count = result.scalar() or 0
 
     print(f"\nCoins with stale/no prices (>14 days): {stale_count}")
     print("=" * 60 + "\n")
@@ -567,6 +560,8 @@ Examples:
   python refresh_prices.py --limit 100        Update up to 100 coins
   python refresh_prices.py --priority P0      Only P0 priority coins
   python refresh_prices.py --report           Show 7-day activity report
+  python refresh_prices.py --concurrency 8 --rate 6   Faster batch lookups
+  python refresh_prices.py --skip-if-locked   For cron: exit if another refresh is running
         """
     )
 
@@ -580,8 +575,15 @@ Examples:
                         help='Maximum coins to update (overrides calculated budget)')
     parser.add_argument('--priority', type=str, choices=['P0', 'P1', 'P2', 'P3'],
                         help='Only update coins in specific priority tier')
+    parser.add_argument('--concurrency', type=int,
+                        help=f'Max concurrent API requests (default: {PCGSApiClient.DEFAULT_CONCURRENCY})')
+    parser.add_argument('--rate', type=float,
+                        help=f'Max API requests per second (default: {PCGSApiClient.DEFAULT_REQUESTS_PER_SECOND})')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Bypass the API response cache (always call the API)')
     parser.add_argument('--debug', action='store_true',
                         help='Enable debug logging')
+    add_lock_arguments(parser)
 
     args = parser.parse_args()
 
@@ -596,9 +598,19 @@ Examples:
         show_report()
         return
 
+    lock = acquire_for_cli("refresh_prices", args)
+
     # Run refresh
-    refresher = PriceRefresher(dry_run=args.dry_run)
-    asyncio.run(refresher.run(limit=args.limit, priority=args.priority))
+    refresher = PriceRefresher(
+        dry_run=args.dry_run,
+        concurrency=args.concurrency,
+        requests_per_second=args.rate,
+        bypass_cache=args.no_cache,
+    )
+    try:
+        asyncio.run(refresher.run(limit=args.limit, priority=args.priority))
+    finally:
+        lock.release()
 
 
 if __name__ == '__main__':
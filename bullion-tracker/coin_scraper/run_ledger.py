@@ -0,0 +1,273 @@
+"""
+Price Refresh Run Ledger
+
+Append-only SQLite record of every price refresh run and every API lookup
+made within it (API latency, DB write latency, grades fetched, outcome).
+Replaces price_refresh_history.json, which kept five counters for the last
+30 runs only; the ledger keeps full history for throughput trend analysis.
+"""
+
+import json
+import sqlite3
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATA_DIR = Path(__file__).parent / "data"
+DEFAULT_LEDGER_FILE = DEFAULT_DATA_DIR / "refresh_ledger.db"
+LEGACY_HISTORY_FILE = DEFAULT_DATA_DIR / "price_refresh_history.json"
+
+# Per-lookup outcomes
+OUTCOME_UPDATED = "updated"
+OUTCOME_NO_DATA = "no_data"
+OUTCOME_ERROR = "error"
+OUTCOME_QUOTA = "quota"
+
+RUN_COUNTERS = (
+    "coins_updated", "coins_skipped", "coins_failed",
+    "api_calls", "cache_hits", "coalesced", "errors_count",
+)
+
+
+class RunLedger:
+    """
+    SQLite-backed ledger of refresh runs and per-coin lookups.
+
+    Usage:
+        ledger = RunLedger()
+        run_id = ledger.start_run(dry_run=False)
+        ledger.record_lookup(run_id, 7172, "MS65", OUTCOME_UPDATED, api_ms=420, db_ms=12, grades=3)
+        ledger.complete_run(run_id, {"coins_updated": 3, "api_calls": 1})
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        """
+        Initialize run ledger.
+
+        Args:
+            db_path: Path to SQLite file. Defaults to data/refresh_ledger.db
+        """
+        self.db_path = Path(db_path or DEFAULT_LEDGER_FILE)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_db()
+
+    def _init_db(self):
+        """Initialize database schema."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS runs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    started_at TIMESTAMP NOT NULL,
+                    completed_at TIMESTAMP,
+                    dry_run INTEGER NOT NULL DEFAULT 0,
+                    priority_filter TEXT,
+                    coin_limit INTEGER,
+                    coins_updated INTEGER DEFAULT 0,
+                    coins_skipped INTEGER DEFAULT 0,
+                    coins_failed INTEGER DEFAULT 0,
+                    api_calls INTEGER DEFAULT 0,
+                    cache_hits INTEGER DEFAULT 0,
+                    coalesced INTEGER DEFAULT 0,
+                    errors_count INTEGER DEFAULT 0
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS lookups (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    run_id INTEGER NOT NULL,
+                    recorded_at TIMESTAMP NOT NULL,
+                    pcgs_number INTEGER NOT NULL,
+                    grade TEXT,
+                    outcome TEXT NOT NULL,
+                    api_ms REAL,
+                    db_ms REAL,
+                    grades_fetched INTEGER DEFAULT 0,
+                    error TEXT,
+                    FOREIGN KEY (run_id) REFERENCES runs(id)
+                )
+            """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_runs_started ON runs(started_at)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_lookups_recorded ON lookups(recorded_at)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_lookups_run ON lookups(run_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_lookups_coin ON lookups(pcgs_number, recorded_at)")
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """Get a database connection with row factory."""
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    # ===== Writing =====
+
+    def start_run(self, dry_run: bool = False, priority_filter: Optional[str] = None,
+                  coin_limit: Optional[int] = None) -> int:
+        """Record the start of a run. Returns run ID."""
+        conn = self._get_conn()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT INTO runs (started_at, dry_run, priority_filter, coin_limit)
+                VALUES (?, ?, ?, ?)
+            """, (datetime.now(), int(dry_run), priority_filter, coin_limit))
+            conn.commit()
+            return cursor.lastrowid
+        finally:
+            conn.close()
+
+    def record_lookup(self, run_id: int, pcgs_number: int, grade: Optional[str], outcome: str,
+                      api_ms: Optional[float] = None, db_ms: Optional[float] = None,
+                      grades_fetched: int = 0, error: Optional[str] = None):
+        """Append one API lookup and its timings."""
+        conn = self._get_conn()
+        try:
+            conn.execute("""
+                INSERT INTO lookups
+                (run_id, recorded_at, pcgs_number, grade, outcome, api_ms, db_ms, grades_fetched, error)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (run_id, datetime.now(), pcgs_number, grade, outcome,
+                  api_ms, db_ms, grades_fetched, error[:500] if error else None))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def complete_run(self, run_id: int, counters: Dict[str, int]):
+        """Record run completion and its counters."""
+        values = {key: counters.get(key, 0) for key in RUN_COUNTERS}
+        conn = self._get_conn()
+        try:
+            conn.execute(f"""
+                UPDATE runs
+                SET completed_at = ?, {', '.join(f'{key} = ?' for key in RUN_COUNTERS)}
+                WHERE id = ?
+            """, (datetime.now(), *values.values(), run_id))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def import_legacy_history(self, history_file: Path = LEGACY_HISTORY_FILE) -> int:
+        """
+        One-time import of runs from price_refresh_history.json.
+
+        Skipped if the ledger already has runs. Returns runs imported.
+        """
+        if not history_file.exists():
+            return 0
+
+        conn = self._get_conn()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) FROM runs")
+            if cursor.fetchone()[0] > 0:
+                return 0
+
+            try:
+                with open(history_file, 'r') as f:
+                    runs = json.load(f).get('runs', [])
+            except (json.JSONDecodeError, IOError) as e:
+                logger.warning(f"Failed to read legacy history: {e}")
+                return 0
+
+            for run in runs:
+                timestamp = datetime.fromisoformat(run['timestamp'])
+                cursor.execute(f"""
+                    INSERT INTO runs (started_at, completed_at, dry_run, {', '.join(RUN_COUNTERS)})
+                    VALUES (?, ?, ?, {', '.join('?' for _ in RUN_COUNTERS)})
+                """, (timestamp, timestamp, int(run.get('dry_run', False)),
+                      *(run.get(key, 0) for key in RUN_COUNTERS)))
+            conn.commit()
+            logger.info(f"Imported {len(runs)} runs from {history_file}")
+            return len(runs)
+        finally:
+            conn.close()
+
+    # ===== Reading =====
+
+    def get_last_run(self) -> Optional[Dict]:
+        """Most recent completed run."""
+        conn = self._get_conn()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT * FROM runs WHERE completed_at IS NOT NULL
+                ORDER BY started_at DESC LIMIT 1
+            """)
+            row = cursor.fetchone()
+            return dict(row) if row else None
+        finally:
+            conn.close()
+
+    def get_runs(self, since: Optional[datetime] = None, include_dry_runs: bool = True) -> List[Dict]:
+        """Completed runs since a time (all history if None), oldest first."""
+        conn = self._get_conn()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT * FROM runs
+                WHERE completed_at IS NOT NULL AND started_at >= ?
+                {'' if include_dry_runs else 'AND dry_run = 0'}
+                ORDER BY started_at ASC
+            """, (since or datetime.min,))
+            return [dict(row) for row in cursor.fetchall()]
+        finally:
+            conn.close()
+
+    def get_daily_throughput(self, days: int = 7) -> List[Dict]:
+        """
+        Per-day lookup throughput and latency for live runs.
+
+        Returns:
+            One dict per day with lookups, updated, failed, grades_fetched,
+            avg_api_ms, max_api_ms, avg_db_ms
+        """
+        since = datetime.now() - timedelta(days=days)
+        conn = self._get_conn()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT
+                    DATE(l.recorded_at) as day,
+                    COUNT(*) as lookups,
+                    SUM(CASE WHEN l.outcome = 'updated' THEN 1 ELSE 0 END) as updated,
+                    SUM(CASE WHEN l.outcome IN ('error', 'no_data') THEN 1 ELSE 0 END) as failed,
+                    SUM(l.grades_fetched) as grades_fetched,
+                    AVG(l.api_ms) as avg_api_ms,
+                    MAX(l.api_ms) as max_api_ms,
+                    AVG(l.db_ms) as avg_db_ms
+                FROM lookups l
+                JOIN runs r ON r.id = l.run_id
+                WHERE l.recorded_at >= ? AND r.dry_run = 0
+                GROUP BY DATE(l.recorded_at)
+                ORDER BY day ASC
+            """, (since,))
+            return [dict(row) for row in cursor.fetchall()]
+        finally:
+            conn.close()
+
+    def get_totals(self) -> Dict:
+        """Lifetime totals across live runs."""
+        conn = self._get_conn()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT
+                    COUNT(*) as runs,
+                    SUM(coins_updated) as coins_updated,
+                    SUM(coins_failed) as coins_failed,
+                    SUM(api_calls) as api_calls,
+                    SUM(cache_hits) as cache_hits,
+                    MIN(started_at) as first_run
+                FROM runs
+                WHERE completed_at IS NOT NULL AND dry_run = 0
+            """)
+            row = cursor.fetchone()
+            return {key: (row[key] or 0) if key != 'first_run' else row[key] for key in row.keys()}
+        finally:
+            conn.close()
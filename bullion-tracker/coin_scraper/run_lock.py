@@ -0,0 +1,349 @@
+"""
+Run-Overlap Lock
+
+Postgres advisory lock taken by every batch refresh entry point
+(refresh_prices.py, ingest_auctions.py, populate.py, run_scraper.py and the
+Celery weekly refresh), so overlapping cron, Celery and manual runs don't
+spend API quota and scrape budget on the same coins twice.
+
+The trickle daemon runs continuously, so it doesn't hold the run lock
+(that would keep every batch run out); it takes its own lock name to stay
+single-instance and pauses its lanes while the run lock is held.
+
+The lock lives on its own database connection: it is released when the
+run finishes or its process dies (no TTL needed), and the holder is visible
+to everyone through pg_stat_activity, where the connection's
+application_name says which script, pid and host hold it.
+
+Postgres also releases the lock if that connection drops (idle timeout,
+proxy restart, network), while the run carries on. The connection uses TCP
+keepalives, and a watchdog thread checks pg_locks every HEARTBEAT_SECONDS
+(which also keeps the connection from going idle). When the lock is gone,
+CLI runs are interrupted as if by Ctrl-C; other callers check ensure_held()
+between chunks.
+
+Celery weekly-refresh chunks take the lock in shared mode, so chunks of one
+run proceed in parallel while other entry points are kept out.
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+import socket
+import sys
+import threading
+import time
+import _thread
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+
+from config import DATABASE_URL
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOCK_NAME = "coin_refresh"
+APP_NAME_PREFIX = "coin_scraper:"
+POLL_SECONDS = 10.0
+HEARTBEAT_SECONDS = 60.0
+
+# libpq TCP keepalives, so a dead lock connection is noticed within ~1 minute
+KEEPALIVE_ARGS = {
+    'keepalives': 1,
+    'keepalives_idle': 30,
+    'keepalives_interval': 10,
+    'keepalives_count': 3,
+}
+
+# pg_locks rows for an advisory lock key (bigint keys are split in two)
+LOCK_MATCH = """
+    l.locktype = 'advisory'
+    AND l.granted
+    AND l.classid::bigint = :high
+    AND l.objid::bigint = :low
+    AND l.objsubid = 1
+"""
+
+
+def lock_key(name: str) -> int:
+    """Stable positive 63-bit advisory lock key for a lock name."""
+    digest = hashlib.blake2b(name.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') & 0x7FFFFFFFFFFFFFFF
+
+
+class RunLockHeld(Exception):
+    """The run lock is held by another run."""
+
+    def __init__(self, name: str, holders: List[Dict]):
+        self.name = name
+        self.holders = holders
+        super().__init__(f"Run lock '{name}' is held by {format_holders(holders)}")
+
+
+class RunLockLost(Exception):
+    """The run lock was released behind the holder's back (connection lost)."""
+
+    def __init__(self, name: str):
+        self.name = name
+        super().__init__(f"Run lock '{name}' was lost; another run may have started")
+
+
+def format_holders(holders: List[Dict]) -> str:
+    """One-line description of lock holders."""
+    if not holders:
+        return "nobody"
+    return "; ".join(
+        f"{h['owner']} ({h['mode']}, since {h['since']:%Y-%m-%d %H:%M})" if h['since'] else h['owner']
+        for h in holders
+    )
+
+
+class RunLock:
+    """
+    Named run-overlap lock backed by a Postgres advisory lock.
+
+    Usage:
+        with RunLock("refresh_prices").acquire_or_raise():
+            ...  # run
+
+        lock = RunLock("populate")
+        if lock.acquire(wait=True, timeout=600):
+            try:
+                ...
+            finally:
+                lock.release()
+    """
+
+    def __init__(self, owner: str, name: str = DEFAULT_LOCK_NAME, shared: bool = False,
+                 database_url: Optional[str] = None,
+                 on_lost: Optional[Callable[["RunLock"], None]] = None,
+                 heartbeat_seconds: float = HEARTBEAT_SECONDS):
+        """
+        Args:
+            owner: Entry point taking the lock (shown to other runs)
+            name: Lock name; runs using the same name exclude each other
+            shared: Take the lock in shared mode (shared holders don't
+                exclude each other, only exclusive ones)
+            database_url: Defaults to config DATABASE_URL
+            on_lost: Called from the watchdog thread if the lock is lost
+            heartbeat_seconds: Seconds between watchdog checks of the lock
+        """
+        self.owner = owner
+        self.name = name
+        self.shared = shared
+        self.key = lock_key(name)
+        self.on_lost = on_lost
+        self.heartbeat_seconds = heartbeat_seconds
+        self.lost = False
+        # Dedicated, unpooled connection so the lock and application_name
+        # belong to this run only
+        self._engine = create_engine(database_url or DATABASE_URL, poolclass=NullPool,
+                                     connect_args=KEEPALIVE_ARGS)
+        self._conn = None
+        self._conn_mutex = threading.Lock()  # The watchdog shares the connection
+        self._stop_watchdog = threading.Event()
+        self._watchdog = None
+
+    @property
+    def held(self) -> bool:
+        return self._conn is not None and not self.lost
+
+    @property
+    def _key_params(self) -> Dict[str, int]:
+        return {'high': self.key >> 32, 'low': self.key & 0xFFFFFFFF}
+
+    def _application_name(self) -> str:
+        # Postgres truncates application_name to 63 bytes
+        return f"{APP_NAME_PREFIX}{self.owner} pid={os.getpid()}@{socket.gethostname()}"[:63]
+
+    def try_acquire(self) -> bool:
+        """Take the lock if it is free. Returns False if another run holds it."""
+        if self.held:
+            return True
+
+        conn = self._engine.connect()
+        try:
+            conn.execute(text("SELECT set_config('application_name', :name, false)"),
+                         {'name': self._application_name()})
+            func = "pg_try_advisory_lock_shared" if self.shared else "pg_try_advisory_lock"
+            acquired = conn.execute(text(f"SELECT {func}(:key)"), {'key': self.key}).scalar()
+            conn.commit()
+        except Exception:
+            conn.close()
+            raise
+
+        if not acquired:
+            conn.close()
+            return False
+
+        self._conn = conn
+        self.lost = False
+        self._stop_watchdog.clear()
+        self._watchdog = threading.Thread(target=self._watch, name=f"run-lock-{self.name}",
+                                          daemon=True)
+        self._watchdog.start()
+        logger.info(f"Acquired run lock '{self.name}' as {self.owner}")
+        return True
+
+    def _check(self) -> bool:
+        """Whether this connection still holds the lock; marks it lost if not."""
+        with self._conn_mutex:
+            if self._conn is None or self.lost:
+                return False
+            try:
+                held = self._conn.execute(text(f"""
+                    SELECT count(*) FROM pg_locks l
+                    WHERE l.pid = pg_backend_pid() AND {LOCK_MATCH}
+                """), self._key_params).scalar() > 0
+                self._conn.commit()
+            except Exception as e:
+                logger.warning(f"Run lock '{self.name}' check failed: {e}")
+                held = False
+            if not held:
+                self.lost = True
+            return held
+
+    def _watch(self):
+        """Watchdog thread: check the lock every heartbeat until released or lost."""
+        while not self._stop_watchdog.wait(self.heartbeat_seconds):
+            if not self._check():
+                logger.error(f"Lost run lock '{self.name}' (database connection dropped?)")
+                if self.on_lost:
+                    self.on_lost(self)
+                return
+
+    def ensure_held(self):
+        """Raise RunLockLost unless the lock is still held; call between chunks."""
+        if not self._check():
+            raise RunLockLost(self.name)
+
+    def acquire(self, wait: bool = False, timeout: Optional[float] = None,
+                poll_seconds: float = POLL_SECONDS) -> bool:
+        """
+        Take the lock.
+
+        Args:
+            wait: Poll until the lock is free instead of giving up at once
+            timeout: With wait, give up after this many seconds (None = forever)
+            poll_seconds: Seconds between attempts while waiting
+
+        Returns:
+            True if the lock is now held
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        logged = False
+        while not self.try_acquire():
+            if not wait or (deadline is not None and time.monotonic() >= deadline):
+                return False
+            if not logged:
+                logger.info(f"Waiting for run lock '{self.name}' held by {format_holders(self.holders())}")
+                logged = True
+            time.sleep(poll_seconds)
+        return True
+
+    def acquire_or_raise(self, wait: bool = False, timeout: Optional[float] = None) -> "RunLock":
+        """Take the lock or raise RunLockHeld naming the holder."""
+        if not self.acquire(wait=wait, timeout=timeout):
+            raise RunLockHeld(self.name, self.holders())
+        return self
+
+    def release(self):
+        """Release the lock (closing the connection releases it too)."""
+        if self._conn is None:
+            return
+        self._stop_watchdog.set()
+        if self._watchdog is not None and self._watchdog is not threading.current_thread():
+            self._watchdog.join()
+        self._watchdog = None
+
+        with self._conn_mutex:
+            try:
+                if not self.lost:
+                    func = "pg_advisory_unlock_shared" if self.shared else "pg_advisory_unlock"
+                    self._conn.execute(text(f"SELECT {func}(:key)"), {'key': self.key})
+                    self._conn.commit()
+            finally:
+                try:
+                    self._conn.close()
+                except Exception:
+                    pass  # Connection already dead; nothing left to release
+                self._conn = None
+        logger.info(f"Released run lock '{self.name}'")
+
+    def holders(self) -> List[Dict]:
+        """Runs currently holding the lock, with owner, mode and connection start."""
+        with self._engine.connect() as conn:
+            result = conn.execute(text(f"""
+                SELECT a.pid, a.application_name, a.backend_start, l.mode
+                FROM pg_locks l
+                JOIN pg_stat_activity a ON a.pid = l.pid
+                WHERE {LOCK_MATCH}
+                ORDER BY a.backend_start
+            """), self._key_params)
+            return [{
+                'pid': row[0],
+                'owner': (row[1] or f"pid {row[0]}").removeprefix(APP_NAME_PREFIX),
+                'since': row[2],
+                'mode': 'shared' if row[3] == 'ShareLock' else 'exclusive',
+            } for row in result]
+
+    def describe(self) -> str:
+        """Status line for --status output."""
+        try:
+            return f"Run lock '{self.name}': held by {format_holders(self.holders())}"
+        except Exception as e:
+            return f"Run lock '{self.name}': unknown ({e.__class__.__name__})"
+
+    def __enter__(self):
+        self.acquire_or_raise()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+
+# ===== CLI helpers =====
+
+def lock_status(name: str = DEFAULT_LOCK_NAME) -> str:
+    """Who holds the run lock, for --status output."""
+    return RunLock("status", name=name).describe()
+
+
+def add_lock_arguments(parser: argparse.ArgumentParser):
+    """Add --wait / --wait-timeout / --skip-if-locked to an entry point's parser."""
+    group = parser.add_argument_group('run lock')
+    policy = group.add_mutually_exclusive_group()
+    policy.add_argument('--wait', action='store_true',
+                        help='If another refresh run holds the lock, wait for it')
+    policy.add_argument('--skip-if-locked', action='store_true',
+                        help='If another refresh run holds the lock, exit quietly (status 0)')
+    group.add_argument('--wait-timeout', type=float, default=None,
+                       help='With --wait, give up after this many seconds')
+
+
+def _interrupt_run(lock: RunLock):
+    """on_lost for CLI runs: stop the run as if by Ctrl-C."""
+    logger.error(f"Aborting {lock.owner}: another run may now hold the lock")
+    _thread.interrupt_main()
+
+
+def acquire_for_cli(owner: str, args: argparse.Namespace, name: str = DEFAULT_LOCK_NAME) -> RunLock:
+    """
+    Take the run lock per the CLI policy, or exit.
+
+    Exits 0 with --skip-if-locked, otherwise 1, when another run holds
+    the lock (after --wait-timeout when waiting). If the lock is lost
+    later, the run is interrupted.
+    """
+    lock = RunLock(owner, name=name, on_lost=_interrupt_run)
+    if lock.acquire(wait=args.wait, timeout=args.wait_timeout):
+        return lock
+
+    message = f"Run lock '{name}' is held by {format_holders(lock.holders())}"
+    if args.skip_if_locked:
+        logger.info(f"{message} - skipping")
+        sys.exit(0)
+    print(f"{message}\nUse --wait to queue behind it or --skip-if-locked for cron.")
+    sys.exit(1)
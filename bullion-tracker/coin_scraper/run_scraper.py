@@ -9,12 +9,14 @@ Usage:
     python run_scraper.py --status                      # Show progress summary
     python run_scraper.py --verify --series silver-eagles  # Test selectors
     python run_scraper.py --priority P0 --dry-run --limit 5  # Dry run
+    python run_scraper.py --reparse-from-archive --priority P0  # Re-extract archived pages offline
 """
 
 import argparse
 import asyncio
 import sys
 import logging
+from datetime import date
 from pathlib import Path
 
 # Add parent dir to path for imports
@@ -22,7 +24,9 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from config import COIN_SERIES, DATABASE_URL
 from scrapers.pcgs_scraper import PCGSScraper, run_scraper
-from scrapers.progress_tracker import ProgressTracker
+from scrapers.progress_tracker import ProgressTracker, SeenCoins
+from scrapers.html_archive import HtmlArchive
+from run_lock import add_lock_arguments, acquire_for_cli, lock_status
 
 # Try to import tqdm for progress bar
 try:
@@ -69,6 +73,14 @@ def show_status(tracker: ProgressTracker):
         print(f"\nFailed coins available for retry: {len(failed)}")
         print("  Use --retry-failed to retry these")
 
+    archive = HtmlArchive().get_stats()
+    if archive['pages']:
+        ratio = archive['raw_bytes'] / archive['stored_bytes']
+        print(f"\nHTML archive: {archive['pages']:,} pages, "
+              f"{archive['stored_bytes'] / 1e6:.1f} MB ({ratio:.0f}x compressed)")
+
+    print(f"\n{lock_status()}")
+
 
 def list_series():
     """List all configured series with status."""
@@ -227,22 +239,35 @@ async def run_full_scrape(series_filter: str = None, priority_filter: str = None
         return
 
     total_est = sum(s.get('est_coins', 0) for s in series_list)
+    print("\n=== Planning Scrape ===")
+    print(f"Series: {len(series_list)} (config estimate ~{total_est} coins)")
+
+    # Fetch all category pages first so totals and ETA are exact
+    planner = PCGSScraper(db, progress_tracker=tracker)
+    try:
+        plan = await planner.plan_series(series_list)
+    finally:
+        await planner.close()
+    print(plan.summary())
+
     print(f"\n=== Starting Scrape ===")
-    print(f"Series: {len(series_list)}")
-    print(f"Estimated coins: {total_est}")
     print()
 
+    # Shared across the per-series scrapers so each coin is fetched once per run
+    seen_coins = SeenCoins(tracker)
+
     # Run with progress bar if available
     if HAS_TQDM:
         pbar = tqdm(series_list, desc="Series", unit="series")
         for series in pbar:
             pbar.set_description(f"Series: {series['name'][:20]}")
-            scraper = PCGSScraper(db, progress_tracker=tracker)
+            scraper = PCGSScraper(db, progress_tracker=tracker, seen_coins=seen_coins)
             try:
                 await scraper.scrape_and_save_series(
                     series['name'],
                     series['slug'],
-                    series['category_id']
+                    series['category_id'],
+                    coins=plan.series_coins.get(series['slug'])
                 )
             finally:
                 await scraper.close()
@@ -250,20 +275,56 @@ async def run_full_scrape(series_filter: str = None, priority_filter: str = None
     else:
         for i, series in enumerate(series_list, 1):
             print(f"[{i}/{len(series_list)}] {series['name']}")
-            scraper = PCGSScraper(db, progress_tracker=tracker)
+            scraper = PCGSScraper(db, progress_tracker=tracker, seen_coins=seen_coins)
             try:
                 await scraper.scrape_and_save_series(
                     series['name'],
                     series['slug'],
-                    series['category_id']
+                    series['category_id'],
+                    coins=plan.series_coins.get(series['slug'])
                 )
             finally:
                 await scraper.close()
 
     # Final stats
+    if seen_coins.duplicates:
+        print(f"\nSkipped {seen_coins.duplicates} duplicate listings (coins in more than one series)")
     print("\n" + tracker.get_progress_summary())
 
 
+async def reparse_from_archive(series_filter: str = None, priority_filter: str = None,
+                               archive_date: date = None):
+    """Re-run extraction over archived pages and save the results, without network access."""
+    archive = HtmlArchive()
+    stats = archive.get_stats()
+    if not stats['pages']:
+        print("\nArchive is empty - nothing to reparse.")
+        return
+
+    print("\n=== Reparsing From Archive ===")
+    print(f"Archived pages: {stats['pages']:,}"
+          + (f" (copies on or before {archive_date})" if archive_date else ""))
+
+    db = get_db_session()
+    scraper = PCGSScraper(db, archive=archive, offline=True, archive_date=archive_date)
+    try:
+        for series in COIN_SERIES:
+            if series_filter and series['slug'] != series_filter:
+                continue
+            if priority_filter and series.get('priority') != priority_filter:
+                continue
+            await scraper.scrape_and_save_series(
+                series['name'],
+                series['slug'],
+                series['category_id']
+            )
+    finally:
+        await scraper.close()
+        db.close()
+
+    print(scraper.get_stats_summary())
+
+
 async def retry_failed():
     """Retry previously failed coins."""
     db = get_db_session()
@@ -293,6 +354,15 @@ async def retry_failed():
     print("\n" + tracker.get_progress_summary())
 
 
+def run_locked(args, func, **kwargs):
+    """Run an async operation while holding the run-overlap lock."""
+    lock = acquire_for_cli("run_scraper", args)
+    try:
+        asyncio.run(func(**kwargs))
+    finally:
+        lock.release()
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='PCGS CoinFacts Scraper',
@@ -307,6 +377,9 @@ Examples:
   python run_scraper.py --verify --series X        Test selectors on series X
   python run_scraper.py --dry-run --limit 10       Dry run, 10 coins max
   python run_scraper.py --retry-failed             Retry previously failed coins
+  python run_scraper.py --reparse-from-archive     Re-extract all archived pages offline
+  python run_scraper.py --reparse-from-archive --archive-date 2026-10-01
+                                                   Use pages fetched on or before a date
         """
     )
 
@@ -332,10 +405,15 @@ Examples:
                         help='List all configured series')
     parser.add_argument('--retry-failed', action='store_true',
                         help='Retry previously failed coins')
+    parser.add_argument('--reparse-from-archive', action='store_true',
+                        help='Re-run extraction over archived pages and save results (no network)')
+    parser.add_argument('--archive-date', type=date.fromisoformat, default=None,
+                        help='With --reparse-from-archive: latest copies on or before YYYY-MM-DD')
 
     # Logging
     parser.add_argument('--debug', action='store_true',
                         help='Enable debug logging')
+    add_lock_arguments(parser)
 
     args = parser.parse_args()
 
@@ -361,15 +439,25 @@ Examples:
         return
 
     if args.dry_run:
-        asyncio.run(run_dry_run(
+        run_locked(
+            args, run_dry_run,
             series_filter=args.series,
             priority_filter=args.priority,
             limit=args.limit
-        ))
+        )
         return
 
     if args.retry_failed:
-        asyncio.run(retry_failed())
+        run_locked(args, retry_failed)
+        return
+
+    if args.reparse_from_archive:
+        run_locked(
+            args, reparse_from_archive,
+            series_filter=args.series,
+            priority_filter=args.priority,
+            archive_date=args.archive_date
+        )
         return
 
     # Default: full scrape
@@ -380,11 +468,12 @@ Examples:
         print("\nRun with --help for full options.")
         sys.exit(1)
 
-    asyncio.run(run_full_scrape(
+    run_locked(
+        args, run_full_scrape,
         series_filter=args.series,
         priority_filter=args.priority,
         resume=args.resume
-    ))
+    )
 
 
 if __name__ == '__main__':
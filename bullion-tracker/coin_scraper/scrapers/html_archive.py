@@ -0,0 +1,283 @@
+"""
+Compressed archive of fetched PCGS pages with SQLite backend.
+
+Every page PCGSScraper fetches is stored keyed by URL and fetch date, so
+when PCGS changes its markup the extraction can be fixed and re-run over
+archived pages (run_scraper.py --reparse-from-archive) instead of
+re-fetching everything at 1-2s per page.
+
+Pages are compressed with zstd using a dictionary trained on archived
+pages (CoinFacts pages share most of their markup, so a dictionary
+shrinks them far more than per-page compression). Without the zstandard
+package pages are stored with zlib.
+"""
+
+import sqlite3
+import logging
+import zlib
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+logger = logging.getLogger(__name__)
+
+ZSTD_LEVEL = 10
+DICT_SIZE = 112 * 1024
+DICT_TRAIN_PAGES = 500  # Pages archived before the first dictionary is trained
+DICT_SAMPLE_LIMIT = 2000  # Most recent pages used as training samples
+
+
+class HtmlArchive:
+    """
+    SQLite-backed archive of raw HTML, one row per URL per day.
+
+    Usage:
+        archive = HtmlArchive()
+        archive.store(url, html)
+        html = archive.get(url)                       # latest copy
+        html = archive.get(url, on=date(2026, 10, 1))  # latest copy on/before a date
+        html, fetched_at = archive.get_with_date(url)  # and when it was fetched
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Initialize HTML archive.
+
+        Args:
+            db_path: Path to SQLite database file. Defaults to
+                     bullion-tracker/coin_scraper/data/html_archive.db
+        """
+        if db_path is None:
+            data_dir = Path(__file__).parent.parent / "data"
+            data_dir.mkdir(exist_ok=True)
+            db_path = str(data_dir / "html_archive.db")
+
+        self.db_path = db_path
+        self._init_db()
+
+        self._dict_id: Optional[int] = None
+        self._compressor = None
+        self._decompressors: Dict[Optional[int], "zstandard.ZstdDecompressor"] = {}
+        self._stores_since_check = 0
+        if HAS_ZSTD:
+            self._load_latest_dictionary()
+
+    def _init_db(self):
+        """Initialize database schema."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS pages (
+                    url TEXT NOT NULL,
+                    fetched_on DATE NOT NULL,
+                    fetched_at TIMESTAMP NOT NULL,
+                    codec TEXT NOT NULL,
+                    dict_id INTEGER,
+                    raw_size INTEGER NOT NULL,
+                    body BLOB NOT NULL,
+                    PRIMARY KEY (url, fetched_on)
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS dictionaries (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    created_at TIMESTAMP NOT NULL,
+                    sample_count INTEGER NOT NULL,
+                    data BLOB NOT NULL
+                )
+            """)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """Get a database connection with row factory."""
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    # ===== Compression =====
+
+    def _load_latest_dictionary(self):
+        """Use the most recently trained dictionary for new pages."""
+        conn = self._get_conn()
+        try:
+            row = conn.execute("SELECT id, data FROM dictionaries ORDER BY id DESC LIMIT 1").fetchone()
+        finally:
+            conn.close()
+
+        if row:
+            self._dict_id = row['id']
+            dict_data = zstandard.ZstdCompressionDict(row['data'])
+            self._compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL, dict_data=dict_data)
+        else:
+            self._dict_id = None
+            self._compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+
+    def _decompressor(self, dict_id: Optional[int]) -> "zstandard.ZstdDecompressor":
+        """Cached decompressor for a dictionary id (None = no dictionary)."""
+        if dict_id not in self._decompressors:
+            if dict_id is None:
+                self._decompressors[dict_id] = zstandard.ZstdDecompressor()
+            else:
+                conn = self._get_conn()
+                try:
+                    row = conn.execute("SELECT data FROM dictionaries WHERE id = ?", (dict_id,)).fetchone()
+                finally:
+                    conn.close()
+                dict_data = zstandard.ZstdCompressionDict(row['data'])
+                self._decompressors[dict_id] = zstandard.ZstdDecompressor(dict_data=dict_data)
+        return self._decompressors[dict_id]
+
+    def _decode(self, row: sqlite3.Row) -> str:
+        """Decompress a stored page."""
+        if row['codec'] == 'zstd':
+            if not HAS_ZSTD:
+                raise RuntimeError("Archived page is zstd-compressed; install zstandard to read it")
+            data = self._decompressor(row['dict_id']).decompress(row['body'])
+        else:
+            data = zlib.decompress(row['body'])
+        return data.decode('utf-8')
+
+    def train_dictionary(self, sample_limit: int = DICT_SAMPLE_LIMIT) -> Optional[int]:
+        """
+        Train a zstd dictionary from the most recently archived pages.
+
+        New pages are compressed with it; existing pages keep the
+        dictionary they were written with.
+
+        Returns:
+            New dictionary id, or None if zstandard is unavailable or there
+            are too few pages
+        """
+        if not HAS_ZSTD:
+            logger.warning("zstandard not installed, pages are stored with zlib")
+            return None
+
+        conn = self._get_conn()
+        try:
+            rows = conn.execute("""
+                SELECT codec, dict_id, body FROM pages
+                ORDER BY fetched_at DESC
+                LIMIT ?
+            """, (sample_limit,)).fetchall()
+        finally:
+            conn.close()
+
+        samples = [self._decode(row).encode('utf-8') for row in rows]
+        if len(samples) < 10:
+            logger.info(f"Only {len(samples)} archived pages, not training a dictionary yet")
+            return None
+
+        dict_data = zstandard.train_dictionary(DICT_SIZE, samples)
+
+        conn = self._get_conn()
+        try:
+            cursor = conn.execute("""
+                INSERT INTO dictionaries (created_at, sample_count, data)
+                VALUES (?, ?, ?)
+            """, (datetime.now(), len(samples), dict_data.as_bytes()))
+            conn.commit()
+            dict_id = cursor.lastrowid
+        finally:
+            conn.close()
+
+        self._load_latest_dictionary()
+        logger.info(f"Trained archive dictionary {dict_id} from {len(samples)} pages")
+        return dict_id
+
+    def _maybe_train(self):
+        """Train the first dictionary once enough pages have been archived."""
+        self._stores_since_check += 1
+        if self._dict_id is not None or self._stores_since_check < 100:
+            return
+        self._stores_since_check = 0
+        if self.get_stats()['pages'] >= DICT_TRAIN_PAGES:
+            self.train_dictionary()
+
+    # ===== Pages =====
+
+    def store(self, url: str, html: str):
+        """Archive a fetched page (replaces an earlier copy from the same day)."""
+        raw = html.encode('utf-8')
+        if HAS_ZSTD:
+            codec, dict_id, body = 'zstd', self._dict_id, self._compressor.compress(raw)
+        else:
+            codec, dict_id, body = 'zlib', None, zlib.compress(raw, 9)
+
+        now = datetime.now()
+        conn = self._get_conn()
+        try:
+            conn.execute("""
+                INSERT OR REPLACE INTO pages (url, fetched_on, fetched_at, codec, dict_id, raw_size, body)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (url, now.date(), now, codec, dict_id, len(raw), body))
+            conn.commit()
+        finally:
+            conn.close()
+
+        if HAS_ZSTD:
+            self._maybe_train()
+
+    def get(self, url: str, on: Optional[date] = None) -> Optional[str]:
+        """
+        Latest archived copy of a URL.
+
+        Args:
+            url: Page URL as fetched
+            on: Only consider copies fetched on or before this date
+
+        Returns:
+            HTML, or None if the URL isn't archived
+        """
+        page = self.get_with_date(url, on)
+        return page[0] if page else None
+
+    def get_with_date(self, url: str, on: Optional[date] = None) -> Optional[Tuple[str, datetime]]:
+        """
+        Latest archived copy of a URL and when it was fetched.
+
+        Returns:
+            (HTML, fetched_at), or None if the URL isn't archived
+        """
+        conn = self._get_conn()
+        try:
+            row = conn.execute("""
+                SELECT codec, dict_id, body, fetched_at FROM pages
+                WHERE url = ? AND fetched_on <= ?
+                ORDER BY fetched_on DESC
+                LIMIT 1
+            """, (url, on or date.max)).fetchone()
+        finally:
+            conn.close()
+
+        if not row:
+            return None
+        return self._decode(row), datetime.fromisoformat(row['fetched_at'])
+
+    def get_stats(self) -> Dict[str, int]:
+        """Page count, raw and stored bytes, and dictionaries trained."""
+        conn = self._get_conn()
+        try:
+            row = conn.execute("""
+                SELECT COUNT(*) as pages,
+                       COALESCE(SUM(raw_size), 0) as raw_bytes,
+                       COALESCE(SUM(LENGTH(body)), 0) as stored_bytes
+                FROM pages
+            """).fetchone()
+            dictionaries = conn.execute("SELECT COUNT(*) FROM dictionaries").fetchone()[0]
+            return {
+                'pages': row['pages'],
+                'raw_bytes': row['raw_bytes'],
+                'stored_bytes': row['stored_bytes'],
+                'dictionaries': dictionaries,
+            }
+        finally:
+            conn.close()
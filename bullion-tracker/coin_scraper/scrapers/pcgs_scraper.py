@@ -9,14 +9,21 @@ Features:
 - Circuit breaker for repeated failures
 - Exponential backoff with jitter
 - NGC cross-reference extraction
+- Run-wide seen-set so coins listed in several series are fetched once
+- Concurrent category prefetch to plan a run's exact work list and ETA
+- Content-hash change detection: unchanged detail pages skip parsing and saving
+- Compressed archive of every fetched page, with an offline mode that re-runs
+  extraction over archived pages
+- Optional Redis-backed rate limit and circuit breaker shared across workers
 """
 
 import asyncio
+import hashlib
 import random
 import re
 import logging
 import uuid
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from decimal import Decimal
 from typing import Optional, List, Dict, Any, Tuple
 from pathlib import Path
@@ -26,16 +33,21 @@ from enum import Enum
 import httpx
 from bs4 import BeautifulSoup, Tag
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import flag_modified
 
 import sys
 sys.path.append('..')
 
 from config import (
     PCGS_CATEGORY_URL, PCGS_COIN_DETAIL_URL,
-    REQUEST_DELAY_MIN, REQUEST_DELAY_MAX, MAX_RETRIES, RETRY_BACKOFF, USER_AGENT
+    REQUEST_DELAY_MIN, REQUEST_DELAY_MAX, MAX_RETRIES, RETRY_BACKOFF, USER_AGENT,
+    SERIES_PRIORITY_TIERS, CATEGORY_PREFETCH_CONCURRENCY
 )
 from models.coin_reference import CoinReference
 from models.coin_price_guide import CoinPriceGuide
+from scrapers.progress_tracker import SeenCoins
+from scrapers.html_archive import HtmlArchive
+from shared_limits import scrape_limits
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -168,6 +180,31 @@ class CircuitBreakerState:
         return False
 
 
+class PoliteDelay:
+    """
+    In-process request spacing: one request per random 1-2s polite delay.
+
+    Slots are handed out in order, so concurrent fetches (plan_series) are
+    spaced out one after another instead of each sleeping on its own and
+    multiplying the request rate. Same acquire() interface as
+    shared_limits.RedisTokenBucket, which replaces it across workers.
+    """
+
+    def __init__(self, delay_min: float = REQUEST_DELAY_MIN, delay_max: float = REQUEST_DELAY_MAX):
+        self.delay_min = delay_min
+        self.delay_max = delay_max
+        self._next_slot = 0.0
+
+    async def acquire(self):
+        """Wait for the next free slot."""
+        loop = asyncio.get_running_loop()
+        delay = self.delay_min + random.random() * (self.delay_max - self.delay_min)
+        # Reserve before awaiting so concurrent callers queue behind each other
+        slot = max(loop.time() + delay, self._next_slot + delay)
+        self._next_slot = slot
+        await asyncio.sleep(slot - loop.time())
+
+
 def exponential_backoff_with_jitter(retry: int, base: float = 1.0, max_wait: float = 60.0) -> float:
     """
     Calculate exponential backoff with jitter.
@@ -189,6 +226,37 @@ def exponential_backoff_with_jitter(retry: int, base: float = 1.0, max_wait: flo
     return capped + jitter
 
 
+# Markup that changes between requests without the coin data changing
+VOLATILE_MARKUP = re.compile(
+    r'<(script|style|noscript|svg)\b.*?</\1\s*>|<!--.*?-->|<input\b[^>]*>|<meta\b[^>]*>',
+    re.IGNORECASE | re.DOTALL,
+)
+CONTENT_REGIONS = [
+    re.compile(r'<main\b[^>]*>(.*)</main\s*>', re.IGNORECASE | re.DOTALL),
+    re.compile(r'<body\b[^>]*>(.*)</body\s*>', re.IGNORECASE | re.DOTALL),
+]
+
+
+def content_hash(html: str) -> str:
+    """
+    SHA-256 of a detail page's data-bearing region.
+
+    Takes <main> (else <body>) with scripts, styles, comments, form inputs
+    and meta tags removed and whitespace collapsed, so tokens, ads and
+    tracking markup don't register as changes. Regex-only: much cheaper
+    than parsing the page.
+    """
+    content = html
+    for pattern in CONTENT_REGIONS:
+        region = pattern.search(html)
+        if region:
+            content = region.group(1)
+            break
+    content = VOLATILE_MARKUP.sub('', content)
+    content = ' '.join(content.split())
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
 def classify_error(status_code: int = 0, exception: Exception = None) -> ErrorType:
     """Classify an error for circuit breaker handling."""
     if exception:
@@ -209,20 +277,87 @@ def classify_error(status_code: int = 0, exception: Exception = None) -> ErrorTy
     return ErrorType.UNKNOWN
 
 
+@dataclass
+class WorkPlan:
+    """Coin lists of every pending series, fetched before detail scraping starts."""
+    series_coins: Dict[str, List[Dict]] = field(default_factory=dict)  # slug -> listed coins
+    failed_series: List[str] = field(default_factory=list)  # slugs whose page gave no coins (failed or empty)
+    listings: int = 0  # Coin rows across all series pages
+    unique_coins: int = 0  # Distinct PCGS numbers
+    already_complete: int = 0  # Distinct coins done in an earlier run
+    page_seconds: float = 0.0  # Planning wall-clock time per category page (throughput)
+    planning_seconds: float = 0.0
+
+    @property
+    def duplicates(self) -> int:
+        return self.listings - self.unique_coins
+
+    @property
+    def coins_to_fetch(self) -> int:
+        return self.unique_coins - self.already_complete
+
+    @property
+    def eta_seconds(self) -> float:
+        """Detail scraping time at the measured per-request rate (one request at a time)."""
+        per_request = self.page_seconds or (REQUEST_DELAY_MIN + REQUEST_DELAY_MAX) / 2
+        return self.coins_to_fetch * per_request
+
+    def summary(self) -> str:
+        """Generate a summary string."""
+        eta = str(timedelta(seconds=int(self.eta_seconds)))
+        lines = [
+            f"Series planned: {len(self.series_coins)} ({len(self.failed_series)} with no coins)",
+            f"Coin listings: {self.listings:,} ({self.duplicates:,} in more than one series)",
+            f"Unique coins: {self.unique_coins:,} ({self.already_complete:,} already complete)",
+            f"Detail pages to fetch: {self.coins_to_fetch:,}",
+            f"ETA: {eta} at {self.page_seconds:.1f}s/request",
+        ]
+        if self.failed_series:
+            lines.append(f"No coins (page fetched again when reached): {', '.join(self.failed_series)}")
+        return "\n".join(lines)
+
+
 class PCGSScraper:
     """Enhanced PCGS scraper with session management and selector fallbacks."""
 
-    def __init__(self, db: Session, progress_tracker=None):
+    def __init__(self, db: Session, progress_tracker=None, seen_coins: Optional[SeenCoins] = None,
+                 archive: Optional[HtmlArchive] = None, offline: bool = False,
+                 archive_date: Optional[date] = None, shared_limits: Optional[bool] = None):
+        """
+        Args:
+            db: Database session
+            progress_tracker: Optional ProgressTracker for resume support
+            seen_coins: Run-wide SeenCoins shared by every scraper in the run;
+                defaults to one private to this scraper
+            archive: HtmlArchive that fetched pages are stored in; defaults
+                to data/html_archive.db
+            offline: Serve every request from the archive instead of the
+                network (re-extraction); content hashes are ignored so each
+                page is parsed
+            archive_date: In offline mode, use copies fetched on or before this date
+            shared_limits: Take the request rate and circuit breaker from
+                Redis so all workers share them; defaults to config SHARED_LIMITS
+        """
         self.db = db
         self.progress_tracker = progress_tracker
+        self.seen_coins = seen_coins or SeenCoins(progress_tracker)
+        self.archive = archive or HtmlArchive()
+        self.offline = offline
+        self.archive_date = archive_date
+        self._archive_fetched_at: Dict[str, datetime] = {}  # Offline: when each served page was fetched
         self._session_cookies: Dict[str, str] = {}
         self._session_refresh_count = 0
         self.client = self._create_client()
-        self._circuit_breaker = CircuitBreakerState()
+        shared_bucket, shared_breaker = scrape_limits(shared_limits)
+        self.rate_limiter = shared_bucket or PoliteDelay()
+        self._circuit_breaker = shared_breaker or CircuitBreakerState()
         self._start_time = datetime.now()
         self.stats = {
+            'coins_listed': 0,  # On the category pages scraped (0 if the page fetch failed)
             'coins_scraped': 0,
             'coins_failed': 0,
+            'duplicates_skipped': 0,  # Already fetched via another series this run
+            'coins_unchanged': 0,  # Content hash matched; only lastVerifiedAt touched
             'prices_scraped': 0,
             'selectors_matched': {},  # Track which selectors work
             'http_errors': {},  # Track error types by classification
@@ -282,14 +417,22 @@ class PCGSScraper:
         Returns:
             Tuple of (html_content or None, status_code)
         """
+        if self.offline:
+            page = self.archive.get_with_date(url, on=self.archive_date)
+            if page is None:
+                logger.warning(f"Not in archive: {url}")
+                return None, 404
+            html, self._archive_fetched_at[url] = page
+            return html, 200
+
         # Check circuit breaker
         if not self._circuit_breaker.can_attempt():
             logger.warning(f"Circuit breaker OPEN, skipping request: {url}")
             return None, 503  # Service unavailable
 
-        # Random delay between requests (polite scraping)
-        delay = REQUEST_DELAY_MIN + random.random() * (REQUEST_DELAY_MAX - REQUEST_DELAY_MIN)
-        await asyncio.sleep(delay)
+        # Polite delay between requests, shared by concurrent fetches; with
+        # shared limits the global bucket spaces requests across all workers
+        await self.rate_limiter.acquire()
 
         try:
             response = await self.client.get(url)
@@ -339,6 +482,7 @@ class PCGSScraper:
 
             # Success - reset circuit breaker
             self._circuit_breaker.record_success()
+            self.archive.store(url, response.text)
             return response.text, status
 
         except httpx.HTTPStatusError as e:
@@ -504,8 +648,20 @@ class PCGSScraper:
             'full_name': full_name,
         }
 
-    async def scrape_coin_detail(self, pcgs_number: int) -> Optional[Dict]:
-        """Scrape detailed info and prices with fallback selectors."""
+    async def scrape_coin_detail(self, pcgs_number: int, known_hash: Optional[str] = None) -> Optional[Dict]:
+        """
+        Scrape detailed info and prices with fallback selectors.
+
+        Args:
+            pcgs_number: Coin to fetch
+            known_hash: contentHash stored for the coin; if the page still
+                hashes the same it is not parsed
+
+        Returns:
+            Detail dict including content_hash (and, offline, fetched_at of
+            the archived copy); {'pcgs_number', 'content_hash', 'unchanged':
+            True} if the page matched known_hash; None if the fetch failed
+        """
         url = f"{PCGS_COIN_DETAIL_URL}/{pcgs_number}"
         html, status = await self._polite_request(url)
 
@@ -513,6 +669,19 @@ class PCGSScraper:
             logger.error(f"Failed to fetch coin detail: {pcgs_number} (status: {status})")
             return None
 
+        page_hash = content_hash(html)
+        if known_hash and not self.offline and page_hash == known_hash:
+            logger.debug(f"Coin {pcgs_number} unchanged (hash {page_hash[:12]})")
+            return {'pcgs_number': pcgs_number, 'content_hash': page_hash, 'unchanged': True}
+
+        detail = self.parse_coin_detail(pcgs_number, html)
+        detail['content_hash'] = page_hash
+        if self.offline:
+            detail['fetched_at'] = self._archive_fetched_at.pop(url)
+        return detail
+
+    def parse_coin_detail(self, pcgs_number: int, html: str) -> Dict:
+        """Parse a detail page's info and price guide with fallback selectors."""
         soup = BeautifulSoup(html, 'html.parser')
 
         detail: Dict[str, Any] = {
@@ -577,20 +746,84 @@ class PCGSScraper:
 
         return detail
 
-    async def scrape_and_save_series(self, series_name: str, slug: str, category_id: int):
-        """Scrape a series and save to database."""
+    async def plan_series(self, series_list: List[Dict],
+                          concurrency: int = CATEGORY_PREFETCH_CONCURRENCY) -> WorkPlan:
+        """
+        Fetch the category pages of all series concurrently and build the run's work list.
+
+        Each request still goes through _polite_request and its rate
+        limiter, so fetching concurrently overlaps slow responses without
+        exceeding the polite request rate.
+
+        Args:
+            series_list: Series configs (name, slug, category_id)
+            concurrency: Category pages fetched at once
+
+        Returns:
+            WorkPlan with each series' coin list and deduplicated totals
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        started = datetime.now()
+
+        async def fetch(series: Dict) -> List[Dict]:
+            async with semaphore:
+                return await self.scrape_series(series['name'], series['slug'], series['category_id'])
+
+        logger.info(f"Planning run: fetching {len(series_list)} category pages ({concurrency} at a time)")
+        results = await asyncio.gather(*(fetch(series) for series in series_list))
+
+        plan = WorkPlan()
+        seen = set()
+        for series, coins in zip(series_list, results):
+            if not coins:
+                plan.failed_series.append(series['slug'])
+                continue
+            plan.series_coins[series['slug']] = coins
+            plan.listings += len(coins)
+            for coin in coins:
+                pcgs_num = coin.get('pcgs_number')
+                if pcgs_num in seen:
+                    continue
+                seen.add(pcgs_num)
+                if self.progress_tracker and self.progress_tracker.is_coin_complete(pcgs_num):
+                    plan.already_complete += 1
+
+        plan.unique_coins = len(seen)
+        plan.planning_seconds = (datetime.now() - started).total_seconds()
+        # Wall-clock per page: a single fetch's duration includes its wait
+        # in the shared polite-delay queue, which concurrency multiplies
+        plan.page_seconds = plan.planning_seconds / len(series_list) if series_list else 0.0
+        return plan
+
+    async def scrape_and_save_series(self, series_name: str, slug: str, category_id: int,
+                                     coins: Optional[List[Dict]] = None):
+        """
+        Scrape a series and save to database.
+
+        Args:
+            coins: Coin list from a WorkPlan; the series page is fetched if None
+        """
         logger.info(f"Starting scrape for {series_name}")
 
         # Track progress if tracker available
         if self.progress_tracker:
-            self.progress_tracker.mark_series_started(slug)
+            self.progress_tracker.mark_series_started(slug, len(coins) if coins else 0)
 
         # Get list of coins in series
-        coins = await self.scrape_series(series_name, slug, category_id)
+        if coins is None:
+            coins = await self.scrape_series(series_name, slug, category_id)
+        self.stats['coins_listed'] += len(coins)
+        self.seen_coins.record_series(slug, [coin.get('pcgs_number') for coin in coins])
+        known_hashes = {} if self.offline else self._get_content_hashes([coin.get('pcgs_number') for coin in coins])
 
         for coin_data in coins:
             pcgs_num = coin_data.get('pcgs_number')
 
+            # Listed under an earlier series this run - membership is recorded, skip the fetch
+            if not self.seen_coins.claim(pcgs_num, slug):
+                self.stats['duplicates_skipped'] += 1
+                continue
+
             # Check if already scraped (resume capability)
             if self.progress_tracker and self.progress_tracker.is_coin_complete(pcgs_num):
                 logger.debug(f"Skipping already scraped coin: {pcgs_num}")
@@ -598,9 +831,13 @@ class PCGSScraper:
 
             try:
                 # Get detailed info
-                detail = await self.scrape_coin_detail(pcgs_num)
+                detail = await self.scrape_coin_detail(pcgs_num, known_hashes.get(pcgs_num))
 
-                if detail:
+                if detail and detail.get('unchanged'):
+                    self._mark_verified(pcgs_num)
+                    if self.progress_tracker:
+                        self.progress_tracker.mark_coin_complete(pcgs_num, slug)
+                elif detail:
                     # Merge data
                     coin_data.update(detail)
 
@@ -609,17 +846,17 @@ class PCGSScraper:
                     self.stats['coins_scraped'] += 1
 
                     if self.progress_tracker:
-                        self.progress_tracker.mark_coin_complete(pcgs_num)
+                        self.progress_tracker.mark_coin_complete(pcgs_num, slug)
                 else:
                     self.stats['coins_failed'] += 1
                     if self.progress_tracker:
-                        self.progress_tracker.mark_coin_failed(pcgs_num)
+                        self.progress_tracker.mark_coin_failed(pcgs_num, slug)
 
             except Exception as e:
                 logger.error(f"Error processing coin {pcgs_num}: {e}")
                 self.stats['coins_failed'] += 1
                 if self.progress_tracker:
-                    self.progress_tracker.mark_coin_failed(pcgs_num)
+                    self.progress_tracker.mark_coin_failed(pcgs_num, slug)
 
         # Mark series complete
         if self.progress_tracker:
@@ -627,8 +864,67 @@ class PCGSScraper:
 
         logger.info(f"Completed {series_name}: {self.stats['coins_scraped']} scraped, {self.stats['coins_failed']} failed")
 
+    async def refresh_coin(self, coin_data: Dict) -> bool:
+        """
+        Re-scrape one known coin's detail page and save it.
+
+        Args:
+            coin_data: Known coin fields (pcgs_number, year, series, ...);
+                values found on the detail page override them. If it has
+                the stored content_hash, an unchanged page is not re-saved
+
+        Returns:
+            True if the coin was scraped and saved
+        """
+        detail = await self.scrape_coin_detail(coin_data['pcgs_number'], coin_data.get('content_hash'))
+        if not detail:
+            self.stats['coins_failed'] += 1
+            return False
+
+        if detail.get('unchanged'):
+            self._mark_verified(coin_data['pcgs_number'])
+            return True
+
+        await self._save_coin({**coin_data, **detail})
+        self.stats['coins_scraped'] += 1
+        return True
+
+    def _get_content_hashes(self, pcgs_numbers: List[int]) -> Dict[int, str]:
+        """Stored contentHash per PCGS number (coins without one are omitted)."""
+        pcgs_numbers = [n for n in pcgs_numbers if n]
+        if not pcgs_numbers:
+            return {}
+        rows = self.db.query(CoinReference.pcgsNumber, CoinReference.contentHash).filter(
+            CoinReference.pcgsNumber.in_(pcgs_numbers),
+            CoinReference.contentHash.isnot(None),
+        ).all()
+        return {pcgs_number: page_hash for pcgs_number, page_hash in rows}
+
+    def _mark_verified(self, pcgs_number: int):
+        """Record that an unchanged page was re-checked, without rewriting the coin."""
+        self.db.query(CoinReference).filter(CoinReference.pcgsNumber == pcgs_number).update(
+            # Pin updatedAt so its onupdate doesn't fire: the coin's data didn't change
+            {CoinReference.lastVerifiedAt: datetime.now(), CoinReference.updatedAt: CoinReference.updatedAt},
+            synchronize_session=False,
+        )
+        self.db.commit()
+        self.stats['coins_unchanged'] += 1
+
     async def _save_coin(self, coin_data: Dict):
-        """Save coin and prices to database."""
+        """
+        Save coin and prices to database.
+
+        updatedAt means "data last changed" (the validation cache and coin
+        index watermarks rely on it): it is only bumped when a field or the
+        page's content hash differs. lastVerifiedAt records the fetch.
+
+        Data re-extracted from an archived page (coin_data['fetched_at'])
+        is dated when the page was fetched: prices get that priceDate and
+        lastVerifiedAt never moves past it. updatedAt still follows the
+        change itself, so watermark readers pick re-extracted data up.
+        """
+        fetched_at = coin_data.get('fetched_at')
+        verified_at = fetched_at or datetime.now()
         # Generate search tokens
         search_text = CoinReference.generate_search_tokens(
             coin_data.get('year'),
@@ -652,26 +948,43 @@ class PCGSScraper:
                 mintMark=coin_data.get('mint_mark'),
                 denomination=coin_data.get('denomination'),
                 series=coin_data.get('series'),
+                priorityTier=SERIES_PRIORITY_TIERS.get(coin_data.get('series')),
                 variety=coin_data.get('variety'),
                 mintage=coin_data.get('mintage'),
                 fullName=coin_data.get('full_name', f"PCGS# {coin_data['pcgs_number']}"),
                 searchTokens=search_text,
+                contentHash=coin_data.get('content_hash'),
+                lastVerifiedAt=verified_at,
             )
             self.db.add(coin_ref)
         else:
-            coin_ref.year = coin_data.get('year')
-            coin_ref.mintMark = coin_data.get('mint_mark')
-            coin_ref.denomination = coin_data.get('denomination')
-            coin_ref.variety = coin_data.get('variety')
-            coin_ref.mintage = coin_data.get('mintage')
-            coin_ref.fullName = coin_data.get('full_name')
-            coin_ref.searchTokens = search_text
+            values = {
+                'year': coin_data.get('year'),
+                'mintMark': coin_data.get('mint_mark'),
+                'denomination': coin_data.get('denomination'),
+                'priorityTier': SERIES_PRIORITY_TIERS.get(coin_ref.series),
+                'variety': coin_data.get('variety'),
+                'mintage': coin_data.get('mintage'),
+                'fullName': coin_data.get('full_name'),
+                'searchTokens': search_text,
+                'contentHash': coin_data.get('content_hash'),
+            }
+            changed = any(getattr(coin_ref, column) != value for column, value in values.items())
+            for column, value in values.items():
+                setattr(coin_ref, column, value)
+            if not fetched_at or not coin_ref.lastVerifiedAt or fetched_at > coin_ref.lastVerifiedAt:
+                coin_ref.lastVerifiedAt = verified_at
+            if changed:
+                coin_ref.updatedAt = datetime.now()
+            else:
+                # Pin updatedAt so its onupdate doesn't fire for the lastVerifiedAt write
+                flag_modified(coin_ref, 'updatedAt')
 
         self.db.commit()
         self.db.refresh(coin_ref)
 
         # Save prices
-        today = date.today()
+        today = fetched_at.date() if fetched_at else date.today()
         for grade, price in coin_data.get('prices', {}).items():
             existing = self.db.query(CoinPriceGuide).filter(
                 CoinPriceGuide.coinReferenceId == coin_ref.id,
@@ -712,6 +1025,8 @@ class PCGSScraper:
             f"Duration: {elapsed_str}",
             f"Coins scraped: {self.stats['coins_scraped']}",
             f"Coins failed: {self.stats['coins_failed']}",
+            f"Duplicates skipped: {self.stats['duplicates_skipped']}",
+            f"Unchanged (hash match): {self.stats['coins_unchanged']}",
             f"Success rate: {success_rate:.1f}%",
             f"Prices scraped: {self.stats['prices_scraped']}",
             "",
@@ -743,11 +1058,13 @@ class PCGSScraper:
         return "\n".join(lines)
 
 
-async def run_scraper(db: Session, series_filter: str = None, priority_filter: str = None, progress_tracker=None):
+async def run_scraper(db: Session, series_filter: str = None, priority_filter: str = None, progress_tracker=None,
+                      shared_limits: Optional[bool] = None, seen_coins: Optional[SeenCoins] = None):
     """Main entry point for running the scraper."""
     from config import COIN_SERIES
 
-    scraper = PCGSScraper(db, progress_tracker=progress_tracker)
+    scraper = PCGSScraper(db, progress_tracker=progress_tracker, seen_coins=seen_coins,
+                          shared_limits=shared_limits)
 
     try:
         for series in COIN_SERIES:
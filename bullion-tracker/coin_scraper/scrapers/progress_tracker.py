@@ -5,13 +5,16 @@ Enables stop/resume capability for large scraping operations by persisting:
 - Series started/completed status
 - Individual coin scraping status
 - Failure tracking with retry counts
+- Series membership of each coin (a PCGS number can be listed by several
+  category pages; its detail page is fetched once per run via SeenCoins)
+- Per-run chunk status for the distributed weekly refresh (tasks/weekly_refresh.py)
 """
 
 import sqlite3
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, List, Tuple
+from typing import Iterable, Optional, Dict, List, Tuple
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
@@ -96,6 +99,44 @@ class ProgressTracker:
                 ON coin_progress(status)
             """)
 
+            # Every series page a coin is listed on (duplicates across series)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS coin_series_membership (
+                    pcgs_number INTEGER NOT NULL,
+                    series_slug TEXT NOT NULL,
+                    first_seen_at TIMESTAMP NOT NULL,
+                    PRIMARY KEY (pcgs_number, series_slug)
+                )
+            """)
+
+            # Chunks of a distributed refresh run, keyed by run (e.g. weekly-2026-W42)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS refresh_chunks (
+                    run_key TEXT NOT NULL,
+                    chunk_key TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER DEFAULT 0,
+                    started_at TIMESTAMP,
+                    completed_at TIMESTAMP,
+                    coins_scraped INTEGER DEFAULT 0,
+                    coins_failed INTEGER DEFAULT 0,
+                    prices_scraped INTEGER DEFAULT 0,
+                    error_message TEXT,
+                    PRIMARY KEY (run_key, chunk_key)
+                )
+            """)
+
+            # Coins claimed by a chunk of a distributed run (run-wide dedup across workers)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS run_coin_claims (
+                    run_key TEXT NOT NULL,
+                    pcgs_number INTEGER NOT NULL,
+                    series_slug TEXT NOT NULL,
+                    claimed_at TIMESTAMP NOT NULL,
+                    PRIMARY KEY (run_key, pcgs_number)
+                )
+            """)
+
             # Run tracking table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS scrape_runs (
@@ -272,6 +313,50 @@ class ProgressTracker:
         finally:
             conn.close()
 
+    # ===== Series Membership =====
+
+    def record_series_members(self, series_slug: str, pcgs_numbers: Iterable[int]):
+        """Record that these coins are listed on a series page."""
+        now = datetime.now()
+        conn = self._get_conn()
+        try:
+            conn.executemany("""
+                INSERT OR IGNORE INTO coin_series_membership (pcgs_number, series_slug, first_seen_at)
+                VALUES (?, ?, ?)
+            """, [(pcgs_number, series_slug, now) for pcgs_number in pcgs_numbers if pcgs_number])
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get_coin_series(self, pcgs_number: int) -> List[str]:
+        """All series slugs a coin has been listed under, first seen first."""
+        conn = self._get_conn()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT series_slug FROM coin_series_membership
+                WHERE pcgs_number = ?
+                ORDER BY first_seen_at, series_slug
+            """, (pcgs_number,))
+            return [row['series_slug'] for row in cursor.fetchall()]
+        finally:
+            conn.close()
+
+    def get_multi_series_coins(self) -> Dict[int, List[str]]:
+        """Coins listed under more than one series, with their series slugs."""
+        conn = self._get_conn()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT pcgs_number, GROUP_CONCAT(series_slug) as slugs
+                FROM coin_series_membership
+                GROUP BY pcgs_number
+                HAVING COUNT(*) > 1
+            """)
+            return {row['pcgs_number']: sorted(row['slugs'].split(',')) for row in cursor.fetchall()}
+        finally:
+            conn.close()
+
     # ===== Resume Capability =====
 
     def get_resume_point(self) -> Optional[Dict]:
@@ -399,6 +484,10 @@ class ProgressTracker:
         if stats.last_activity:
             lines.append(f"Last activity: {stats.last_activity.strftime('%Y-%m-%d %H:%M:%S')}")
 
+        multi_series = self.get_multi_series_coins()
+        if multi_series:
+            lines.append(f"Coins listed in multiple series: {len(multi_series)}")
+
         # Add pending series count
         pending = self.get_pending_series()
         if pending:
@@ -428,6 +517,9 @@ class ProgressTracker:
             cursor.execute("DELETE FROM coin_progress")
             cursor.execute("DELETE FROM series_progress")
             cursor.execute("DELETE FROM scrape_runs")
+            cursor.execute("DELETE FROM coin_series_membership")
+            cursor.execute("DELETE FROM refresh_chunks")
+            cursor.execute("DELETE FROM run_coin_claims")
             conn.commit()
             logger.warning("Progress tracking reset!")
         finally:
@@ -462,3 +554,184 @@ class ProgressTracker:
             conn.commit()
         finally:
             conn.close()
+
+    # ===== Refresh Chunks =====
+
+    def register_chunks(self, run_key: str, chunk_keys: Iterable[str]) -> List[str]:
+        """
+        Add a run's chunks (existing ones keep their status).
+
+        Returns:
+            Chunk keys of the run that are not yet completed
+        """
+        conn = self._get_conn()
+        try:
+            conn.executemany("""
+                INSERT OR IGNORE INTO refresh_chunks (run_key, chunk_key) VALUES (?, ?)
+            """, [(run_key, chunk_key) for chunk_key in chunk_keys])
+            # Claims only matter within a run
+            conn.execute("DELETE FROM run_coin_claims WHERE run_key != ?", (run_key,))
+            conn.commit()
+            cursor = conn.execute("""
+                SELECT chunk_key FROM refresh_chunks
+                WHERE run_key = ? AND status != 'completed'
+                ORDER BY chunk_key
+            """, (run_key,))
+            return [row['chunk_key'] for row in cursor.fetchall()]
+        finally:
+            conn.close()
+
+    def start_chunk(self, run_key: str, chunk_key: str) -> bool:
+        """
+        Mark a chunk in progress and count the attempt.
+
+        Returns:
+            False if the chunk already completed (nothing to do)
+        """
+        conn = self._get_conn()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT OR IGNORE INTO refresh_chunks (run_key, chunk_key) VALUES (?, ?)
+            """, (run_key, chunk_key))
+            cursor.execute("""
+                UPDATE refresh_chunks
+                SET status = 'in_progress', attempts = attempts + 1, started_at = ?
+                WHERE run_key = ? AND chunk_key = ? AND status != 'completed'
+            """, (datetime.now(), run_key, chunk_key))
+            conn.commit()
+            return cursor.rowcount > 0
+        finally:
+            conn.close()
+
+    def complete_chunk(self, run_key: str, chunk_key: str, coins_scraped: int,
+                       coins_failed: int, prices_scraped: int):
+        """Mark a chunk completed with its results."""
+        conn = self._get_conn()
+        try:
+            conn.execute("""
+                UPDATE refresh_chunks
+                SET status = 'completed', completed_at = ?, coins_scraped = ?,
+                    coins_failed = ?, prices_scraped = ?, error_message = NULL
+                WHERE run_key = ? AND chunk_key = ?
+            """, (datetime.now(), coins_scraped, coins_failed, prices_scraped, run_key, chunk_key))
+            conn.commit()
+            logger.info(f"Chunk completed: {run_key}/{chunk_key} ({coins_scraped} scraped, {coins_failed} failed)")
+        finally:
+            conn.close()
+
+    def fail_chunk(self, run_key: str, chunk_key: str, error: str = None):
+        """Mark a chunk failed (a later run of the same run_key retries it)."""
+        conn = self._get_conn()
+        try:
+            conn.execute("""
+                UPDATE refresh_chunks
+                SET status = 'failed', error_message = ?
+                WHERE run_key = ? AND chunk_key = ?
+            """, (error, run_key, chunk_key))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def claim_coin_for_run(self, run_key: str, pcgs_number: int, series_slug: str) -> str:
+        """
+        Claim a coin for one series of a run, first come first served.
+
+        Returns:
+            Slug of the series holding the claim (series_slug if it's new,
+            or if this series claimed it on an earlier attempt)
+        """
+        conn = self._get_conn()
+        try:
+            conn.execute("""
+                INSERT OR IGNORE INTO run_coin_claims (run_key, pcgs_number, series_slug, claimed_at)
+                VALUES (?, ?, ?, ?)
+            """, (run_key, pcgs_number, series_slug, datetime.now()))
+            conn.commit()
+            row = conn.execute("""
+                SELECT series_slug FROM run_coin_claims WHERE run_key = ? AND pcgs_number = ?
+            """, (run_key, pcgs_number)).fetchone()
+            return row['series_slug']
+        finally:
+            conn.close()
+
+    def get_chunk_summary(self, run_key: str) -> Dict[str, int]:
+        """Chunk counts by status plus coin/price totals of completed chunks."""
+        conn = self._get_conn()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT status, COUNT(*) as chunks,
+                       SUM(coins_scraped) as coins_scraped,
+                       SUM(coins_failed) as coins_failed,
+                       SUM(prices_scraped) as prices_scraped
+                FROM refresh_chunks
+                WHERE run_key = ?
+                GROUP BY status
+            """, (run_key,))
+            summary = {'completed': 0, 'failed': 0, 'in_progress': 0, 'pending': 0,
+                       'coins_scraped': 0, 'coins_failed': 0, 'prices_scraped': 0}
+            for row in cursor.fetchall():
+                summary[row['status']] = row['chunks']
+                if row['status'] == 'completed':
+                    summary['coins_scraped'] = row['coins_scraped'] or 0
+                    summary['coins_failed'] = row['coins_failed'] or 0
+                    summary['prices_scraped'] = row['prices_scraped'] or 0
+            return summary
+        finally:
+            conn.close()
+
+
+class SeenCoins:
+    """
+    Run-wide set of PCGS numbers whose detail page has been claimed.
+
+    Share one instance across every PCGSScraper in a run so a coin listed on
+    several category pages is fetched once; later listings are only recorded
+    as series membership (in the tracker, if one is given).
+
+    With a run_key, claims are kept in the tracker's database instead, so
+    separate processes working on the same run (weekly refresh chunks)
+    share them.
+    """
+
+    def __init__(self, tracker: Optional[ProgressTracker] = None, run_key: Optional[str] = None):
+        if run_key and not tracker:
+            raise ValueError("run_key needs a tracker to keep claims in")
+        self.tracker = tracker
+        self.run_key = run_key
+        self._first_series: Dict[int, str] = {}
+        self.duplicates = 0
+
+    def __contains__(self, pcgs_number: int) -> bool:
+        return pcgs_number in self._first_series
+
+    def __len__(self) -> int:
+        return len(self._first_series)
+
+    def claim(self, pcgs_number: int, series_slug: str) -> bool:
+        """
+        Claim a coin for fetching.
+
+        Returns:
+            True the first time a coin is seen this run (caller fetches it),
+            False if another series already claimed it
+        """
+        if pcgs_number not in self._first_series:
+            if self.run_key:
+                holder = self.tracker.claim_coin_for_run(self.run_key, pcgs_number, series_slug)
+            else:
+                holder = series_slug
+            self._first_series[pcgs_number] = holder
+            if holder == series_slug:
+                return True
+
+        self.duplicates += 1
+        logger.debug(f"Coin {pcgs_number} in {series_slug} already fetched via "
+                     f"{self._first_series[pcgs_number]}")
+        return False
+
+    def record_series(self, series_slug: str, pcgs_numbers: Iterable[int]):
+        """Persist a series page's coin list as membership."""
+        if self.tracker:
+            self.tracker.record_series_members(series_slug, pcgs_numbers)
@@ -23,20 +23,20 @@ async def refresh_prices():
         print(f"Refreshing prices for {len(coins)} coins...")
 
         for coin in coins:
-            detail = await scraper.scrape_coin_detail(coin.pcgsNumber)
-            if detail:
-                await scraper._save_coin({
-                    'pcgs_number': coin.pcgsNumber,
-                    'year': coin.year,
-                    'mint_mark': coin.mintMark,
-                    'denomination': coin.denomination,
-                    'series': coin.series,
-                    'variety': coin.variety,
-                    'full_name': coin.fullName,
-                    'prices': detail.get('prices', {}),
-                })
-
-        print(f"✅ Refreshed {scraper.stats['prices_scraped']} prices")
+            await scraper.refresh_coin({
+                'pcgs_number': coin.pcgsNumber,
+                'year': coin.year,
+                'mint_mark': coin.mintMark,
+                'denomination': coin.denomination,
+                'series': coin.series,
+                'variety': coin.variety,
+                'mintage': coin.mintage,
+                'full_name': coin.fullName,
+                'content_hash': coin.contentHash,
+            })
+
+        print(f"✅ Refreshed {scraper.stats['prices_scraped']} prices "
+              f"({scraper.stats['coins_unchanged']} coins unchanged)")
 
     finally:
         await scraper.close()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Sync CoinReference priority tiers from config.COIN_SERIES
+
+Writes each series' tier (P0 -> 0 ... P3 -> 3) into CoinReference."priorityTier"
+so the price refresher can filter and order by an indexed column. Coins in
+series that are no longer configured are reset to NULL (refreshed last).
+
+Run after editing priorities in config.py:
+    python3 scripts/sync_priorities.py
+    python3 scripts/sync_priorities.py --dry-run
+"""
+
+import argparse
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text, bindparam
+
+from config import SERIES_PRIORITY_TIERS
+from database import engine
+
+
+def sync_priorities(dry_run: bool = False):
+    series_by_tier = {}
+    for series_name, tier in SERIES_PRIORITY_TIERS.items():
+        series_by_tier.setdefault(tier, []).append(series_name)
+
+    with engine.connect() as conn:
+        for tier, series_names in sorted(series_by_tier.items()):
+            query = text("""
+                UPDATE "CoinReference"
+                SET "priorityTier" = :tier
+                WHERE series IN :series_names
+                  AND "priorityTier" IS DISTINCT FROM :tier
+            """).bindparams(bindparam("series_names", expanding=True))
+            result = conn.execute(query, {"tier": tier, "series_names": series_names})
+            print(f"P{tier}: {len(series_names)} series, {result.rowcount} coins updated")
+
+        query = text("""
+            UPDATE "CoinReference"
+            SET "priorityTier" = NULL
+            WHERE series NOT IN :series_names
+              AND "priorityTier" IS NOT NULL
+        """).bindparams(bindparam("series_names", expanding=True))
+        result = conn.execute(query, {"series_names": list(SERIES_PRIORITY_TIERS)})
+        print(f"Unconfigured series: {result.rowcount} coins cleared")
+
+        unranked = conn.execute(text("""
+            SELECT series, COUNT(*) FROM "CoinReference"
+            WHERE "priorityTier" IS NULL
+            GROUP BY series ORDER BY COUNT(*) DESC
+        """)).fetchall()
+        for series, count in unranked:
+            print(f"  ⚠️  Not in COIN_SERIES: {series} ({count} coins)")
+
+        if dry_run:
+            conn.rollback()
+            print("Dry run - changes rolled back")
+        else:
+            conn.commit()
+            print("✅ Priority tiers synced")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Sync CoinReference.priorityTier from COIN_SERIES')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Show what would change without committing')
+    args = parser.parse_args()
+    sync_priorities(dry_run=args.dry_run)
@@ -17,6 +17,12 @@ Usage:
     # Fetch auction prices (requires credentials)
     python scripts/test_pcgs_api.py --auction 9801
 
+    # Store every price/population in the response (requires DATABASE_URL)
+    python scripts/test_pcgs_api.py --cert-no 12345678 --save
+
+    # Skip the local response cache and always call the API
+    python scripts/test_pcgs_api.py --cert-no 12345678 --no-cache
+
 Environment variables required for API calls:
     PCGS_USERNAME: Your PCGS account email
     PCGS_PASSWORD: Your PCGS account password
@@ -34,7 +40,9 @@ from typing import Optional
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from api.quota_tracker import QuotaTracker
+from api.response_cache import ResponseCache
 from api.pcgs_api import PCGSApiClient, PCGSApiError, AuthenticationError, QuotaExceededError
+from api.response_extractor import extract_coin_facts
 
 
 def print_json(data: dict, indent: int = 2):
@@ -49,6 +57,36 @@ def check_credentials() -> bool:
     return bool(username and password)
 
 
+def report_and_save(result: dict, save: bool, requested_grade: Optional[str] = None):
+    """Print extracted facts and optionally persist them to CoinPriceGuide."""
+    facts = extract_coin_facts(result, requested_grade=requested_grade)
+    print(f"\nExtracted: PCGS#{facts.pcgs_number}, {len(facts.prices)} prices, "
+          f"{len(facts.populations)} populations")
+    for grade in sorted(facts.grades):
+        print(f"  {grade}: price={facts.prices.get(grade)} pop={facts.populations.get(grade)}")
+
+    if not save:
+        return
+
+    # Imported lazily so lookups work without a database
+    from sqlalchemy import create_engine
+    from config import DATABASE_URL
+    from price_store import find_coin_id, load_valid_grades, store_coin_facts
+
+    if not facts.pcgs_number:
+        print("Not saved: response has no PCGS number")
+        return
+
+    engine = create_engine(DATABASE_URL)
+    coin_id = find_coin_id(engine, facts.pcgs_number)
+    if not coin_id:
+        print(f"Not saved: PCGS#{facts.pcgs_number} is not in CoinReference")
+        return
+
+    written = store_coin_facts(engine, coin_id, facts, load_valid_grades(engine))
+    print(f"Saved {written} price guide rows for PCGS#{facts.pcgs_number}")
+
+
 async def run_status(tracker: QuotaTracker):
     """Show quota status."""
     print("\n=== PCGS API Quota Status ===")
@@ -60,6 +98,11 @@ async def run_status(tracker: QuotaTracker):
     print(f"Last call:       {status['last_call_at'] or 'Never'}")
     print(f"Quota file:      {status['quota_file']}")
 
+    cache_stats = ResponseCache().get_stats()
+    print(f"\nCached responses: {cache_stats['live_entries']} live / {cache_stats['entries']} total")
+    print(f"Quota saved:      {cache_stats['quota_saved']} calls (lifetime cache hits)")
+    print(f"Cache file:       {cache_stats['cache_file']}")
+
     # Check credentials
     if check_credentials():
         print("\nCredentials:     Set (PCGS_USERNAME, PCGS_PASSWORD)")
@@ -68,7 +111,8 @@ async def run_status(tracker: QuotaTracker):
         print("  Set PCGS_USERNAME and PCGS_PASSWORD environment variables to make API calls.")
 
 
-async def run_cert_lookup(cert_no: str, tracker: QuotaTracker):
+async def run_cert_lookup(cert_no: str, tracker: QuotaTracker, save: bool = False,
+                          bypass_cache: bool = False):
     """Look up coin by certificate number."""
     if not check_credentials():
         print("\nError: PCGS credentials not set.")
@@ -77,7 +121,7 @@ async def run_cert_lookup(cert_no: str, tracker: QuotaTracker):
 
     print(f"\n=== Looking up cert #{cert_no} ===")
 
-    async with PCGSApiClient(quota_tracker=tracker) as client:
+    async with PCGSApiClient(quota_tracker=tracker, bypass_cache=bypass_cache) as client:
         try:
             await client.authenticate()
             print("Authentication successful.")
@@ -85,8 +129,11 @@ async def run_cert_lookup(cert_no: str, tracker: QuotaTracker):
             result = await client.get_coin_by_cert(cert_no)
             print("\nCoin Data:")
             print_json(result)
+            report_and_save(result, save)
 
             print(f"\nQuota remaining: {tracker.get_remaining()}")
+            if client.stats['cache_hits']:
+                print("(served from cache, no quota used)")
 
         except AuthenticationError as e:
             print(f"\nAuthentication failed: {e.message}")
@@ -101,7 +148,8 @@ async def run_cert_lookup(cert_no: str, tracker: QuotaTracker):
             sys.exit(1)
 
 
-async def run_pcgs_lookup(pcgs_number: int, grade: str, tracker: QuotaTracker):
+async def run_pcgs_lookup(pcgs_number: int, grade: str, tracker: QuotaTracker, save: bool = False,
+                          bypass_cache: bool = False):
     """Look up coin by PCGS number and grade."""
     if not check_credentials():
         print("\nError: PCGS credentials not set.")
@@ -110,7 +158,7 @@ async def run_pcgs_lookup(pcgs_number: int, grade: str, tracker: QuotaTracker):
 
     print(f"\n=== Looking up PCGS #{pcgs_number} in grade {grade} ===")
 
-    async with PCGSApiClient(quota_tracker=tracker) as client:
+    async with PCGSApiClient(quota_tracker=tracker, bypass_cache=bypass_cache) as client:
         try:
             await client.authenticate()
             print("Authentication successful.")
@@ -118,8 +166,11 @@ async def run_pcgs_lookup(pcgs_number: int, grade: str, tracker: QuotaTracker):
             result = await client.get_coin_by_pcgs_and_grade(pcgs_number, grade)
             print("\nCoin Data:")
             print_json(result)
+            report_and_save(result, save, requested_grade=grade)
 
             print(f"\nQuota remaining: {tracker.get_remaining()}")
+            if client.stats['cache_hits']:
+                print("(served from cache, no quota used)")
 
         except AuthenticationError as e:
             print(f"\nAuthentication failed: {e.message}")
@@ -134,7 +185,8 @@ async def run_pcgs_lookup(pcgs_number: int, grade: str, tracker: QuotaTracker):
             sys.exit(1)
 
 
-async def run_auction_lookup(pcgs_number: int, grade: Optional[str], tracker: QuotaTracker):
+async def run_auction_lookup(pcgs_number: int, grade: Optional[str], tracker: QuotaTracker,
+                             bypass_cache: bool = False):
     """Look up auction prices for a coin."""
     if not check_credentials():
         print("\nError: PCGS credentials not set.")
@@ -144,7 +196,7 @@ async def run_auction_lookup(pcgs_number: int, grade: Optional[str], tracker: Qu
     grade_str = f" in grade {grade}" if grade else ""
     print(f"\n=== Looking up auction prices for PCGS #{pcgs_number}{grade_str} ===")
 
-    async with PCGSApiClient(quota_tracker=tracker) as client:
+    async with PCGSApiClient(quota_tracker=tracker, bypass_cache=bypass_cache) as client:
         try:
             await client.authenticate()
             print("Authentication successful.")
@@ -154,6 +206,8 @@ async def run_auction_lookup(pcgs_number: int, grade: Optional[str], tracker: Qu
             print_json(result)
 
             print(f"\nQuota remaining: {tracker.get_remaining()}")
+            if client.stats['cache_hits']:
+                print("(served from cache, no quota used)")
 
         except AuthenticationError as e:
             print(f"\nAuthentication failed: {e.message}")
@@ -200,6 +254,16 @@ def main():
         type=int,
         help="Get auction prices for PCGS number"
     )
+    parser.add_argument(
+        "--save",
+        action="store_true",
+        help="Store extracted prices/populations in CoinPriceGuide (requires DATABASE_URL)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the local response cache and always call the API"
+    )
 
     args = parser.parse_args()
 
@@ -220,11 +284,12 @@ def main():
     if args.status:
         asyncio.run(run_status(tracker))
     elif args.cert_no:
-        asyncio.run(run_cert_lookup(args.cert_no, tracker))
+        asyncio.run(run_cert_lookup(args.cert_no, tracker, save=args.save, bypass_cache=args.no_cache))
     elif args.pcgs_number:
-        asyncio.run(run_pcgs_lookup(args.pcgs_number, args.grade, tracker))
+        asyncio.run(run_pcgs_lookup(args.pcgs_number, args.grade, tracker, save=args.save,
+                                    bypass_cache=args.no_cache))
     elif args.auction:
-        asyncio.run(run_auction_lookup(args.auction, args.grade, tracker))
+        asyncio.run(run_auction_lookup(args.auction, args.grade, tracker, bypass_cache=args.no_cache))
 
 
 if __name__ == "__main__":
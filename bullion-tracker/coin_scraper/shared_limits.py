@@ -0,0 +1,322 @@
+"""
+Redis-backed limits shared by every worker
+
+The scraper's polite delay and CircuitBreakerState, the API client's
+requests_per_second spacing and the JSON QuotaTracker are all
+per-process, so once scraping or API refresh runs on several workers
+(tasks/weekly_refresh.py) none of them bounds the global rate. These
+replacements keep their state in Redis and update it atomically with Lua
+scripts, so every worker consults the same bucket, breaker and counter:
+
+- RedisTokenBucket: global request rate (scraper and API client)
+- RedisCircuitBreaker: same interface as pcgs_scraper.CircuitBreakerState
+- RedisQuotaTracker: same interface as api.quota_tracker.QuotaTracker
+
+Enabled with SHARED_LIMITS=1 (Celery tasks always use them). Any Redis
+client works, including fakeredis for tests:
+
+    import fakeredis
+    bucket = RedisTokenBucket(fakeredis.FakeRedis(), 'test', rate=2.0)
+"""
+
+import asyncio
+import logging
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import redis
+    HAS_REDIS = True
+except ImportError:
+    HAS_REDIS = False
+
+from config import REDIS_URL, SHARED_LIMITS, REQUEST_DELAY_MIN, REQUEST_DELAY_MAX
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "coin_scraper:"
+BREAKER_TTL_SECONDS = 24 * 3600  # Idle breaker state expires (closed)
+
+# Scripts read the clock with redis.call('TIME') so every worker sees the
+# same time regardless of clock skew between hosts (Redis 5+ replicates
+# script effects, so TIME may precede writes)
+SERVER_NOW = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+"""
+
+# Refill, then take `amount` tokens if available. Returns the wait in seconds
+# as a string (Lua numbers are truncated to integers on the way out).
+TOKEN_BUCKET_SCRIPT = SERVER_NOW + """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local amount = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(state[1]) or capacity
+local updated_at = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate)
+local wait = 0
+if tokens >= amount then
+    tokens = tokens - amount
+else
+    wait = (amount - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+return tostring(wait)
+"""
+
+# Returns 1 when this failure opened the circuit. A failure while already
+# open (a failed half-open attempt) re-arms it: the reset timeout restarts
+# from now with a fresh set of half-open attempts.
+BREAKER_FAILURE_SCRIPT = SERVER_NOW + """
+local failures = redis.call('HINCRBY', KEYS[1], 'failures', 1)
+local was_open = redis.call('HGET', KEYS[1], 'is_open') == '1'
+redis.call('HSET', KEYS[1], 'last_failure', tostring(now))
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+if was_open then
+    redis.call('HSET', KEYS[1], 'half_open_attempts', '0')
+    return 0
+end
+if failures >= tonumber(ARGV[1]) then
+    redis.call('HSET', KEYS[1], 'is_open', '1', 'half_open_attempts', '0')
+    return 1
+end
+return 0
+"""
+
+BREAKER_ATTEMPT_SCRIPT = SERVER_NOW + """
+local state = redis.call('HMGET', KEYS[1], 'is_open', 'last_failure', 'half_open_attempts')
+if state[1] ~= '1' then
+    return 1
+end
+if state[2] and now - tonumber(state[2]) >= tonumber(ARGV[1]) then
+    if (tonumber(state[3]) or 0) < tonumber(ARGV[2]) then
+        redis.call('HINCRBY', KEYS[1], 'half_open_attempts', 1)
+        return 2
+    end
+end
+return 0
+"""
+
+
+# Count a call only while below the limit. Returns calls remaining after it,
+# or -1 if the quota is exhausted (nothing is counted).
+QUOTA_RESERVE_SCRIPT = """
+local calls = tonumber(redis.call('GET', KEYS[1]) or '0')
+local limit = tonumber(ARGV[1])
+if calls >= limit then
+    return -1
+end
+calls = redis.call('INCR', KEYS[1])
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+redis.call('SET', KEYS[2], ARGV[3], 'EX', ARGV[2])
+return limit - calls
+"""
+
+QUOTA_RELEASE_SCRIPT = """
+if tonumber(redis.call('GET', KEYS[1]) or '0') > 0 then
+    return redis.call('DECR', KEYS[1])
+end
+return 0
+"""
+
+QUOTA_KEY_TTL_SECONDS = 2 * 24 * 3600
+
+
+def connect(url: Optional[str] = None) -> "redis.Redis":
+    """Redis client for the shared limits (defaults to REDIS_URL, the Celery broker)."""
+    if not HAS_REDIS:
+        raise RuntimeError("redis is not installed: pip install redis")
+    return redis.Redis.from_url(url or REDIS_URL)
+
+
+class RedisTokenBucket:
+    """
+    Token bucket in a Redis hash, refilled continuously at `rate` per second.
+
+    Usage:
+        bucket = RedisTokenBucket(connect(), 'pcgs_coinfacts', rate=0.5)
+        await bucket.acquire()      # waits for a token shared by all workers
+    """
+
+    def __init__(self, client, name: str, rate: float, capacity: float = 1.0):
+        """
+        Args:
+            client: Redis client
+            name: Bucket name; workers using the same name share the limit
+            rate: Tokens added per second
+            capacity: Most tokens held (burst size after an idle period)
+        """
+        self.client = client
+        self.key = f"{KEY_PREFIX}bucket:{name}"
+        self.rate = rate
+        self.capacity = capacity
+        self._script = client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    def try_acquire(self, amount: float = 1.0) -> float:
+        """Take tokens if available. Returns 0.0 on success, else seconds to wait."""
+        return float(self._script(keys=[self.key], args=[self.rate, self.capacity, amount]))
+
+    async def acquire(self, amount: float = 1.0):
+        """Wait until tokens are available and take them."""
+        while True:
+            wait = self.try_acquire(amount)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+
+class RedisCircuitBreaker:
+    """Circuit breaker whose failures and open state are shared by all workers."""
+
+    def __init__(self, client, name: str, failure_threshold: int = 5,
+                 reset_timeout_seconds: int = 60, half_open_max_attempts: int = 2):
+        self.client = client
+        self.key = f"{KEY_PREFIX}breaker:{name}"
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.half_open_max_attempts = half_open_max_attempts
+        self._failure_script = client.register_script(BREAKER_FAILURE_SCRIPT)
+        self._attempt_script = client.register_script(BREAKER_ATTEMPT_SCRIPT)
+
+    @property
+    def failures(self) -> int:
+        return int(self.client.hget(self.key, 'failures') or 0)
+
+    @property
+    def is_open(self) -> bool:
+        return self.client.hget(self.key, 'is_open') == b'1'
+
+    def record_failure(self):
+        """Record a failure and potentially open the circuit."""
+        opened = self._failure_script(keys=[self.key], args=[self.failure_threshold, BREAKER_TTL_SECONDS])
+        if opened:
+            logger.warning(f"Shared circuit breaker OPEN after {self.failure_threshold} failures")
+
+    def record_success(self):
+        """Record a success and reset the circuit."""
+        self.client.delete(self.key)
+
+    def can_attempt(self) -> bool:
+        """Check if a request can be attempted."""
+        result = self._attempt_script(
+            keys=[self.key],
+            args=[self.reset_timeout_seconds, self.half_open_max_attempts],
+        )
+        if result == 2:
+            logger.info("Shared circuit breaker HALF-OPEN, attempting request")
+        return bool(result)
+
+
+class RedisQuotaTracker:
+    """
+    Daily API quota counted atomically in Redis.
+
+    Drop-in for QuotaTracker; the counter key is per day and expires after
+    two days, so it resets at midnight without any bookkeeping. The API
+    client reserves each call with reserve_call() before sending it, which
+    checks and counts in one step, so workers together never exceed the
+    limit.
+    """
+
+    DAILY_LIMIT = 1000  # PCGS free tier limit
+
+    def __init__(self, client, name: str = "pcgs_api", daily_limit: Optional[int] = None):
+        self.client = client
+        self.name = name
+        self.daily_limit = daily_limit or self.DAILY_LIMIT
+        self._reserve_script = client.register_script(QUOTA_RESERVE_SCRIPT)
+        self._release_script = client.register_script(QUOTA_RELEASE_SCRIPT)
+
+    def _keys(self) -> Tuple[str, str]:
+        today = date.today().isoformat()
+        base = f"{KEY_PREFIX}quota:{self.name}:{today}"
+        return base, f"{base}:last_call_at"
+
+    def check_quota(self) -> bool:
+        """True if calls remaining > 0."""
+        return self.get_remaining() > 0
+
+    def record_call(self) -> int:
+        """Record an API call and return remaining calls."""
+        key, last_key = self._keys()
+        pipe = self.client.pipeline()
+        pipe.incr(key)
+        pipe.expire(key, timedelta(days=2))
+        pipe.set(last_key, datetime.now().isoformat(), ex=timedelta(days=2))
+        calls_made = pipe.execute()[0]
+        return self.daily_limit - calls_made
+
+    def reserve_call(self) -> bool:
+        """Count a call before it is sent if the quota allows it; False if exhausted."""
+        key, last_key = self._keys()
+        remaining = self._reserve_script(
+            keys=[key, last_key],
+            args=[self.daily_limit, QUOTA_KEY_TTL_SECONDS, datetime.now().isoformat()],
+        )
+        return remaining >= 0
+
+    def release_call(self):
+        """Give back a reserved call whose request did not complete."""
+        key, _ = self._keys()
+        self._release_script(keys=[key])
+
+    def get_remaining(self) -> int:
+        """Get number of calls remaining today."""
+        key, _ = self._keys()
+        return self.daily_limit - int(self.client.get(key) or 0)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Dict with date, calls_made, calls_remaining, daily_limit, last_call_at."""
+        key, last_key = self._keys()
+        calls_made, last_call_at = self.client.mget(key, last_key)
+        calls_made = int(calls_made or 0)
+        return {
+            "date": date.today().isoformat(),
+            "calls_made": calls_made,
+            "calls_remaining": self.daily_limit - calls_made,
+            "daily_limit": self.daily_limit,
+            "last_call_at": last_call_at.decode() if last_call_at else None,
+            "quota_file": f"redis:{key}",
+        }
+
+    def reset(self):
+        """Manually reset today's quota (for testing)."""
+        self.client.delete(*self._keys())
+        logger.info("Quota manually reset")
+
+
+# ===== Factories =====
+
+def scrape_limits(enabled: Optional[bool] = None) -> Tuple[Optional[RedisTokenBucket], Optional[RedisCircuitBreaker]]:
+    """
+    Shared rate limiter and circuit breaker for CoinFacts scraping.
+
+    Args:
+        enabled: Use Redis; defaults to config SHARED_LIMITS
+
+    Returns:
+        (bucket, breaker), or (None, None) to keep per-process limits
+    """
+    if not (SHARED_LIMITS if enabled is None else enabled):
+        return None, None
+    client = connect()
+    # One request per average polite delay, across all workers
+    rate = 2.0 / (REQUEST_DELAY_MIN + REQUEST_DELAY_MAX)
+    return RedisTokenBucket(client, 'pcgs_coinfacts', rate), RedisCircuitBreaker(client, 'pcgs_coinfacts')
+
+
+def api_rate_limiter(requests_per_second: float, enabled: Optional[bool] = None) -> Optional[RedisTokenBucket]:
+    """Shared PCGS API request rate limiter, or None for per-process spacing."""
+    if not (SHARED_LIMITS if enabled is None else enabled):
+        return None
+    return RedisTokenBucket(connect(), 'pcgs_api', requests_per_second, capacity=requests_per_second)
+
+
+def make_quota_tracker(enabled: Optional[bool] = None):
+    """RedisQuotaTracker when limits are shared, else the JSON QuotaTracker."""
+    if SHARED_LIMITS if enabled is None else enabled:
+        return RedisQuotaTracker(connect())
+    from api.quota_tracker import QuotaTracker
+    return QuotaTracker()
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Refresh Budget Simulator
+
+Replays the current price freshness of every coin (from CoinLatestPrice,
+the per-grade summary of CoinPriceGuide dates) forward N days under
+different refresh policies, concurrency levels and grade sets, and reports
+the projected freshness distribution. Nothing is fetched and no quota is
+used, so schedules can be tuned offline.
+
+Per-call behaviour is calibrated from recorded runs in the refresh run
+ledger (grades harvested per call, failure rate, cache hit rate, API
+latency); defaults are used when there is no usable history.
+
+Usage:
+    python simulate_refresh.py                                  # Default scenarios, 30 days
+    python simulate_refresh.py --days 60 --policy current fixed weekly
+    python simulate_refresh.py --budget 600 --concurrency 1 4 8
+    python simulate_refresh.py --grades MS65,MS66,PR70 --grades MS63,MS64,MS65,MS66,MS67
+    python simulate_refresh.py --daily                          # Day-by-day progression
+
+Environment:
+    DATABASE_URL: PostgreSQL connection string
+"""
+
+import argparse
+import itertools
+import math
+import random
+import sys
+import logging
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Add parent dir to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import DATABASE_URL
+from api.pcgs_api import PCGSApiClient
+from api.quota_tracker import QuotaTracker
+from refresh_prices import TARGET_GRADES
+from run_ledger import RunLedger
+
+# Database
+from sqlalchemy import create_engine, text
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+POLICIES = ('current', 'fixed', 'weekly')
+
+# Same staleness threshold as PriceRefresher.get_coins_needing_update
+REFRESH_AFTER_DAYS = 7
+
+DEFAULT_DAYS = 30
+DEFAULT_WINDOW_MINUTES = 60
+DEFAULT_LATENCY_SECONDS = 0.8
+
+
+@dataclass
+class Calibration:
+    """Per-call behaviour measured from recorded refresh runs."""
+    grades_per_call: float = 1.0
+    failure_rate: float = 0.05
+    cache_hit_rate: float = 0.0
+    latency: Optional[float] = None  # Seconds per API call
+    runs_used: int = 0
+
+
+@dataclass
+class Scenario:
+    """One combination of policy, concurrency and grade set."""
+    policy: str
+    budget: int
+    concurrency: int
+    grades: Tuple[str, ...]
+
+    @property
+    def label(self) -> str:
+        grades = ','.join(self.grades) if len(self.grades) <= 3 else f"{len(self.grades)} grades"
+        return f"{self.policy}/{self.budget} c={self.concurrency} [{grades}]"
+
+
+def load_calibration(ledger: Optional[RunLedger] = None) -> Calibration:
+    """Derive per-call rates from live (non dry-run) runs in the run ledger."""
+    calibration = Calibration()
+    ledger = ledger or RunLedger()
+    ledger.import_legacy_history()
+
+    live = [r for r in ledger.get_runs(include_dry_runs=False) if r['api_calls']]
+    if not live:
+        return calibration
+
+    api_calls = sum(r['api_calls'] for r in live)
+    updated = sum(r['coins_updated'] for r in live)
+    failed = sum(r['coins_failed'] for r in live)
+    cache_hits = sum(r['cache_hits'] for r in live)
+
+    # coins_updated counts grade rows written, coins_failed counts lookups with no data
+    calibration.grades_per_call = max(updated / api_calls, 1.0)
+    calibration.failure_rate = min(failed / api_calls, 0.95)
+    calibration.cache_hit_rate = cache_hits / (api_calls + cache_hits)
+    calibration.runs_used = len(live)
+
+    throughput = ledger.get_daily_throughput(days=30)
+    latencies = [d['avg_api_ms'] for d in throughput if d['avg_api_ms']]
+    if latencies:
+        calibration.latency = sum(latencies) / len(latencies) / 1000
+    return calibration
+
+
+def load_coin_state(engine) -> List[Dict]:
+    """Latest price date and priority tier for every coin."""
+    with engine.connect() as conn:
+        result = conn.execute(text("""
+            SELECT cr."pcgsNumber", cr."priorityTier", lp.last_update
+            FROM "CoinReference" cr
+            LEFT JOIN (
+                SELECT "coinReferenceId", MAX("priceDate") as last_update
+                FROM "CoinLatestPrice"
+                GROUP BY "coinReferenceId"
+            ) lp ON cr.id = lp."coinReferenceId"
+        """))
+        return [
+            {"pcgs_number": row[0], "priority_tier": row[1], "last_update": row[2]}
+            for row in result
+        ]
+
+
+def daily_call_budget(scenario: Scenario, day: date, calls_per_coin: int) -> int:
+    """API calls the policy would spend on a given day."""
+    if scenario.policy == 'current':
+        # PriceRefresher.calculate_daily_budget with a full quota each day. It
+        # limits coins, not calls, so the quota is the only cap on calls.
+        days_until_reset = 7 - day.weekday()
+        coin_limit = max(int(scenario.budget * 0.9) // days_until_reset, 50)
+        return min(coin_limit * calls_per_coin, scenario.budget)
+    if scenario.policy == 'weekly':
+        # Whole week's budget in one Sunday run, like tasks/weekly_refresh.py
+        return scenario.budget * 7 if day.weekday() == 6 else 0
+    return scenario.budget
+
+
+def run_capacity(scenario: Scenario, window_minutes: float, latency: float,
+                 requests_per_second: float) -> int:
+    """Most calls one run can make within its time window."""
+    calls_per_second = min(scenario.concurrency / latency, requests_per_second)
+    return int(window_minutes * 60 * calls_per_second)
+
+
+def freshness(coins: List[Dict], today: date) -> Dict:
+    """Freshness distribution for the report."""
+    ages = sorted((today - c['last_update']).days for c in coins if c['last_update'])
+    never = len(coins) - len(ages)
+    total = len(coins) or 1
+
+    def percentile(p: float) -> Optional[int]:
+        if not ages:
+            return None
+        return ages[min(len(ages) - 1, int(p * len(ages)))]
+
+    return {
+        "fresh_pct": 100 * sum(1 for a in ages if a < REFRESH_AFTER_DAYS) / total,
+        "stale_14_pct": 100 * (sum(1 for a in ages if a > 14) + never) / total,
+        "stale_30_pct": 100 * (sum(1 for a in ages if a > 30) + never) / total,
+        "never": never,
+        "p50": percentile(0.5),
+        "p90": percentile(0.9),
+        "max": ages[-1] if ages else None,
+    }
+
+
+def simulate(coins: List[Dict], scenario: Scenario, calibration: Calibration, days: int,
+             window_minutes: float, latency: float, requests_per_second: float,
+             seed: int = 0) -> List[Dict]:
+    """
+    Replay one scenario. Returns the freshness snapshot at the end of each day.
+
+    Each day the policy's budget (capped by the daily API quota and by what
+    one run can do in its window) is spent on coins in refresher order: priority tier, then
+    oldest (never priced first), skipping coins refreshed in the last week.
+    """
+    rng = random.Random(seed)
+    state = [dict(c) for c in coins]
+    calls_per_coin = max(1, math.ceil(len(scenario.grades) / calibration.grades_per_call))
+    capacity = run_capacity(scenario, window_minutes, latency, requests_per_second)
+    today = date.today()
+    snapshots = []
+
+    for offset in range(1, days + 1):
+        day = today + timedelta(days=offset)
+        budget = min(daily_call_budget(scenario, day, calls_per_coin), capacity, QuotaTracker.DAILY_LIMIT)
+        # Cache hits don't count against the budget
+        effective_calls = budget / max(1.0 - calibration.cache_hit_rate, 0.05)
+        coin_slots = int(effective_calls // calls_per_coin)
+
+        due = [c for c in state
+               if c['last_update'] is None or (day - c['last_update']).days >= REFRESH_AFTER_DAYS]
+        due.sort(key=lambda c: (
+            c['priority_tier'] if c['priority_tier'] is not None else 99,
+            c['last_update'] or date.min,
+        ))
+
+        refreshed = 0
+        for coin in due[:coin_slots]:
+            if rng.random() >= calibration.failure_rate:
+                coin['last_update'] = day
+                refreshed += 1
+
+        snapshot = freshness(state, day)
+        snapshot.update({"day": offset, "calls": budget, "refreshed": refreshed})
+        snapshots.append(snapshot)
+
+    return snapshots
+
+
+def print_results(results: List[Tuple[Scenario, List[Dict]]], coins: int,
+                  calibration: Calibration, days: int, daily: bool):
+    """Print a comparison table (and optional per-day progression)."""
+    print("\n" + "=" * 96)
+    print("        REFRESH BUDGET SIMULATION")
+    print("=" * 96)
+    print(f"Coins: {coins}   Days: {days}   Refresh after: {REFRESH_AFTER_DAYS} days")
+    source = f"{calibration.runs_used} recorded runs" if calibration.runs_used else "defaults (no live history)"
+    print(f"Calibration ({source}): {calibration.grades_per_call:.2f} grades/call, "
+          f"{calibration.failure_rate:.1%} failures, {calibration.cache_hit_rate:.1%} cache hits, "
+          f"{calibration.latency * 1000 if calibration.latency else DEFAULT_LATENCY_SECONDS * 1000:.0f} ms/call")
+
+    print(f"\n{'Scenario':<40} {'Calls/day':>9} {'Fresh%':>7} {'>14d%':>7} {'>30d%':>7} "
+          f"{'p50':>5} {'p90':>5} {'Never':>6}")
+    print("-" * 96)
+    for scenario, snapshots in results:
+        last = snapshots[-1]
+        avg_calls = sum(s['calls'] for s in snapshots) / len(snapshots)
+
+        def fmt(value):
+            return '-' if value is None else str(value)
+
+        print(f"{scenario.label:<40} {avg_calls:>9.0f} {last['fresh_pct']:>6.1f}% "
+              f"{last['stale_14_pct']:>6.1f}% {last['stale_30_pct']:>6.1f}% "
+              f"{fmt(last['p50']):>5} {fmt(last['p90']):>5} {last['never']:>6}")
+
+        if daily:
+            for s in snapshots:
+                print(f"    day {s['day']:>3}: {s['calls']:>5} calls, {s['refreshed']:>5} refreshed, "
+                      f"{s['fresh_pct']:5.1f}% fresh, {s['never']} never priced")
+    print("=" * 96 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Refresh Budget Simulator - Project price freshness under different policies',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Policies:
+  current   PriceRefresher.calculate_daily_budget (weekly spread, >= 50/day)
+  fixed     --budget calls every day (e.g. trickle_daemon.py)
+  weekly    7 x --budget calls in one Sunday run (tasks/weekly_refresh.py)
+
+Examples:
+  python simulate_refresh.py --days 60
+  python simulate_refresh.py --policy fixed --budget 400 800 --concurrency 1 4
+  python simulate_refresh.py --grades MS65,PR70 --grades MS63,MS64,MS65,MS66,MS67,PR69,PR70
+        """
+    )
+
+    parser.add_argument('--days', type=int, default=DEFAULT_DAYS,
+                        help=f'Days to simulate (default: {DEFAULT_DAYS})')
+    parser.add_argument('--policy', nargs='+', choices=POLICIES, default=['current', 'fixed'],
+                        help='Budget policies to compare (default: current fixed)')
+    parser.add_argument('--budget', type=int, nargs='+', default=[QuotaTracker.DAILY_LIMIT],
+                        help=f'Daily API call budget(s) (default: {QuotaTracker.DAILY_LIMIT})')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[PCGSApiClient.DEFAULT_CONCURRENCY],
+                        help=f'Concurrency levels (default: {PCGSApiClient.DEFAULT_CONCURRENCY})')
+    parser.add_argument('--grades', action='append',
+                        help=f'Comma-separated grade set; repeat to compare (default: {",".join(TARGET_GRADES)})')
+    parser.add_argument('--rate', type=float, default=PCGSApiClient.DEFAULT_REQUESTS_PER_SECOND,
+                        help=f'Max API requests per second (default: {PCGSApiClient.DEFAULT_REQUESTS_PER_SECOND})')
+    parser.add_argument('--latency', type=float,
+                        help=f'Seconds per API call (default: measured, else {DEFAULT_LATENCY_SECONDS})')
+    parser.add_argument('--window', type=float, default=DEFAULT_WINDOW_MINUTES,
+                        help=f'Minutes one daily run may take (default: {DEFAULT_WINDOW_MINUTES})')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Random seed for simulated failures')
+    parser.add_argument('--daily', action='store_true',
+                        help='Show day-by-day progression for each scenario')
+
+    args = parser.parse_args()
+
+    grade_sets = [tuple(g.strip().upper() for g in s.split(',') if g.strip()) for s in (args.grades or [])]
+    grade_sets = grade_sets or [tuple(TARGET_GRADES)]
+
+    scenarios = [
+        Scenario(policy, budget, concurrency, grades)
+        for policy, budget, concurrency, grades
+        in itertools.product(args.policy, args.budget, args.concurrency, grade_sets)
+    ]
+
+    engine = create_engine(DATABASE_URL)
+    coins = load_coin_state(engine)
+    if not coins:
+        print("No coins in CoinReference - nothing to simulate.")
+        return
+
+    calibration = load_calibration()
+    latency = args.latency or calibration.latency or DEFAULT_LATENCY_SECONDS
+    results = [
+        (scenario, simulate(coins, scenario, calibration, args.days,
+                            args.window, latency, args.rate, seed=args.seed))
+        for scenario in scenarios
+    ]
+    print_results(results, len(coins), calibration, args.days, args.daily)
+
+
+if __name__ == '__main__':
+    main()
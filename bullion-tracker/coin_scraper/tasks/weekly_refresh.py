@@ -1,26 +1,147 @@
-"""Celery task for weekly price refresh"""
+"""
+Celery tasks for the weekly price refresh
 
-from celery import Celery
+refresh_all_prices is a coordinator: it registers one chunk per configured
+series in the progress tracker and fans them out as a chord of
+refresh_series subtasks, so the refresh runs on every available worker and
+a failure only retries its own series. Chunk status is keyed by run
+(weekly-<ISO year>-W<week>), so re-running the coordinator for the same
+week only enqueues chunks that haven't completed.
+
+Workers share the progress tracker's SQLite file (data/scrape_progress.db),
+so run them on one host or on a shared volume. Coins listed under several
+series are claimed there per run, so each is fetched by one chunk only.
+
+The scraper logs and carries on past fetch errors, so a chunk whose
+category page yielded no coins, or whose coins mostly failed, counts as
+failed and is retried rather than completed.
+
+Each chunk holds the run-overlap lock (run_lock.py) in shared mode: chunks
+run side by side, but wait while a manual or cron run holds it exclusively.
+A chunk whose lock connection dropped mid-series is retried, not completed.
+"""
+
+from celery import Celery, chord
 from celery.schedules import crontab
 import asyncio
+from datetime import date
 import sys
 sys.path.append('..')
 
+from config import COIN_SERIES, REDIS_URL
 from database import SessionLocal
+from run_lock import RunLock, format_holders
 from scrapers.pcgs_scraper import run_scraper
+from scrapers.progress_tracker import ProgressTracker, SeenCoins
+
+app = Celery('coin_scraper', broker=REDIS_URL, backend=REDIS_URL)
+
+# A worker that dies mid-series hands the chunk back to the broker
+app.conf.task_acks_late = True
+app.conf.task_reject_on_worker_lost = True
+app.conf.worker_prefetch_multiplier = 1
+
+CHUNK_MAX_RETRIES = 3  # Retries after errors; waiting for the run lock doesn't count
+CHUNK_MAX_FAILURE_RATE = 0.2  # Share of fetched coins that may fail before the chunk is retried
+LOCK_RETRY_SECONDS = 300  # While another entry point holds the run lock
+LOCK_MAX_WAITS = 288  # Give up waiting for the run lock after a day
+
+
+def weekly_run_key(day: date = None) -> str:
+    """Run key for the ISO week containing day (default today)."""
+    year, week, _ = (day or date.today()).isocalendar()
+    return f"weekly-{year}-W{week:02d}"
+
+
+class ChunkFailed(Exception):
+    """The scraper finished a series without usable results."""
+
+
+def check_chunk(stats: dict):
+    """Raise ChunkFailed if a series run's stats show its fetches failed."""
+    if stats['coins_listed'] == 0:
+        raise ChunkFailed("category page returned no coins")
+    attempted = stats['coins_scraped'] + stats['coins_unchanged'] + stats['coins_failed']
+    if attempted and stats['coins_failed'] / attempted > CHUNK_MAX_FAILURE_RATE:
+        raise ChunkFailed(f"{stats['coins_failed']} of {attempted} coins failed")
 
-app = Celery('coin_scraper', broker='redis://localhost:6379/0')
 
 @app.task
-def refresh_all_prices():
-    """Run every Sunday at 2 AM"""
-    db = SessionLocal()
+def refresh_all_prices(run_key: str = None):
+    """Run every Sunday at 2 AM: fan out one refresh_series task per pending series."""
+    run_key = run_key or weekly_run_key()
+    tracker = ProgressTracker()
+    pending = tracker.register_chunks(run_key, [series['slug'] for series in COIN_SERIES])
+    if not pending:
+        return f"{run_key}: all series already refreshed"
+
+    chord(refresh_series.s(run_key, slug) for slug in pending)(summarize_refresh.s(run_key))
+    return f"{run_key}: enqueued {len(pending)} series"
+
+
+@app.task(bind=True, max_retries=None)
+def refresh_series(self, run_key: str, slug: str, errors: int = 0, lock_waits: int = 0):
+    """
+    Refresh one series; idempotent per run_key (a completed series is skipped).
+
+    Retries are counted here rather than by Celery, so waiting for the run
+    lock and retrying after errors have separate limits; errors and
+    lock_waits are only passed by those retries.
+    """
+    tracker = ProgressTracker()
+    lock = RunLock(f"weekly_refresh {run_key} {slug}", shared=True)
+    if not lock.try_acquire():
+        # An exclusive run (cron or manual) is in progress: check back later
+        if lock_waits < LOCK_MAX_WAITS:
+            raise self.retry(countdown=LOCK_RETRY_SECONDS,
+                             kwargs={'errors': errors, 'lock_waits': lock_waits + 1})
+        error = f"run lock held by {format_holders(lock.holders())}"
+        tracker.fail_chunk(run_key, slug, error)
+        return {'slug': slug, 'status': 'failed', 'error': error}
 
     try:
-        stats = asyncio.run(run_scraper(db))
-        return f"Refreshed {stats['prices_scraped']} prices for {stats['coins_scraped']} coins"
+        if not tracker.start_chunk(run_key, slug):
+            return {'slug': slug, 'status': 'skipped'}
+
+        db = SessionLocal()
+        try:
+            # Workers share one request rate and circuit breaker through Redis
+            seen_coins = SeenCoins(tracker, run_key=run_key)
+            stats = asyncio.run(run_scraper(db, series_filter=slug, shared_limits=True,
+                                            seen_coins=seen_coins))
+            # Don't record the chunk if an exclusive run may have overlapped it
+            lock.ensure_held()
+            check_chunk(stats)
+        except Exception as e:
+            db.rollback()
+            tracker.fail_chunk(run_key, slug, str(e))
+            if errors < CHUNK_MAX_RETRIES:
+                raise self.retry(exc=e, countdown=60 * 2 ** errors,
+                                 kwargs={'errors': errors + 1, 'lock_waits': lock_waits})
+            # Out of retries: let the chord finish; the next coordinator
+            # run for this week picks the series up again
+            return {'slug': slug, 'status': 'failed', 'error': str(e)}
+        finally:
+            db.close()
     finally:
-        db.close()
+        lock.release()
+
+    tracker.complete_chunk(run_key, slug, stats['coins_scraped'], stats['coins_failed'],
+                           stats['prices_scraped'])
+    return {'slug': slug, 'status': 'completed'}
+
+
+@app.task
+def summarize_refresh(results, run_key: str):
+    """Chord callback: totals for the whole run from the progress tracker."""
+    summary = ProgressTracker().get_chunk_summary(run_key)
+    message = (f"{run_key}: refreshed {summary['prices_scraped']} prices for "
+               f"{summary['coins_scraped']} coins ({summary['completed']} series done, "
+               f"{summary['failed']} failed)")
+    if summary['failed']:
+        message += f" - re-run refresh_all_prices('{run_key}') to retry failed series"
+    return message
+
 
 # Celery beat schedule
 app.conf.beat_schedule = {
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Modules import each other flat (from config import ...), as when run from coin_scraper/
+sys.path.insert(0, str(Path(__file__).parent.parent))
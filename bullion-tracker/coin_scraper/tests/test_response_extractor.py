@@ -0,0 +1,60 @@
+from datetime import date
+from decimal import Decimal
+
+from api.response_extractor import extract_coin_facts, extract_auction_records
+
+
+MIXED_PAYLOAD = {
+    'PCGSNo': 9959,
+    'Name': '1986 $1 Silver Eagle',
+    'Grade': 'MS65',
+    'PriceGuideValue': 150,
+    'Population': 1200,
+    'AuctionList': [
+        {'SaleDate': '2026-09-01', 'Price': 95, 'Grade': 'MS65', 'AuctionHouse': 'Heritage', 'LotNo': '101'},
+        {'SaleDate': '2026-08-15', 'Price': 40, 'Grade': 'MS63', 'AuctionHouse': 'Stack\'s', 'LotNo': '7'},
+    ],
+}
+
+
+def test_auction_lots_are_not_price_guide_values():
+    facts = extract_coin_facts(MIXED_PAYLOAD, requested_grade='MS65')
+
+    assert facts.prices == {'MS65': Decimal('150')}
+    assert facts.populations == {'MS65': 1200}
+
+
+def test_lots_with_sale_date_outside_auction_container_are_skipped():
+    payload = {
+        'PCGSNo': 9959,
+        'Grade': 'MS65',
+        'PriceGuideValue': 150,
+        'RecentSales': [{'SaleDate': '2026-09-01', 'Price': 95, 'Grade': 'MS63'}],
+    }
+
+    assert extract_coin_facts(payload).prices == {'MS65': Decimal('150')}
+
+
+def test_nested_records_do_not_overwrite_top_level_grade():
+    payload = {
+        'PCGSNo': 9959,
+        'Grade': 'MS65',
+        'PriceGuideValue': 150,
+        'PriceGuide': [
+            {'Grade': 'MS65', 'Price': 140},
+            {'Grade': 'MS66', 'Price': 210},
+        ],
+    }
+
+    facts = extract_coin_facts(payload)
+
+    assert facts.prices == {'MS65': Decimal('150'), 'MS66': Decimal('210')}
+
+
+def test_auction_records_still_extracted_from_mixed_payload():
+    records = extract_auction_records(MIXED_PAYLOAD, 9959)
+
+    assert [(r.sale_date, r.price, r.grade) for r in records] == [
+        (date(2026, 8, 15), Decimal('40'), 'MS63'),
+        (date(2026, 9, 1), Decimal('95'), 'MS65'),
+    ]
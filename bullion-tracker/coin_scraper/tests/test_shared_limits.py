@@ -0,0 +1,61 @@
+import time
+
+import pytest
+
+fakeredis = pytest.importorskip('fakeredis')
+pytest.importorskip('lupa')  # fakeredis needs it to run Lua scripts
+
+from shared_limits import RedisCircuitBreaker, RedisQuotaTracker, RedisTokenBucket
+
+
+@pytest.fixture
+def client():
+    return fakeredis.FakeRedis()
+
+
+def test_breaker_rearms_after_failed_half_open_attempt(client):
+    breaker = RedisCircuitBreaker(client, 'test', failure_threshold=2,
+                                  reset_timeout_seconds=0.2, half_open_max_attempts=1)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.is_open
+    assert not breaker.can_attempt()
+
+    time.sleep(0.25)
+    assert breaker.can_attempt()  # half-open
+    assert not breaker.can_attempt()  # half-open attempts used up
+
+    breaker.record_failure()  # the half-open attempt failed
+    assert not breaker.can_attempt()  # reset timeout restarted
+    time.sleep(0.25)
+    assert breaker.can_attempt()  # half-open again
+
+    breaker.record_success()
+    assert not breaker.is_open
+    assert breaker.can_attempt()
+
+
+def test_breaker_state_expires(client):
+    breaker = RedisCircuitBreaker(client, 'test', failure_threshold=1)
+    breaker.record_failure()
+
+    assert client.ttl(breaker.key) > 0
+
+
+def test_token_bucket_spaces_requests(client):
+    bucket = RedisTokenBucket(client, 'test', rate=10.0)
+
+    assert bucket.try_acquire() == 0.0
+    assert 0.0 < bucket.try_acquire() <= 0.1
+
+
+def test_quota_reserve_stops_at_limit(client):
+    quota = RedisQuotaTracker(client, daily_limit=2)
+
+    assert quota.reserve_call()
+    assert quota.reserve_call()
+    assert not quota.reserve_call()
+    assert quota.get_remaining() == 0
+
+    quota.release_call()
+    assert quota.get_remaining() == 1
@@ -0,0 +1,616 @@
+#!/usr/bin/env python3
+"""
+Trickle Refresh Daemon
+
+Long-running alternative to the weekly batch refresh. Instead of spending
+the whole API quota and scrape run in one burst, the daemon spreads each
+daily budget evenly over 24 hours with a token bucket per lane:
+
+- api:    PCGS API price refresh (PriceRefresher), most stale coin first
+- scrape: CoinFacts detail re-scrape (PCGSScraper), least recently scraped first
+
+Each tick takes the next most-stale coin, refreshes it, and charges the
+bucket for the work actually done (API calls served from the response
+cache are free). Bucket levels and recent attempts are persisted in
+data/trickle_state.db so a restart neither bursts nor repeats work, and a
+status snapshot is written to logs/trickle_status.json after every tick.
+
+The daemon doesn't hold the batch run lock (run_lock.py), which would keep
+cron and manual refreshes out for as long as it runs. It takes its own
+lock so only one daemon runs, and its lanes pause while a batch refresh
+holds the run lock.
+
+Usage:
+    python trickle_daemon.py                          # Run both lanes
+    python trickle_daemon.py --lanes api              # API lane only
+    python trickle_daemon.py --api-budget 600         # 600 API calls/day
+    python trickle_daemon.py --status                 # Show status snapshot
+
+Environment:
+    DATABASE_URL: PostgreSQL connection string
+    PCGS_USERNAME: PCGS API credentials
+    PCGS_PASSWORD: PCGS API credentials
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sqlite3
+import sys
+import time
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
+
+# Add parent dir to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import DATABASE_URL, COIN_SERIES
+from api.pcgs_api import PCGSApiClient, QuotaExceededError
+from api.quota_tracker import QuotaTracker
+from shared_limits import make_quota_tracker, api_rate_limiter
+from run_lock import RunLock, add_lock_arguments, acquire_for_cli, lock_status, format_holders
+
+# Database
+from sqlalchemy import create_engine, text
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Paths
+DATA_DIR = Path(__file__).parent / "data"
+LOGS_DIR = Path(__file__).parent / "logs"
+STATE_FILE = DATA_DIR / "trickle_state.db"
+STATUS_FILE = LOGS_DIR / "trickle_status.json"
+
+SECONDS_PER_DAY = 86400
+
+# Leave 20% of the API quota for manual runs and auction ingestion
+DEFAULT_API_BUDGET = int(QuotaTracker.DAILY_LIMIT * 0.8)
+# Re-scrape every configured coin once a week
+DEFAULT_SCRAPE_BUDGET = sum(s.get('est_coins', 0) for s in COIN_SERIES) // 7
+
+DEFAULT_BURST_SECONDS = 900      # Bucket holds at most 15 minutes of budget
+DEFAULT_RETRY_AFTER_HOURS = 6    # Don't retry a coin attempted this recently
+IDLE_SLEEP_SECONDS = 300         # Sleep when nothing is stale
+DAEMON_LOCK_NAME = "trickle_daemon"  # Keeps a second daemon from starting
+
+LANES = ('api', 'scrape')
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at budget/day.
+
+    Work waits until at least one token is available, then is charged its
+    actual cost, which may leave the bucket in debt (negative) until it
+    refills. Capacity bounds the burst after an idle period or a restart.
+    """
+
+    def __init__(self, name: str, per_day: float, burst_seconds: float = DEFAULT_BURST_SECONDS,
+                 tokens: Optional[float] = None, updated_at: Optional[float] = None):
+        self.name = name
+        self.per_day = per_day
+        self.rate = per_day / SECONDS_PER_DAY
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        # Start with a single token so startup doesn't burst
+        self.tokens = min(self.capacity, 1.0 if tokens is None else tokens)
+        self.updated_at = updated_at or time.time()
+        self._refill()
+
+    def _refill(self):
+        now = time.time()
+        elapsed = max(0.0, now - self.updated_at)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+    def seconds_until_available(self, amount: float = 1.0) -> float:
+        """Seconds until the bucket holds at least amount tokens."""
+        self._refill()
+        if self.tokens >= amount:
+            return 0.0
+        if self.rate <= 0:
+            return float('inf')
+        return (amount - self.tokens) / self.rate
+
+    def charge(self, amount: float):
+        """Spend tokens for work already done (may go negative)."""
+        self._refill()
+        self.tokens -= amount
+
+    def snapshot(self) -> Dict:
+        """Current level for the status file."""
+        self._refill()
+        return {
+            "budget_per_day": self.per_day,
+            "tokens": round(self.tokens, 3),
+            "capacity": round(self.capacity, 3),
+            "next_token_in": round(self.seconds_until_available(), 1),
+        }
+
+
+class TrickleState:
+    """
+    SQLite-backed daemon state: bucket levels and per-coin attempts.
+
+    Enables restart without a burst (bucket levels) and without re-picking
+    coins that just failed (attempt times).
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        """
+        Initialize daemon state.
+
+        Args:
+            db_path: Path to SQLite file. Defaults to data/trickle_state.db
+        """
+        self.db_path = Path(db_path or STATE_FILE)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_db()
+
+    def _init_db(self):
+        """Initialize database schema."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS buckets (
+                    name TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS attempts (
+                    lane TEXT NOT NULL,
+                    pcgs_number INTEGER NOT NULL,
+                    attempted_at TIMESTAMP NOT NULL,
+                    success INTEGER NOT NULL,
+                    PRIMARY KEY (lane, pcgs_number)
+                )
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_attempts_time
+                ON attempts(lane, attempted_at)
+            """)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """Get a database connection with row factory."""
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def load_bucket(self, name: str, per_day: float,
+                    burst_seconds: float = DEFAULT_BURST_SECONDS) -> TokenBucket:
+        """Restore a bucket, refilled for the time the daemon was down."""
+        conn = self._get_conn()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT tokens, updated_at FROM buckets WHERE name = ?", (name,))
+            row = cursor.fetchone()
+        finally:
+            conn.close()
+
+        if row:
+            return TokenBucket(name, per_day, burst_seconds, row['tokens'], row['updated_at'])
+        return TokenBucket(name, per_day, burst_seconds)
+
+    def save_bucket(self, bucket: TokenBucket):
+        """Persist a bucket's level."""
+        conn = self._get_conn()
+        try:
+            conn.execute("""
+                INSERT INTO buckets (name, tokens, updated_at) VALUES (?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET
+                    tokens = excluded.tokens,
+                    updated_at = excluded.updated_at
+            """, (bucket.name, bucket.tokens, bucket.updated_at))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def record_attempt(self, lane: str, pcgs_number: int, success: bool):
+        """Record that a coin was attempted in a lane."""
+        conn = self._get_conn()
+        try:
+            conn.execute("""
+                INSERT INTO attempts (lane, pcgs_number, attempted_at, success) VALUES (?, ?, ?, ?)
+                ON CONFLICT(lane, pcgs_number) DO UPDATE SET
+                    attempted_at = excluded.attempted_at,
+                    success = excluded.success
+            """, (lane, pcgs_number, datetime.now(), int(success)))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def recent_attempts(self, lane: str, since: datetime) -> Set[int]:
+        """PCGS numbers attempted in a lane since a time."""
+        conn = self._get_conn()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT pcgs_number FROM attempts WHERE lane = ? AND attempted_at >= ?",
+                (lane, since)
+            )
+            return {row['pcgs_number'] for row in cursor.fetchall()}
+        finally:
+            conn.close()
+
+
+class TrickleDaemon:
+    """Runs the refresh lanes continuously within their daily budgets."""
+
+    def __init__(self, lanes: List[str], api_budget: int = DEFAULT_API_BUDGET,
+                 scrape_budget: int = DEFAULT_SCRAPE_BUDGET,
+                 burst_seconds: float = DEFAULT_BURST_SECONDS,
+                 retry_after_hours: float = DEFAULT_RETRY_AFTER_HOURS,
+                 status_file: Path = STATUS_FILE):
+        self.lanes = lanes
+        self.retry_after = timedelta(hours=retry_after_hours)
+        self.status_file = Path(status_file)
+        self.state = TrickleState()
+        self.quota_tracker = make_quota_tracker()
+        self.run_lock = RunLock("trickle_daemon")  # Only inspected: lanes pause while it's held
+        self.started_at = datetime.now()
+        self._stop = asyncio.Event()
+
+        budgets = {'api': api_budget, 'scrape': scrape_budget}
+        self.buckets = {
+            lane: self.state.load_bucket(lane, budgets[lane], burst_seconds)
+            for lane in lanes
+        }
+        self.lane_stats = {
+            lane: {"succeeded": 0, "failed": 0, "last_item": None, "last_at": None, "state": "starting"}
+            for lane in lanes
+        }
+
+    def stop(self):
+        """Ask all lanes to finish their current item and exit."""
+        logger.info("Stop requested, finishing current items...")
+        self._stop.set()
+
+    async def _sleep(self, seconds: float) -> bool:
+        """Sleep unless stopped. Returns False if the daemon is stopping."""
+        try:
+            await asyncio.wait_for(self._stop.wait(), timeout=seconds)
+            return False
+        except asyncio.TimeoutError:
+            return True
+
+    async def _wait_for_token(self, lane: str) -> bool:
+        """Block until the lane's bucket has a token. Returns False on stop."""
+        bucket = self.buckets[lane]
+        while not self._stop.is_set():
+            wait = bucket.seconds_until_available()
+            if wait <= 0:
+                return True
+            self.lane_stats[lane]["state"] = "waiting"
+            self.write_status()
+            if not await self._sleep(min(wait, IDLE_SLEEP_SECONDS)):
+                return False
+        return False
+
+    async def _wait_for_run_lock(self, lane: str) -> bool:
+        """Pause the lane while a batch refresh holds the run lock. Returns False on stop."""
+        logged = False
+        while not self._stop.is_set():
+            try:
+                holders = self.run_lock.holders()
+            except Exception as e:
+                logger.warning(f"Could not check the run lock: {e}")
+                return True
+            if not holders:
+                return True
+            if not logged:
+                logger.info(f"[{lane}] Paused while {format_holders(holders)} holds the run lock")
+                logged = True
+            self.lane_stats[lane]["state"] = "paused"
+            self.write_status()
+            if not await self._sleep(IDLE_SLEEP_SECONDS):
+                return False
+        return False
+
+    def _finish_item(self, lane: str, pcgs_number: int, success: bool, cost: float):
+        """Charge the bucket and record the attempt."""
+        bucket = self.buckets[lane]
+        bucket.charge(cost)
+        self.state.save_bucket(bucket)
+        self.state.record_attempt(lane, pcgs_number, success)
+
+        stats = self.lane_stats[lane]
+        stats["succeeded" if success else "failed"] += 1
+        stats["last_item"] = pcgs_number
+        stats["last_at"] = datetime.now().isoformat()
+        self.write_status()
+
+    def _pick(self, lane: str, fetch: Callable[[List[int]], List[Dict]]) -> Optional[Dict]:
+        """
+        Most stale coin not attempted within retry_after.
+
+        Recent attempts are excluded in the query itself: coins that keep
+        failing never get fresher, so filtering a fixed top-N afterwards
+        would leave the lane idle behind them.
+        """
+        recent = sorted(self.state.recent_attempts(lane, datetime.now() - self.retry_after))
+        candidates = fetch(recent)
+        return candidates[0] if candidates else None
+
+    # ===== API lane =====
+
+    async def _api_lane(self, engine):
+        """Refresh the most stale coin's prices each time a token is available."""
+        from refresh_prices import PriceRefresher
+
+        refresher = PriceRefresher(concurrency=1)
+        refresher.run_id = refresher.ledger.start_run(priority_filter="trickle")
+        async with PCGSApiClient(quota_tracker=self.quota_tracker, max_concurrency=1,
+                                 rate_limiter=api_rate_limiter(PCGSApiClient.DEFAULT_REQUESTS_PER_SECOND)) as client:
+            await client.authenticate()
+            try:
+                await self._api_loop(engine, refresher, client)
+            finally:
+                refresher.api_calls_made = client.get_stats()['api_calls']
+                refresher._save_history()
+
+    async def _api_loop(self, engine, refresher, client):
+        """Token-paced loop for the API lane; lookups are recorded in the run ledger."""
+        while await self._wait_for_token('api'):
+            if not await self._wait_for_run_lock('api'):
+                break
+            if self.quota_tracker.get_remaining() <= 0:
+                tomorrow = datetime.combine(datetime.now().date() + timedelta(days=1), datetime.min.time())
+                logger.info(f"API quota exhausted, api lane sleeping until {tomorrow}")
+                self.lane_stats['api']["state"] = "quota_exhausted"
+                self.write_status()
+                if not await self._sleep((tomorrow - datetime.now()).total_seconds() + 60):
+                    break
+                continue
+
+            coin = self._pick('api', lambda recent: refresher.get_coins_needing_update(
+                engine, 1, exclude=recent))
+            if not coin:
+                self.lane_stats['api']["state"] = "idle"
+                self.write_status()
+                if not await self._sleep(IDLE_SLEEP_SECONDS):
+                    break
+                continue
+
+            self.lane_stats['api']["state"] = "working"
+            calls_before = client.get_stats()['api_calls']
+            updated_before = refresher.coins_updated
+            try:
+                await refresher.refresh_prices(engine, [coin], client)
+            except QuotaExceededError:
+                pass
+            except Exception as e:
+                logger.error(f"API refresh failed for PCGS#{coin['pcgs_number']}: {e}")
+
+            cost = client.get_stats()['api_calls'] - calls_before
+            success = refresher.coins_updated > updated_before
+            logger.info(f"[api] PCGS#{coin['pcgs_number']} {coin['full_name']}: "
+                        f"{'updated' if success else 'no data'} ({cost} calls)")
+            self._finish_item('api', coin['pcgs_number'], success, cost)
+
+    # ===== Scrape lane =====
+
+    def _scrape_candidates(self, engine, exclude: List[int], limit: int = 1) -> List[Dict]:
+        """Coins ordered by priority tier, least recently fetched (lastVerifiedAt) first."""
+        params = {"limit": limit}
+        exclude_filter = ""
+        if exclude:
+            exclude_filter = 'AND NOT ("pcgsNumber" = ANY(:exclude))'
+            params["exclude"] = list(exclude)
+
+        with engine.connect() as conn:
+            result = conn.execute(text(f"""
+                SELECT "pcgsNumber", year, "mintMark", denomination, series, variety, mintage,
+                       "fullName", "contentHash"
+                FROM "CoinReference"
+                WHERE COALESCE("lastVerifiedAt", "updatedAt") < NOW() - INTERVAL '7 days'
+                    {exclude_filter}
+                ORDER BY "priorityTier" ASC NULLS LAST, COALESCE("lastVerifiedAt", "updatedAt") ASC
+                LIMIT :limit
+            """), params)
+            return [{
+                'pcgs_number': row[0],
+                'year': row[1],
+                'mint_mark': row[2],
+                'denomination': row[3],
+                'series': row[4],
+                'variety': row[5],
+                'mintage': row[6],
+                'full_name': row[7],
+                'content_hash': row[8],
+            } for row in result]
+
+    async def _scrape_lane(self, engine):
+        """Re-scrape the least recently scraped coin each time a token is available."""
+        from database import SessionLocal
+        from scrapers.pcgs_scraper import PCGSScraper
+
+        db = SessionLocal()
+        scraper = PCGSScraper(db)
+        try:
+            while await self._wait_for_token('scrape'):
+                if not await self._wait_for_run_lock('scrape'):
+                    break
+                coin = self._pick('scrape', lambda recent: self._scrape_candidates(engine, recent))
+                if not coin:
+                    self.lane_stats['scrape']["state"] = "idle"
+                    self.write_status()
+                    if not await self._sleep(IDLE_SLEEP_SECONDS):
+                        break
+                    continue
+
+                self.lane_stats['scrape']["state"] = "working"
+                try:
+                    success = await scraper.refresh_coin(coin)
+                except Exception as e:
+                    logger.error(f"Scrape failed for PCGS#{coin['pcgs_number']}: {e}")
+                    db.rollback()
+                    success = False
+
+                logger.info(f"[scrape] PCGS#{coin['pcgs_number']} {coin['full_name']}: "
+                            f"{'saved' if success else 'failed'}")
+                self._finish_item('scrape', coin['pcgs_number'], success, 1)
+        finally:
+            await scraper.close()
+            db.close()
+
+    # ===== Status =====
+
+    def write_status(self):
+        """Atomically write the status snapshot."""
+        status = {
+            "pid": os.getpid(),
+            "started_at": self.started_at.isoformat(),
+            "updated_at": datetime.now().isoformat(),
+            "lanes": {
+                lane: {**self.buckets[lane].snapshot(), **self.lane_stats[lane]}
+                for lane in self.lanes
+            },
+            "quota": self.quota_tracker.get_status(),
+        }
+        self.status_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.status_file.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(status, f, indent=2, default=str)
+        os.replace(tmp_path, self.status_file)
+
+    async def run(self):
+        """Run all lanes until stopped (SIGINT/SIGTERM)."""
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self.stop)
+
+        engine = create_engine(DATABASE_URL)
+        for lane in self.lanes:
+            bucket = self.buckets[lane]
+            logger.info(f"Lane {lane}: {bucket.per_day}/day "
+                        f"(one item every {SECONDS_PER_DAY / max(bucket.per_day, 1):.0f}s)")
+        self.write_status()
+
+        runners = {'api': self._api_lane, 'scrape': self._scrape_lane}
+        results = await asyncio.gather(
+            *(runners[lane](engine) for lane in self.lanes),
+            return_exceptions=True,
+        )
+        for lane, result in zip(self.lanes, results):
+            if isinstance(result, Exception):
+                logger.error(f"Lane {lane} stopped with error: {result}")
+                self.lane_stats[lane]["state"] = f"error: {result}"
+            else:
+                self.lane_stats[lane]["state"] = "stopped"
+
+        for bucket in self.buckets.values():
+            self.state.save_bucket(bucket)
+        self.write_status()
+        logger.info("Trickle daemon stopped")
+
+
+def show_status(status_file: Path = STATUS_FILE):
+    """Print the last status snapshot."""
+    if not status_file.exists():
+        print("\nNo status file found. Is the daemon running?")
+        print(lock_status(DAEMON_LOCK_NAME))
+        print(lock_status())
+        return
+
+    with open(status_file, 'r') as f:
+        status = json.load(f)
+
+    updated_at = datetime.fromisoformat(status['updated_at'])
+    age = datetime.now() - updated_at
+
+    print("\n" + "=" * 50)
+    print("        TRICKLE DAEMON STATUS")
+    print("=" * 50)
+    print(f"PID: {status['pid']}  (started {status['started_at']})")
+    print(f"Last update: {status['updated_at']} ({int(age.total_seconds())}s ago)")
+    if age > timedelta(seconds=IDLE_SLEEP_SECONDS * 2):
+        print("⚠️  Status is stale - daemon may not be running")
+
+    for lane, info in status['lanes'].items():
+        print(f"\n--- Lane: {lane} ---")
+        print(f"State: {info['state']}")
+        print(f"Budget: {info['budget_per_day']}/day")
+        print(f"Tokens: {info['tokens']}/{info['capacity']} (next in {info['next_token_in']}s)")
+        print(f"Succeeded: {info['succeeded']}  Failed: {info['failed']}")
+        if info['last_item']:
+            print(f"Last item: PCGS#{info['last_item']} at {info['last_at']}")
+
+    quota = status['quota']
+    print("\n--- API Quota ---")
+    print(f"Calls today: {quota['calls_made']}/{quota['daily_limit']}")
+    print(f"\n{lock_status(DAEMON_LOCK_NAME)}")
+    print(lock_status())
+    print("=" * 50 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Trickle Daemon - Continuous, evenly spread price refresh',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=f"""
+Examples:
+  python trickle_daemon.py                        Run API and scrape lanes
+  python trickle_daemon.py --lanes api            API price refresh only
+  python trickle_daemon.py --api-budget 600       Spread 600 API calls over 24h
+  python trickle_daemon.py --scrape-budget 2000   Spread 2000 page scrapes over 24h
+  python trickle_daemon.py --status               Show last status snapshot
+
+Defaults: {DEFAULT_API_BUDGET} API calls/day, {DEFAULT_SCRAPE_BUDGET} scrapes/day
+        """
+    )
+
+    parser.add_argument('--status', action='store_true',
+                        help='Show the daemon status snapshot and exit')
+    parser.add_argument('--lanes', nargs='+', choices=LANES, default=list(LANES),
+                        help='Lanes to run (default: api scrape)')
+    parser.add_argument('--api-budget', type=int, default=DEFAULT_API_BUDGET,
+                        help=f'API calls per day (default: {DEFAULT_API_BUDGET})')
+    parser.add_argument('--scrape-budget', type=int, default=DEFAULT_SCRAPE_BUDGET,
+                        help=f'Detail page scrapes per day (default: {DEFAULT_SCRAPE_BUDGET})')
+    parser.add_argument('--burst-seconds', type=float, default=DEFAULT_BURST_SECONDS,
+                        help=f'Max budget banked while idle, in seconds (default: {DEFAULT_BURST_SECONDS})')
+    parser.add_argument('--retry-after-hours', type=float, default=DEFAULT_RETRY_AFTER_HOURS,
+                        help=f'Hours before retrying a coin (default: {DEFAULT_RETRY_AFTER_HOURS})')
+    parser.add_argument('--debug', action='store_true',
+                        help='Enable debug logging')
+    add_lock_arguments(parser)
+
+    args = parser.parse_args()
+
+    if args.debug:
+        logging.getLogger().setLevel(logging.DEBUG)
+
+    if args.status:
+        show_status()
+        return
+
+    # Single instance; batch refreshes use the run lock and aren't kept out
+    lock = acquire_for_cli("trickle_daemon", args, name=DAEMON_LOCK_NAME)
+    daemon = TrickleDaemon(
+        lanes=args.lanes,
+        api_budget=args.api_budget,
+        scrape_budget=args.scrape_budget,
+        burst_seconds=args.burst_seconds,
+        retry_after_hours=args.retry_after_hours,
+    )
+    try:
+        asyncio.run(daemon.run())
+    finally:
+        lock.release()
+
+
+if __name__ == '__main__':
+    main()
@@ -11,15 +11,28 @@ Usage:
     python validate_data.py --series "Morgan"   # Validate specific series
     python validate_data.py --export FILE       # Export report to markdown
     python validate_data.py --fix               # Auto-fix where possible
+    python validate_data.py --fix --fix-batch-size 200 --fix-pause 0.5
+    python validate_data.py --chunk-size 5000   # Rows fetched per cursor batch
+    python validate_data.py --report --full     # Ignore cached results, revalidate all
+    python validate_data.py --report --workers 8  # Full audit across 8 processes
+    python validate_data.py --report --prices   # Also scan prices for anomalies
+
+Results are cached per coin in data/validation_cache.db. Catalog-wide runs only
+revalidate coins whose updatedAt is at or after the last run's watermark.
+--workers runs a full audit (no cache) with one task per series in a process
+pool; per-series reports are merged in series order, so output is stable.
 """
 
 import os
 import sys
+import time
 import argparse
 import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Set, Any
 from dataclasses import dataclass, field
 
 # Add parent directory to path for imports
@@ -28,7 +41,9 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 
-from validators.coin_validator import CoinValidator, ValidationReport, ValidationError
+from validators.coin_validator import CoinValidator, ValidationReport, ValidationError, rows_to_columns
+from validators.validation_cache import ValidationCache
+from validators.price_anomaly import PriceAnomalyDetector, AnomalyReport
 
 # Configure logging
 logging.basicConfig(
@@ -51,6 +66,8 @@ class DataQualityReport:
     validation_report: Optional[ValidationReport] = None
     stale_coins: List[Dict] = field(default_factory=list)
     missing_field_coins: List[Dict] = field(default_factory=list)
+    missing_field_count: int = 0
+    price_anomalies: Optional[AnomalyReport] = None
 
     def to_markdown(self) -> str:
         """Generate markdown report."""
@@ -90,8 +107,8 @@ class DataQualityReport:
                 "",
                 f"- Valid coins: {self.validation_report.valid_coins}",
                 f"- Invalid coins: {self.validation_report.invalid_coins}",
-                f"- Errors: {len(self.validation_report.errors)}",
-                f"- Warnings: {len(self.validation_report.warnings)}",
+                f"- Errors: {self.validation_report.error_count}",
+                f"- Warnings: {self.validation_report.warning_count}",
                 "",
             ])
 
@@ -106,11 +123,12 @@ class DataQualityReport:
                     by_field[err.field].append(err)
 
                 for fld, errs in by_field.items():
-                    lines.append(f"**{fld}** ({len(errs)} errors)")
+                    count = self.validation_report.error_counts[fld]
+                    lines.append(f"**{fld}** ({count} errors)")
                     for err in errs[:5]:
                         lines.append(f"- PCGS {err.coin_identifier}: {err.message}")
-                    if len(errs) > 5:
-                        lines.append(f"- ... and {len(errs) - 5} more")
+                    if count > 5:
+                        lines.append(f"- ... and {count - 5} more")
                     lines.append("")
 
             if self.validation_report.warnings:
@@ -118,8 +136,8 @@ class DataQualityReport:
                 lines.append("")
                 for warn in self.validation_report.warnings[:10]:
                     lines.append(f"- PCGS {warn.coin_identifier}: {warn.message}")
-                if len(self.validation_report.warnings) > 10:
-                    lines.append(f"- ... and {len(self.validation_report.warnings) - 10} more")
+                if self.validation_report.warning_count > 10:
+                    lines.append(f"- ... and {self.validation_report.warning_count - 10} more")
                 lines.append("")
 
         # Stale prices
@@ -132,9 +150,9 @@ class DataQualityReport:
             ])
             for coin in self.stale_coins[:20]:
                 lines.append(f"| {coin['pcgsNumber']} | {coin['fullName'][:40]} | {coin['lastUpdated']} |")
-            if len(self.stale_coins) > 20:
+            if self.stale_price_count > 20:
                 lines.append(f"")
-                lines.append(f"*... and {len(self.stale_coins) - 20} more*")
+                lines.append(f"*... and {self.stale_price_count - 20} more*")
             lines.append("")
 
         # Missing fields
@@ -145,8 +163,26 @@ class DataQualityReport:
             ])
             for coin in self.missing_field_coins[:10]:
                 lines.append(f"- PCGS {coin.get('pcgsNumber', 'unknown')}: missing {', '.join(coin.get('missing', []))}")
-            if len(self.missing_field_coins) > 10:
-                lines.append(f"- ... and {len(self.missing_field_coins) - 10} more")
+            if self.missing_field_count > 10:
+                lines.append(f"- ... and {self.missing_field_count - 10} more")
+            lines.append("")
+
+        # Price anomalies
+        if self.price_anomalies:
+            lines.extend([
+                "## Price Anomalies",
+                "",
+                f"Checked {self.price_anomalies.rows_checked} prices.",
+                "",
+                "| Kind | Count |",
+                "|------|-------|",
+            ])
+            for kind, count in sorted(self.price_anomalies.counts.items()):
+                lines.append(f"| {kind} | {count} |")
+            lines.append("")
+            for anomaly in self.price_anomalies.samples:
+                lines.append(f"- {anomaly.kind} PCGS {anomaly.pcgs_number} "
+                             f"({anomaly.price_date}): {anomaly.message}")
             lines.append("")
 
         lines.append("---")
@@ -159,16 +195,43 @@ class DataValidator:
     """Validates coin data in the database."""
 
     STALE_THRESHOLD_DAYS = 30
+    DEFAULT_CHUNK_SIZE = 1000
+    DEFAULT_FIX_BATCH_SIZE = 500
+    DEFAULT_SAMPLE_LIMIT = 20  # Example errors kept per field / list
 
-    def __init__(self, database_url: str):
-        """Initialize with database connection."""
+    def __init__(self, database_url: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 sample_limit: int = DEFAULT_SAMPLE_LIMIT, cache: Optional[ValidationCache] = None):
+        """
+        Initialize with database connection.
+
+        Args:
+            database_url: PostgreSQL connection URL
+            chunk_size: Rows fetched per server-side cursor batch
+            sample_limit: Example errors/coins kept per category in the report
+            cache: Per-coin result cache; enables incremental validation
+        """
+        self.database_url = database_url
         self.engine = create_engine(database_url)
         Session = sessionmaker(bind=self.engine)
         self.session = Session()
         self.coin_validator = CoinValidator(strict=False)
+        self.chunk_size = chunk_size
+        self.sample_limit = sample_limit
+        self.cache = cache
+
+    def iter_coin_chunks(self, series_filter: Optional[str] = None,
+                         updated_since: Optional[datetime] = None,
+                         series_name: Optional[str] = None) -> Iterator[List[Dict]]:
+        """
+        Stream coins from the database in chunks of chunk_size.
 
-    def get_all_coins(self, series_filter: Optional[str] = None) -> List[Dict]:
-        """Fetch all coins from database."""
+        Uses a server-side cursor, so only one chunk is held in memory.
+
+        Args:
+            series_filter: Only coins whose series matches (ILIKE)
+            updated_since: Only coins with updatedAt at or after this time
+            series_name: Only coins in exactly this series
+        """
         query = """
             SELECT
                 id,
@@ -183,40 +246,60 @@ class DataValidator:
                 "updatedAt"
             FROM "CoinReference"
         """
+        conditions = []
         params = {}
 
         if series_filter:
-            query += ' WHERE series ILIKE :series'
+            conditions.append('series ILIKE :series')
             params['series'] = f'%{series_filter}%'
 
+        if updated_since:
+            conditions.append('"updatedAt" >= :since')
+            params['since'] = updated_since
+
+        if series_name is not None:
+            conditions.append('series = :series_name')
+            params['series_name'] = series_name
+
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+
         query += ' ORDER BY series, year'
 
-        result = self.session.execute(text(query), params)
-        coins = []
-        for row in result:
-            coins.append({
-                'id': row[0],
-                'pcgsNumber': row[1],
-                'year': row[2],
-                'mintMark': row[3],
-                'denomination': row[4],
-                'series': row[5],
-                'fullName': row[6],
-                'metal': row[7],
-                'has_search_vector': row[8],
-                'updatedAt': row[9],
-            })
-        return coins
+        result = self.session.execute(
+            text(query), params,
+            execution_options={'stream_results': True, 'yield_per': self.chunk_size},
+        )
+        try:
+            for rows in result.partitions():
+                yield [{
+                    'id': row[0],
+                    'pcgsNumber': row[1],
+                    'year': row[2],
+                    'mintMark': row[3],
+                    'denomination': row[4],
+                    'series': row[5],
+                    'fullName': row[6],
+                    'metal': row[7],
+                    'has_search_vector': row[8],
+                    'updatedAt': row[9],
+                } for row in rows]
+        finally:
+            result.close()
 
     def get_price_stats(self) -> Dict:
         """Get price data statistics."""
         result = self.session.execute(text("""
             SELECT
-                COUNT(DISTINCT c.id) as total_coins,
-                COUNT(DISTINCT CASE WHEN p.id IS NOT NULL THEN c.id END) as with_prices,
-                COUNT(DISTINCT CASE WHEN p."priceDate" < CURRENT_DATE - INTERVAL '30 days' THEN c.id END) as stale
+                COUNT(*) as total_coins,
+                COUNT(lp.last_update) as with_prices,
+                COUNT(CASE WHEN lp.last_update < CURRENT_DATE - INTERVAL '30 days' THEN 1 END) as stale
             FROM "CoinReference" c
-            LEFT JOIN "CoinPriceGuide" p ON c.id = p."coinReferenceId"
+            LEFT JOIN (
+                SELECT "coinReferenceId", MAX("priceDate") as last_update
+                FROM "CoinLatestPrice"
+                GROUP BY "coinReferenceId"
+            ) lp ON c.id = lp."coinReferenceId"
         """))
         row = result.fetchone()
         return {
@@ -225,19 +308,20 @@ class DataValidator:
             'stale': row[2] or 0,
         }
 
-    def get_stale_coins(self) -> List[Dict]:
-        """Get coins with stale price data."""
+    def get_stale_coins(self, limit: Optional[int] = None) -> List[Dict]:
+        """Get coins whose latest price is more than 30 days old, oldest first."""
         result = self.session.execute(text("""
-            SELECT DISTINCT
+            SELECT
                 c."pcgsNumber",
                 c."fullName",
-                MAX(p."priceDate") as last_updated
+                MAX(lp."priceDate") as last_updated
             FROM "CoinReference" c
-            JOIN "CoinPriceGuide" p ON c.id = p."coinReferenceId"
-            WHERE p."priceDate" < CURRENT_DATE - INTERVAL '30 days'
+            JOIN "CoinLatestPrice" lp ON c.id = lp."coinReferenceId"
             GROUP BY c."pcgsNumber", c."fullName"
+            HAVING MAX(lp."priceDate") < CURRENT_DATE - INTERVAL '30 days'
             ORDER BY last_updated ASC
-        """))
+            LIMIT :limit
+        """), {'limit': limit})
         coins = []
         for row in result:
             coins.append({
@@ -257,68 +341,254 @@ class DataValidator:
         """))
         return {row[0]: row[1] for row in result}
 
-    def validate_all(self, series_filter: Optional[str] = None) -> DataQualityReport:
-        """Run full validation and return report."""
-        report = DataQualityReport()
+    def check_prices(self, series_filter: Optional[str] = None) -> AnomalyReport:
+        """Scan latest and historical prices for curve anomalies."""
+        detector = PriceAnomalyDetector(max_samples=self.sample_limit)
+        return detector.check_database(self.session, series_filter)
+
+    def get_missing_search_vector_count(self) -> int:
+        """Count coins without a search vector."""
+        result = self.session.execute(text("""
+            SELECT COUNT(*) FROM "CoinReference" WHERE "searchVector" IS NULL
+        """))
+        return result.scalar()
+
+    def get_coin_ids(self) -> Set[str]:
+        """All CoinReference IDs (for pruning deleted coins from the cache)."""
+        result = self.session.execute(text('SELECT id FROM "CoinReference"'))
+        return {row[0] for row in result}
 
-        # Get coins
-        coins = self.get_all_coins(series_filter)
-        report.total_coins = len(coins)
-        logger.info(f"Loaded {report.total_coins} coins for validation")
+    def validate_all(self, series_filter: Optional[str] = None, workers: int = 1) -> DataQualityReport:
+        """
+        Run validation and return report.
 
-        # Count missing search vectors
-        report.missing_search_vector = sum(1 for c in coins if not c.get('has_search_vector'))
+        Catalog-wide runs with a cache only revalidate coins changed since
+        the cache watermark; series runs always validate the series in full.
+        With workers > 1, every matching coin is validated in a process pool
+        (one task per series) without the cache.
+        """
+        report = DataQualityReport()
 
-        # Get price stats
+        # Aggregate stats first, before the streaming cursor is opened
         price_stats = self.get_price_stats()
         report.coins_with_prices = price_stats['with_prices']
-        report.coins_without_prices = report.total_coins - report.coins_with_prices
         report.stale_price_count = price_stats['stale']
+        report.stale_coins = self.get_stale_coins(limit=self.sample_limit)
+        report.series_coverage = self.get_series_coverage()
 
-        # Get stale coins
-        report.stale_coins = self.get_stale_coins()
+        if workers > 1:
+            self._validate_parallel(report, series_filter, workers)
+        elif self.cache and not series_filter:
+            self._validate_incremental(report, price_stats['total'])
+        else:
+            report.validation_report = ValidationReport(max_samples=self.sample_limit)
+            self._validate_stream(report, self.iter_coin_chunks(series_filter))
 
-        # Get series coverage
-        report.series_coverage = self.get_series_coverage()
+        report.coins_without_prices = report.total_coins - report.coins_with_prices
+        return report
 
-        # Run field validation
-        report.validation_report = self.coin_validator.validate_batch_with_report(coins)
+    def validate_partition(self, series_name: str, series_filter: Optional[str] = None) -> DataQualityReport:
+        """
+        Validate one series (worker side of --workers).
+
+        Returns a partial report with only coin counts, validation results
+        and missing-field samples filled in.
+        """
+        report = DataQualityReport()
+        report.validation_report = ValidationReport(max_samples=self.sample_limit)
+        self._validate_stream(report, self.iter_coin_chunks(series_filter, series_name=series_name))
+        return report
+
+    def _validate_stream(self, report: DataQualityReport, chunks: Iterator[List[Dict]]):
+        """Validate streamed chunks, keeping counts and bounded samples."""
+        for coins in chunks:
+            report.total_coins += len(coins)
+            report.missing_search_vector += sum(1 for c in coins if not c.get('has_search_vector'))
+            self.coin_validator.validate_columns(rows_to_columns(coins), report.validation_report)
+            self._collect_missing_fields(report, coins)
+            logger.debug(f"Validated {report.total_coins} coins "
+                         f"({report.validation_report.error_count} errors so far)")
+        logger.info(f"Validated {report.total_coins} coins")
+
+    def _validate_parallel(self, report: DataQualityReport, series_filter: Optional[str], workers: int):
+        """Validate each series in a process pool and merge results in series order."""
+        series_names = sorted(report.series_coverage)
+        logger.info(f"Validating {len(series_names)} series across {workers} processes")
+
+        # spawn: workers must not inherit this process's database connections
+        context = multiprocessing.get_context('spawn')
+        partials: Dict[str, DataQualityReport] = {}
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = {
+                pool.submit(_validate_series_worker, self.database_url, name, series_filter,
+                            self.chunk_size, self.sample_limit): name
+                for name in series_names
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                partials[name] = future.result()
+                logger.info(f"[{len(partials)}/{len(series_names)}] {name}: "
+                            f"{partials[name].total_coins} coins")
+
+        report.validation_report = ValidationReport(max_samples=self.sample_limit)
+        for name in series_names:
+            partial = partials[name]
+            report.total_coins += partial.total_coins
+            report.missing_search_vector += partial.missing_search_vector
+            report.validation_report.merge(partial.validation_report)
+            report.missing_field_count += partial.missing_field_count
+            room = self.sample_limit - len(report.missing_field_coins)
+            report.missing_field_coins.extend(partial.missing_field_coins[:max(room, 0)])
+
+    def _validate_incremental(self, report: DataQualityReport, catalog_total: int):
+        """Revalidate coins changed since the cache watermark, then report from the cache."""
+        watermark = self.cache.get_watermark()
+        if watermark:
+            logger.info(f"Revalidating coins updated since {watermark.isoformat()}")
+        else:
+            logger.info("No validation cache yet, validating all coins")
+
+        changed = 0
+        latest = watermark
+        for coins in self.iter_coin_chunks(updated_since=watermark):
+            flagged = set(self.coin_validator.flagged_rows(rows_to_columns(coins)))
+            results = []
+            for i, coin in enumerate(coins):
+                errors, warnings = [], []
+                if i in flagged:
+                    _, errors, warnings = self.coin_validator.validate_coin(coin)
+                results.append({**coin, 'errors': errors, 'warnings': warnings,
+                                'missing': self._missing_fields(coin)})
+                if coin['updatedAt'] and (latest is None or coin['updatedAt'] > latest):
+                    latest = coin['updatedAt']
+            self.cache.store_results(results)
+            changed += len(coins)
+            logger.info(f"Revalidated {changed} changed coins")
+
+        counts = self.cache.get_counts()
+        if counts['total'] != catalog_total:
+            removed = self.cache.prune(self.get_coin_ids())
+            logger.info(f"Removed {removed} deleted coins from validation cache")
+            counts = self.cache.get_counts()
+
+        if latest:
+            self.cache.set_watermark(latest)
+
+        # Merge cached results into the report
+        validation = ValidationReport(max_samples=self.sample_limit)
+        validation.total_coins = counts['total']
+        validation.valid_coins = counts['valid']
+        validation.invalid_coins = counts['invalid']
+        for result in self.cache.iter_issues(self.chunk_size):
+            for error in result['errors']:
+                validation.add_error(error)
+            for warning in result['warnings']:
+                validation.add_warning(warning)
+            self._add_missing_fields(report, result['pcgsNumber'], result['missing'])
+
+        report.validation_report = validation
+        report.total_coins = counts['total']
+        report.missing_search_vector = self.get_missing_search_vector_count()
+        logger.info(f"Report built from {counts['total']} cached results ({changed} revalidated)")
+
+    @staticmethod
+    def _missing_fields(coin: Dict) -> List[str]:
+        """Names of expected fields that are empty for a coin."""
+        missing = []
+        if not coin.get('pcgsNumber'):
+            missing.append('pcgsNumber')
+        if not coin.get('series'):
+            missing.append('series')
+        if not coin.get('fullName'):
+            missing.append('fullName')
+        if not coin.get('denomination'):
+            missing.append('denomination')
+        return missing
+
+    def _add_missing_fields(self, report: DataQualityReport, pcgs_number, missing: List[str]):
+        """Count a coin with missing fields, keeping up to sample_limit examples."""
+        if not missing:
+            return
+        report.missing_field_count += 1
+        if len(report.missing_field_coins) < self.sample_limit:
+            report.missing_field_coins.append({
+                'pcgsNumber': pcgs_number if pcgs_number is not None else 'unknown',
+                'missing': missing,
+            })
 
-        # Identify coins with missing fields
+    def _collect_missing_fields(self, report: DataQualityReport, coins: List[Dict]):
+        """Count coins with missing fields, keeping up to sample_limit examples."""
         for coin in coins:
-            missing = []
-            if not coin.get('pcgsNumber'):
-                missing.append('pcgsNumber')
-            if not coin.get('series'):
-                missing.append('series')
-            if not coin.get('fullName'):
-                missing.append('fullName')
-            if not coin.get('denomination'):
-                missing.append('denomination')
-
-            if missing:
-                report.missing_field_coins.append({
-                    'pcgsNumber': coin.get('pcgsNumber', 'unknown'),
-                    'missing': missing,
-                })
+            self._add_missing_fields(report, coin.get('pcgsNumber', 'unknown'), self._missing_fields(coin))
 
-        return report
+    def fix_search_vectors(self, batch_size: int = DEFAULT_FIX_BATCH_SIZE, pause: float = 0.0) -> int:
+        """
+        Regenerate missing search vectors by triggering update, in batches.
 
-    def fix_search_vectors(self) -> int:
-        """Regenerate missing search vectors by triggering update."""
-        result = self.session.execute(text("""
-            UPDATE "CoinReference"
-            SET "fullName" = "fullName"
-            WHERE "searchVector" IS NULL
-        """))
-        self.session.commit()
-        return result.rowcount
+        Each batch is its own short transaction over the next batch_size coins
+        by id. Rows locked by other writers are skipped rather than waited on,
+        and coins stop matching once their vector is set, so an interrupted or
+        repeated run simply picks up whatever is still missing.
+
+        Args:
+            batch_size: Coins updated per transaction
+            pause: Seconds to sleep between batches to leave room for traffic
+
+        Returns:
+            Number of coins fixed
+        """
+        remaining = self.get_missing_search_vector_count()
+        if not remaining:
+            return 0
+        logger.info(f"{remaining} coins missing search vectors, fixing in batches of {batch_size}")
+
+        fixed = 0
+        last_id = ''
+        while True:
+            result = self.session.execute(text("""
+                WITH batch AS (
+                    SELECT id FROM "CoinReference"
+                    WHERE "searchVector" IS NULL AND id > :last_id
+                    ORDER BY id
+                    LIMIT :batch_size
+                    FOR UPDATE SKIP LOCKED
+                )
+                UPDATE "CoinReference" c
+                SET "fullName" = c."fullName"
+                FROM batch
+                WHERE c.id = batch.id
+                RETURNING c.id
+            """), {'last_id': last_id, 'batch_size': batch_size})
+            ids = [row[0] for row in result]
+            self.session.commit()
+
+            if not ids:
+                break
+
+            fixed += len(ids)
+            last_id = max(ids)
+            logger.info(f"Fixed {fixed}/{remaining} search vectors")
+            if pause:
+                time.sleep(pause)
+
+        return fixed
 
     def close(self):
         """Close database connection."""
         self.session.close()
 
 
+def _validate_series_worker(database_url: str, series_name: str, series_filter: Optional[str],
+                            chunk_size: int, sample_limit: int) -> DataQualityReport:
+    """Process pool entry point: validate one series on its own connection."""
+    validator = DataValidator(database_url, chunk_size=chunk_size, sample_limit=sample_limit)
+    try:
+        return validator.validate_partition(series_name, series_filter)
+    finally:
+        validator.close()
+        validator.engine.dispose()
+
+
 def print_summary(report: DataQualityReport):
     """Print quick summary to console."""
     print("\n=== Data Quality Summary ===\n")
@@ -332,8 +602,13 @@ def print_summary(report: DataQualityReport):
         print(f"\nValidation:")
         print(f"  Valid:    {report.validation_report.valid_coins}")
         print(f"  Invalid:  {report.validation_report.invalid_coins}")
-        print(f"  Errors:   {len(report.validation_report.errors)}")
-        print(f"  Warnings: {len(report.validation_report.warnings)}")
+        print(f"  Errors:   {report.validation_report.error_count}")
+        print(f"  Warnings: {report.validation_report.warning_count}")
+
+    if report.price_anomalies:
+        print(f"\nPrice anomalies ({report.price_anomalies.rows_checked} prices checked):")
+        for kind, count in sorted(report.price_anomalies.counts.items()):
+            print(f"  {kind}: {count}")
 
     print(f"\nSeries coverage: {len(report.series_coverage)} series")
     top_series = sorted(report.series_coverage.items(), key=lambda x: -x[1])[:5]
@@ -359,6 +634,20 @@ def main():
                         help='Export report to markdown file')
     parser.add_argument('--fix', action='store_true',
                         help='Auto-fix where possible (e.g., regenerate searchVector)')
+    parser.add_argument('--fix-batch-size', type=int, default=DataValidator.DEFAULT_FIX_BATCH_SIZE,
+                        metavar='N', help=f'Coins per --fix transaction (default: {DataValidator.DEFAULT_FIX_BATCH_SIZE})')
+    parser.add_argument('--fix-pause', type=float, default=0.0, metavar='SECONDS',
+                        help='Pause between --fix batches (default: 0)')
+    parser.add_argument('--prices', action='store_true',
+                        help='Also check prices for grade inversions, jumps and series outliers')
+    parser.add_argument('--chunk-size', type=int, default=DataValidator.DEFAULT_CHUNK_SIZE,
+                        help=f'Rows fetched per cursor batch (default: {DataValidator.DEFAULT_CHUNK_SIZE})')
+    parser.add_argument('--sample-limit', type=int, default=DataValidator.DEFAULT_SAMPLE_LIMIT,
+                        help=f'Example errors kept per category (default: {DataValidator.DEFAULT_SAMPLE_LIMIT})')
+    parser.add_argument('--workers', type=int, default=1, metavar='N',
+                        help='Full audit in N processes, one task per series (bypasses cache)')
+    parser.add_argument('--full', action='store_true',
+                        help='Revalidate every coin and rebuild the validation cache')
     parser.add_argument('--verbose', '-v', action='store_true',
                         help='Verbose output')
 
@@ -378,18 +667,26 @@ def main():
         sys.exit(1)
 
     # Initialize validator
-    validator = DataValidator(database_url)
+    cache = ValidationCache()
+    if args.full:
+        cache.clear()
+    validator = DataValidator(database_url, chunk_size=args.chunk_size,
+                              sample_limit=args.sample_limit, cache=cache)
 
     try:
         # Handle fix action
         if args.fix:
             logger.info("Fixing missing search vectors...")
-            fixed = validator.fix_search_vectors()
+            fixed = validator.fix_search_vectors(batch_size=args.fix_batch_size, pause=args.fix_pause)
             print(f"Fixed {fixed} coins with missing search vectors")
 
         # Run validation
         logger.info("Running validation...")
-        report = validator.validate_all(series_filter=args.series)
+        report = validator.validate_all(series_filter=args.series, workers=args.workers)
+
+        if args.prices:
+            logger.info("Checking prices for anomalies...")
+            report.price_anomalies = validator.check_prices(series_filter=args.series)
 
         # Output results
         if args.summary:
@@ -398,6 +695,8 @@ def main():
         if args.report:
             if report.validation_report:
                 print(report.validation_report.summary())
+            if report.price_anomalies:
+                print(report.price_anomalies.summary())
 
         if args.export:
             export_path = Path(args.export)
@@ -1,5 +1,7 @@
 """Validation modules for scraped coin data."""
 
 from .coin_validator import CoinValidator, ValidationReport
+from .validation_cache import ValidationCache
+from .price_anomaly import PriceAnomalyDetector, AnomalyReport
 
-__all__ = ['CoinValidator', 'ValidationReport']
+__all__ = ['CoinValidator', 'ValidationReport', 'ValidationCache', 'PriceAnomalyDetector', 'AnomalyReport']
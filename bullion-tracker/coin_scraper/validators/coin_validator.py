@@ -3,13 +3,24 @@ Coin Data Validator
 
 Validates scraped coin data for completeness and correctness.
 Used to ensure data quality before database insertion.
+
+For large batches, CoinValidator.validate_columns evaluates every check as a
+whole-column mask (NumPy, if installed) and only builds ValidationError
+objects for the rows that fail.
 """
 
 import logging
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional, Any
+from functools import lru_cache
+from typing import Dict, List, Tuple, Optional, Any, Sequence
 from dataclasses import dataclass, field
 
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 logger = logging.getLogger(__name__)
 
 # Valid denominations for US coins
@@ -41,6 +52,42 @@ VALID_MINT_MARKS = [
     "P", "D", "S", "O", "CC", "W", "C", "D/S", "S/D",
 ]
 
+# Normalized lookup sets (uppercase) for O(1) membership checks
+DENOMINATION_SET = frozenset(d.upper() for d in VALID_DENOMINATIONS)
+DENOMINATION_PATTERNS = ('CENT', 'DOLLAR', 'OZ', 'EAGLE', 'DIME', 'QUARTER', 'HALF', 'NICKEL')
+MINT_MARK_SET = frozenset(mm.upper() for mm in VALID_MINT_MARKS if mm)
+
+# Columns read by CoinValidator.validate_columns
+COLUMN_FIELDS = ('pcgsNumber', 'year', 'series', 'fullName', 'denomination', 'mintMark')
+
+# Largest PCGS number accepted by validate_pcgs_number
+MAX_PCGS_NUMBER = 999999999
+
+
+@lru_cache(maxsize=4096)
+def _denomination_known(denom: str) -> bool:
+    """Whether a non-empty denomination passes validate_denomination."""
+    denom_upper = denom.upper().strip()
+    if denom_upper in DENOMINATION_SET:
+        return True
+    return any(pattern in denom_upper for pattern in DENOMINATION_PATTERNS)
+
+
+@lru_cache(maxsize=256)
+def _mint_mark_known(mm: str) -> bool:
+    """Whether a non-empty mint mark passes validate_mint_mark."""
+    return mm.upper().strip() in MINT_MARK_SET
+
+
+def _native(value: Any) -> Any:
+    """Convert NumPy scalars back to Python values for the row-by-row checks."""
+    return value.item() if HAS_NUMPY and isinstance(value, np.generic) else value
+
+
+def rows_to_columns(coins: List[Dict], fields: Sequence[str] = COLUMN_FIELDS) -> Dict[str, List]:
+    """Transpose a list of coin dicts into {field: column} for validate_columns."""
+    return {name: [coin.get(name) for coin in coins] for name in fields}
+
 
 @dataclass
 class ValidationError:
@@ -53,24 +100,68 @@ class ValidationError:
 
 @dataclass
 class ValidationReport:
-    """Aggregates validation results for a batch of coins."""
+    """
+    Aggregates validation results for a batch of coins.
+
+    Counts always cover every error and warning. With max_samples set, only
+    the first max_samples errors per field (and max_samples warnings) are
+    kept, so memory stays bounded when validating a whole catalog.
+    """
     total_coins: int = 0
     valid_coins: int = 0
     invalid_coins: int = 0
     errors: List[ValidationError] = field(default_factory=list)
     warnings: List[ValidationError] = field(default_factory=list)
+    max_samples: Optional[int] = None
+    error_count: int = 0
+    warning_count: int = 0
+    error_counts: Dict[str, int] = field(default_factory=dict)
 
     def add_error(self, error: ValidationError):
         """Add an error to the report."""
-        self.errors.append(error)
+        seen = self.error_counts.get(error.field, 0)
+        self.error_counts[error.field] = seen + 1
+        self.error_count += 1
+        if self.max_samples is None or seen < self.max_samples:
+            self.errors.append(error)
 
     def add_warning(self, warning: ValidationError):
         """Add a warning to the report."""
-        self.warnings.append(warning)
+        self.warning_count += 1
+        if self.max_samples is None or len(self.warnings) < self.max_samples:
+            self.warnings.append(warning)
 
     def is_valid(self) -> bool:
         """Check if all coins are valid (no errors)."""
-        return len(self.errors) == 0
+        return self.error_count == 0
+
+    def merge(self, other: "ValidationReport"):
+        """
+        Append another report's results after this one's.
+
+        Counts are summed; samples are kept as if other's coins had been
+        validated after this report's, so merging partitions in a fixed order
+        gives the same report every time.
+        """
+        self.total_coins += other.total_coins
+        self.valid_coins += other.valid_coins
+        self.invalid_coins += other.invalid_coins
+
+        kept: Dict[str, int] = {}
+        for error in self.errors:
+            kept[error.field] = kept.get(error.field, 0) + 1
+        for error in other.errors:
+            if self.max_samples is None or kept.get(error.field, 0) < self.max_samples:
+                self.errors.append(error)
+                kept[error.field] = kept.get(error.field, 0) + 1
+        for fld, count in other.error_counts.items():
+            self.error_counts[fld] = self.error_counts.get(fld, 0) + count
+        self.error_count += other.error_count
+
+        for warning in other.warnings:
+            if self.max_samples is None or len(self.warnings) < self.max_samples:
+                self.warnings.append(warning)
+        self.warning_count += other.warning_count
 
     def summary(self) -> str:
         """Generate a summary string."""
@@ -79,8 +170,8 @@ class ValidationReport:
             f"Total coins: {self.total_coins}",
             f"Valid: {self.valid_coins}",
             f"Invalid: {self.invalid_coins}",
-            f"Errors: {len(self.errors)}",
-            f"Warnings: {len(self.warnings)}",
+            f"Errors: {self.error_count}",
+            f"Warnings: {self.warning_count}",
         ]
 
         if self.errors:
@@ -93,19 +184,20 @@ class ValidationReport:
                 error_types[err.field].append(err)
 
             for field, errs in error_types.items():
-                lines.append(f"  {field}: {len(errs)} errors")
+                count = self.error_counts[field]
+                lines.append(f"  {field}: {count} errors")
                 # Show first 3 examples
                 for err in errs[:3]:
                     lines.append(f"    - {err.coin_identifier}: {err.message}")
-                if len(errs) > 3:
-                    lines.append(f"    ... and {len(errs) - 3} more")
+                if count > 3:
+                    lines.append(f"    ... and {count - 3} more")
 
         if self.warnings:
             lines.append(f"\n--- Warnings ---")
             for warn in self.warnings[:5]:
                 lines.append(f"  {warn.coin_identifier}: {warn.message}")
-            if len(self.warnings) > 5:
-                lines.append(f"  ... and {len(self.warnings) - 5} more")
+            if self.warning_count > 5:
+                lines.append(f"  ... and {self.warning_count - 5} more")
 
         return "\n".join(lines)
 
@@ -262,7 +354,7 @@ class CoinValidator:
             )
 
         # PCGS numbers are typically under 1 billion
-        if num > 999999999:
+        if num > MAX_PCGS_NUMBER:
             return ValidationError(
                 field='pcgsNumber',
                 message=f'PCGS number {num} seems too large',
@@ -285,19 +377,9 @@ class CoinValidator:
         if denom is None or denom == "":
             return None  # No denomination is acceptable
 
-        # Normalize for comparison
-        denom_upper = denom.upper().strip()
-
-        # Check against valid denominations (case-insensitive)
-        for valid in VALID_DENOMINATIONS:
-            if valid.upper() == denom_upper:
-                return None
-
-        # Also accept if it contains common patterns
-        patterns = ['CENT', 'DOLLAR', 'OZ', 'EAGLE', 'DIME', 'QUARTER', 'HALF', 'NICKEL']
-        for pattern in patterns:
-            if pattern in denom_upper:
-                return None
+        # Known denomination (case-insensitive) or contains a common pattern
+        if _denomination_known(denom):
+            return None
 
         return ValidationError(
             field='denomination',
@@ -319,11 +401,8 @@ class CoinValidator:
         if mm is None or mm == "":
             return None  # No mint mark is valid (Philadelphia)
 
-        mm_upper = mm.upper().strip()
-
-        for valid in VALID_MINT_MARKS:
-            if valid and valid.upper() == mm_upper:
-                return None
+        if _mint_mark_known(mm):
+            return None
 
         return ValidationError(
             field='mintMark',
@@ -413,17 +492,21 @@ class CoinValidator:
         logger.info(f"Batch validation: {len(valid)} valid, {len(invalid)} invalid out of {len(coins)} coins")
         return valid, invalid
 
-    def validate_batch_with_report(self, coins: List[Dict]) -> ValidationReport:
+    def validate_batch_with_report(self, coins: List[Dict],
+                                   report: Optional[ValidationReport] = None) -> ValidationReport:
         """
         Validate a batch of coins and return a detailed report.
 
         Args:
             coins: List of coin data dictionaries
+            report: Existing report to accumulate into (for chunked validation)
 
         Returns:
             ValidationReport with all errors and warnings
         """
-        report = ValidationReport(total_coins=len(coins))
+        if report is None:
+            report = ValidationReport()
+        report.total_coins += len(coins)
 
         for coin in coins:
             is_valid, errors, warnings = self.validate_coin(coin)
@@ -440,3 +523,98 @@ class CoinValidator:
                 report.add_warning(warning)
 
         return report
+
+    def validate_columns(self, columns: Dict[str, Sequence],
+                         report: Optional[ValidationReport] = None) -> ValidationReport:
+        """
+        Validate a batch given as columns and return a detailed report.
+
+        Equivalent to validate_batch_with_report on the same rows, but each
+        check runs as a whole-column mask. Rows that pass every check are only
+        counted; rows flagged by any mask go through validate_coin, so errors,
+        warnings and their order match the row-by-row path exactly.
+
+        Args:
+            columns: {field: sequence} for the COLUMN_FIELDS keys (lists or
+                NumPy arrays of equal length; missing keys are treated as empty)
+            report: Existing report to accumulate into (for chunked validation)
+
+        Returns:
+            ValidationReport with all errors and warnings
+        """
+        if report is None:
+            report = ValidationReport()
+
+        count = max((len(col) for col in columns.values()), default=0)
+        flagged = self.flagged_rows(columns)
+
+        report.total_coins += count
+        report.valid_coins += count - len(flagged)
+        for i in flagged:
+            coin = {name: _native(col[i]) for name, col in columns.items()}
+            is_valid, errors, warnings = self.validate_coin(coin)
+
+            if is_valid:
+                report.valid_coins += 1
+            else:
+                report.invalid_coins += 1
+
+            for error in errors:
+                report.add_error(error)
+
+            for warning in warnings:
+                report.add_warning(warning)
+
+        return report
+
+    def flagged_rows(self, columns: Dict[str, Sequence]) -> List[int]:
+        """
+        Indices of rows that may produce errors or warnings.
+
+        Rows not returned are guaranteed to pass validate_coin cleanly. Without
+        NumPy every row is returned.
+        """
+        count = max((len(col) for col in columns.values()), default=0)
+        if not HAS_NUMPY:
+            return list(range(count))
+        return np.flatnonzero(~self._clean_mask(columns, count)).tolist()
+
+    def _clean_mask(self, columns: Dict[str, Sequence], count: int) -> "np.ndarray":
+        """
+        Boolean mask of rows that produce no errors and no warnings.
+
+        Anything the masks can't classify (non-int numbers, non-string text)
+        is left unclean and handled by validate_coin.
+        """
+        def column(name):
+            col = columns.get(name)
+            return [None] * count if col is None else col
+
+        def int_column(name):
+            # (values, is_int, is_none); values only meaningful where is_int
+            arr = np.asarray(column(name))
+            if arr.dtype.kind in 'iu':
+                return arr, np.ones(count, dtype=bool), np.zeros(count, dtype=bool)
+            arr = arr.astype(object)
+            is_int = np.fromiter(map(type, arr), dtype=object, count=count) == int
+            values = np.where(is_int, arr, 0)
+            return values, is_int, np.equal(arr, None)
+
+        def text_mask(name, known):
+            # Evaluate each distinct value once (low cardinality), then map
+            col = column(name)
+            verdict = {v: not v or (type(v) is str and known(v)) for v in set(col)}
+            return np.fromiter(map(verdict.__getitem__, col), dtype=bool, count=count)
+
+        pcgs, pcgs_is_int, _ = int_column('pcgsNumber')
+        mask = pcgs_is_int & ((pcgs > 0) & (pcgs <= MAX_PCGS_NUMBER)).astype(bool)
+
+        year, year_is_int, year_is_none = int_column('year')
+        mask &= year_is_none | (year_is_int & ((year >= self.MIN_YEAR) & (year <= self.MAX_YEAR)).astype(bool))
+
+        for name in ('series', 'fullName'):
+            mask &= np.fromiter(map(bool, column(name)), dtype=bool, count=count)
+
+        mask &= text_mask('denomination', _denomination_known)
+        mask &= text_mask('mintMark', _mint_mark_known)
+        return mask
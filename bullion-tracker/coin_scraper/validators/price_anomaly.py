@@ -0,0 +1,302 @@
+"""
+Price Curve Anomaly Detector
+
+Checks prices rather than fields. All checks run as NumPy operations over
+whole columns, so the full CoinPriceGuide table is scanned in seconds:
+
+- grade_inversion: a higher grade priced below the next lower grade of the
+  same coin (e.g. MS66 < MS65). Mint State/circulated and Proof grades form
+  separate curves, ordered by ValidGrade.numericValue.
+- price_jump: a change between consecutive price observations of one coin and
+  grade beyond the series' volatility band (robust sigma of log returns).
+- series_outlier: a latest price far from the median of other coins in the
+  same series and grade.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, List, Optional, Any
+
+import numpy as np
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+GRADE_INVERSION = "grade_inversion"
+PRICE_JUMP = "price_jump"
+SERIES_OUTLIER = "series_outlier"
+
+# Scale factor turning a median absolute deviation into a normal sigma
+MAD_TO_SIGMA = 1.4826
+
+
+@dataclass
+class PriceAnomaly:
+    """A single suspicious price."""
+    kind: str
+    pcgs_number: int
+    grade_code: str
+    price_date: Optional[date]
+    price: float
+    reference: float  # Price it was compared against (lower grade, previous, peer median)
+    message: str
+
+
+@dataclass
+class AnomalyReport:
+    """Anomaly counts per kind plus a bounded sample of each."""
+    rows_checked: int = 0
+    counts: Dict[str, int] = field(default_factory=dict)
+    samples: List[PriceAnomaly] = field(default_factory=list)
+    max_samples: int = 20
+
+    def add(self, anomaly: PriceAnomaly):
+        """Count an anomaly, keeping up to max_samples examples per kind."""
+        seen = self.counts.get(anomaly.kind, 0)
+        self.counts[anomaly.kind] = seen + 1
+        if seen < self.max_samples:
+            self.samples.append(anomaly)
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def summary(self) -> str:
+        """Generate a summary string."""
+        lines = [
+            "=== Price Anomaly Report ===",
+            f"Prices checked: {self.rows_checked}",
+        ]
+        for kind in (GRADE_INVERSION, PRICE_JUMP, SERIES_OUTLIER):
+            lines.append(f"{kind}: {self.counts.get(kind, 0)}")
+            for anomaly in [a for a in self.samples if a.kind == kind][:3]:
+                lines.append(f"    - PCGS {anomaly.pcgs_number}: {anomaly.message}")
+        return "\n".join(lines)
+
+
+def _load_columns(session, query: str, params: Dict, names: List[str], chunk_size: int) -> Dict[str, np.ndarray]:
+    """Stream a query into {name: array}, in query order."""
+    lists: Dict[str, List[Any]] = {name: [] for name in names}
+    result = session.execute(text(query), params,
+                             execution_options={'stream_results': True, 'yield_per': chunk_size})
+    try:
+        for rows in result.partitions():
+            for name, values in zip(names, zip(*rows)):
+                lists[name].extend(values)
+    finally:
+        result.close()
+
+    columns = {name: np.array(values, dtype=object) for name, values in lists.items()}
+    if 'price' in columns:
+        columns['price'] = columns['price'].astype(float)
+    if 'numeric' in columns:
+        columns['numeric'] = columns['numeric'].astype(int)
+    return columns
+
+
+def _group_ids(*keys: np.ndarray) -> np.ndarray:
+    """Dense group id per row for the combination of key columns (any order)."""
+    combined = keys[0].astype(str)
+    for key in keys[1:]:
+        combined = np.char.add(np.char.add(combined, '\x1f'), key.astype(str))
+    _, inverse = np.unique(combined, return_inverse=True)
+    return inverse.ravel()
+
+
+def _group_median(group_ids: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Median of values for each group id 0..max(group_ids)."""
+    order = np.lexsort((values, group_ids))
+    sorted_values = values[order]
+    counts = np.bincount(group_ids)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    lower = starts + (counts - 1) // 2
+    upper = starts + counts // 2
+    return (sorted_values[lower] + sorted_values[upper]) / 2
+
+
+def _same_as_previous(*keys: np.ndarray) -> np.ndarray:
+    """Mask (length n-1) of rows whose keys equal the previous row's."""
+    same = np.ones(len(keys[0]) - 1, dtype=bool)
+    for key in keys:
+        same &= key[1:] == key[:-1]
+    return same
+
+
+class PriceAnomalyDetector:
+    """
+    Detects grade-curve inversions, price jumps and series outliers.
+
+    Usage:
+        detector = PriceAnomalyDetector()
+        report = detector.check_database(session)
+        print(report.summary())
+    """
+
+    def __init__(self, inversion_tolerance: float = 0.02, jump_sigmas: float = 4.0,
+                 min_jump: float = 0.25, outlier_sigmas: float = 5.0,
+                 min_outlier_ratio: float = 3.0, min_peers: int = 5, max_samples: int = 20):
+        """
+        Initialize detector.
+
+        Args:
+            inversion_tolerance: Fractional dip allowed before a lower price
+                for a higher grade is flagged
+            jump_sigmas: Volatility band width in robust sigmas of the series'
+                log returns
+            min_jump: Smallest fractional change ever flagged as a jump
+            outlier_sigmas: Peer band width in robust sigmas of log prices
+            min_outlier_ratio: Smallest price/median ratio ever flagged as an outlier
+            min_peers: Coins needed in a series+grade before outliers are checked
+            max_samples: Example anomalies kept per kind
+        """
+        self.inversion_tolerance = inversion_tolerance
+        self.jump_sigmas = jump_sigmas
+        self.min_jump_log = np.log1p(min_jump)
+        self.outlier_sigmas = outlier_sigmas
+        self.min_outlier_log = np.log(min_outlier_ratio)
+        self.min_peers = min_peers
+        self.max_samples = max_samples
+
+    # ===== Loading =====
+
+    def load_latest_curves(self, session, series_filter: Optional[str] = None,
+                           chunk_size: int = 10000) -> Dict[str, np.ndarray]:
+        """Latest price per coin and grade, ordered by coin, curve and grade."""
+        where = 'AND c.series ILIKE :series' if series_filter else ''
+        return _load_columns(session, f"""
+            SELECT
+                lp."coinReferenceId",
+                c."pcgsNumber",
+                c.series,
+                lp."gradeCode",
+                g."numericValue",
+                g."gradeCategory" = 'Proof' as proof,
+                lp."pcgsPrice",
+                lp."priceDate"
+            FROM "CoinLatestPrice" lp
+            JOIN "CoinReference" c ON c.id = lp."coinReferenceId"
+            JOIN "ValidGrade" g ON g."gradeCode" = lp."gradeCode"
+            WHERE lp."pcgsPrice" > 0 {where}
+            ORDER BY lp."coinReferenceId", proof, g."numericValue"
+        """, {'series': f'%{series_filter}%'} if series_filter else {},
+            ['coin', 'pcgs_number', 'series', 'grade', 'numeric', 'proof', 'price', 'date'], chunk_size)
+
+    def load_price_history(self, session, series_filter: Optional[str] = None,
+                           chunk_size: int = 10000) -> Dict[str, np.ndarray]:
+        """All CoinPriceGuide prices, ordered by coin, grade and date."""
+        where = 'AND c.series ILIKE :series' if series_filter else ''
+        return _load_columns(session, f"""
+            SELECT
+                p."coinReferenceId",
+                c."pcgsNumber",
+                c.series,
+                p."gradeCode",
+                p."pcgsPrice",
+                p."priceDate"
+            FROM "CoinPriceGuide" p
+            JOIN "CoinReference" c ON c.id = p."coinReferenceId"
+            WHERE p."pcgsPrice" > 0 {where}
+            ORDER BY p."coinReferenceId", p."gradeCode", p."priceDate"
+        """, {'series': f'%{series_filter}%'} if series_filter else {},
+            ['coin', 'pcgs_number', 'series', 'grade', 'price', 'date'], chunk_size)
+
+    # ===== Checks =====
+
+    def find_grade_inversions(self, curves: Dict[str, np.ndarray], report: AnomalyReport):
+        """Flag grades priced below the next lower grade on the same curve."""
+        price = curves['price']
+        if len(price) < 2:
+            return
+        same_curve = _same_as_previous(curves['coin'], curves['proof'])
+        higher = curves['numeric'][1:] > curves['numeric'][:-1]
+        dip = price[1:] < price[:-1] * (1 - self.inversion_tolerance)
+
+        for i in np.flatnonzero(same_curve & higher & dip) + 1:
+            report.add(PriceAnomaly(
+                kind=GRADE_INVERSION,
+                pcgs_number=curves['pcgs_number'][i],
+                grade_code=curves['grade'][i],
+                price_date=curves['date'][i],
+                price=float(price[i]),
+                reference=float(price[i - 1]),
+                message=(f"{curves['grade'][i]} ${price[i]:,.2f} is below "
+                         f"{curves['grade'][i - 1]} ${price[i - 1]:,.2f}"),
+            ))
+
+    def find_price_jumps(self, history: Dict[str, np.ndarray], report: AnomalyReport):
+        """Flag consecutive observations whose log change exceeds the series band."""
+        price = history['price']
+        if len(price) < 2:
+            return
+        same_series = _same_as_previous(history['coin'], history['grade'])
+        idx = np.flatnonzero(same_series) + 1
+        if len(idx) == 0:
+            return
+        returns = np.log(price[idx] / price[idx - 1])
+
+        # Robust per-series sigma of log returns
+        groups = _group_ids(history['series'][idx])
+        median = _group_median(groups, returns)
+        mad = _group_median(groups, np.abs(returns - median[groups]))
+        band = np.maximum(self.jump_sigmas * MAD_TO_SIGMA * mad[groups], self.min_jump_log)
+
+        for j in np.flatnonzero(np.abs(returns) > band):
+            i, prev = idx[j], idx[j] - 1
+            change = np.expm1(returns[j]) * 100
+            days = (history['date'][i] - history['date'][prev]).days
+            report.add(PriceAnomaly(
+                kind=PRICE_JUMP,
+                pcgs_number=history['pcgs_number'][i],
+                grade_code=history['grade'][i],
+                price_date=history['date'][i],
+                price=float(price[i]),
+                reference=float(price[prev]),
+                message=(f"{history['grade'][i]} {change:+.0f}% in {days}d "
+                         f"(${price[prev]:,.2f} -> ${price[i]:,.2f}, "
+                         f"band ±{np.expm1(band[j]) * 100:.0f}%)"),
+            ))
+
+    def find_series_outliers(self, curves: Dict[str, np.ndarray], report: AnomalyReport):
+        """Flag latest prices far from the series median for the same grade."""
+        price = curves['price']
+        if len(price) == 0:
+            return
+        log_price = np.log(price)
+        groups = _group_ids(curves['series'], curves['grade'])
+        peers = np.bincount(groups)
+        median = _group_median(groups, log_price)
+        mad = _group_median(groups, np.abs(log_price - median[groups]))
+
+        deviation = np.abs(log_price - median[groups])
+        band = np.maximum(self.outlier_sigmas * MAD_TO_SIGMA * mad[groups], self.min_outlier_log)
+        flagged = (peers[groups] >= self.min_peers) & (deviation > band)
+
+        for i in np.flatnonzero(flagged):
+            peer_median = float(np.exp(median[groups[i]]))
+            report.add(PriceAnomaly(
+                kind=SERIES_OUTLIER,
+                pcgs_number=curves['pcgs_number'][i],
+                grade_code=curves['grade'][i],
+                price_date=curves['date'][i],
+                price=float(price[i]),
+                reference=peer_median,
+                message=(f"{curves['grade'][i]} ${price[i]:,.2f} vs {curves['series'][i]} "
+                         f"median ${peer_median:,.2f} ({peers[groups[i]]} coins)"),
+            ))
+
+    def check_database(self, session, series_filter: Optional[str] = None) -> AnomalyReport:
+        """Run all checks over CoinLatestPrice and CoinPriceGuide."""
+        report = AnomalyReport(max_samples=self.max_samples)
+
+        curves = self.load_latest_curves(session, series_filter)
+        logger.info(f"Loaded {len(curves['price'])} latest grade prices")
+        self.find_grade_inversions(curves, report)
+        self.find_series_outliers(curves, report)
+
+        history = self.load_price_history(session, series_filter)
+        logger.info(f"Loaded {len(history['price'])} historical prices")
+        self.find_price_jumps(history, report)
+
+        report.rows_checked = len(history['price'])
+        return report
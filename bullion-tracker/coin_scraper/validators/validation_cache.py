@@ -0,0 +1,219 @@
+"""
+Validation result cache with SQLite backend.
+
+Stores the last validation result of every CoinReference row plus an
+updatedAt watermark, so validate_data.py only revalidates coins changed
+since the previous run and rebuilds the full report from cached results.
+"""
+
+import json
+import sqlite3
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set
+
+from .coin_validator import ValidationError
+
+logger = logging.getLogger(__name__)
+
+
+class ValidationCache:
+    """
+    SQLite-backed cache of per-coin validation results.
+
+    Usage:
+        cache = ValidationCache()
+        since = cache.get_watermark()          # None -> validate everything
+        cache.store_results([{...}, ...])
+        cache.set_watermark(max_updated_at)
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Initialize validation cache.
+
+        Args:
+            db_path: Path to SQLite database file. Defaults to
+                     bullion-tracker/coin_scraper/data/validation_cache.db
+        """
+        if db_path is None:
+            data_dir = Path(__file__).parent.parent / "data"
+            data_dir.mkdir(exist_ok=True)
+            db_path = str(data_dir / "validation_cache.db")
+
+        self.db_path = db_path
+        self._init_db()
+
+    def _init_db(self):
+        """Initialize database schema."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS coin_results (
+                    coin_id TEXT PRIMARY KEY,
+                    pcgs_number INTEGER,
+                    series TEXT,
+                    year INTEGER,
+                    updated_at TIMESTAMP,
+                    valid INTEGER NOT NULL,
+                    errors TEXT NOT NULL DEFAULT '[]',
+                    warnings TEXT NOT NULL DEFAULT '[]',
+                    missing TEXT NOT NULL DEFAULT '[]',
+                    has_issues INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_coin_results_issues
+                ON coin_results(has_issues, series, year)
+            """)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """Get a database connection with row factory."""
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    # ===== Watermark =====
+
+    def get_watermark(self) -> Optional[datetime]:
+        """Latest CoinReference.updatedAt covered by the cache, or None if empty."""
+        conn = self._get_conn()
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'watermark'").fetchone()
+            return datetime.fromisoformat(row['value']) if row else None
+        finally:
+            conn.close()
+
+    def set_watermark(self, watermark: datetime):
+        """Record the latest updatedAt that has been validated."""
+        conn = self._get_conn()
+        try:
+            conn.execute("""
+                INSERT INTO meta (key, value) VALUES ('watermark', ?)
+                ON CONFLICT(key) DO UPDATE SET value = excluded.value
+            """, (watermark.isoformat(),))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def clear(self):
+        """Drop all cached results and the watermark (forces full revalidation)."""
+        conn = self._get_conn()
+        try:
+            conn.execute("DELETE FROM coin_results")
+            conn.execute("DELETE FROM meta")
+            conn.commit()
+        finally:
+            conn.close()
+
+    # ===== Results =====
+
+    def store_results(self, results: List[Dict]):
+        """
+        Upsert per-coin results.
+
+        Each dict has id, pcgsNumber, series, year, updatedAt, and lists of
+        errors / warnings (ValidationError) and missing (field names).
+        """
+        rows = []
+        for result in results:
+            errors, warnings, missing = result['errors'], result['warnings'], result['missing']
+            rows.append((
+                result['id'],
+                result.get('pcgsNumber'),
+                result.get('series'),
+                result.get('year'),
+                result.get('updatedAt'),
+                int(not errors),
+                self._dump_errors(errors),
+                self._dump_errors(warnings),
+                json.dumps(missing),
+                int(bool(errors or warnings or missing)),
+            ))
+
+        conn = self._get_conn()
+        try:
+            conn.executemany("""
+                INSERT INTO coin_results
+                (coin_id, pcgs_number, series, year, updated_at, valid, errors, warnings, missing, has_issues)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(coin_id) DO UPDATE SET
+                    pcgs_number = excluded.pcgs_number,
+                    series = excluded.series,
+                    year = excluded.year,
+                    updated_at = excluded.updated_at,
+                    valid = excluded.valid,
+                    errors = excluded.errors,
+                    warnings = excluded.warnings,
+                    missing = excluded.missing,
+                    has_issues = excluded.has_issues
+            """, rows)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def prune(self, live_ids: Set[str]) -> int:
+        """Remove results for coins no longer in the database. Returns rows removed."""
+        conn = self._get_conn()
+        try:
+            cached = [row[0] for row in conn.execute("SELECT coin_id FROM coin_results")]
+            stale = [(coin_id,) for coin_id in cached if coin_id not in live_ids]
+            conn.executemany("DELETE FROM coin_results WHERE coin_id = ?", stale)
+            conn.commit()
+            return len(stale)
+        finally:
+            conn.close()
+
+    def get_counts(self) -> Dict[str, int]:
+        """Total, valid and invalid coins across cached results."""
+        conn = self._get_conn()
+        try:
+            row = conn.execute("""
+                SELECT COUNT(*) as total, COALESCE(SUM(valid), 0) as valid
+                FROM coin_results
+            """).fetchone()
+            return {'total': row['total'], 'valid': row['valid'], 'invalid': row['total'] - row['valid']}
+        finally:
+            conn.close()
+
+    def iter_issues(self, chunk_size: int = 1000) -> Iterator[Dict]:
+        """Yield cached results with errors, warnings or missing fields, in report order."""
+        conn = self._get_conn()
+        try:
+            cursor = conn.execute("""
+                SELECT pcgs_number, errors, warnings, missing FROM coin_results
+                WHERE has_issues = 1
+                ORDER BY series, year, pcgs_number
+            """)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield {
+                        'pcgsNumber': row['pcgs_number'],
+                        'errors': self._load_errors(row['errors']),
+                        'warnings': self._load_errors(row['warnings']),
+                        'missing': json.loads(row['missing']),
+                    }
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _dump_errors(errors: List[ValidationError]) -> str:
+        return json.dumps([[e.field, e.message, e.value, e.coin_identifier] for e in errors], default=str)
+
+    @staticmethod
+    def _load_errors(data: str) -> List[ValidationError]:
+        return [ValidationError(field=f, message=m, value=v, coin_identifier=c) for f, m, v, c in json.loads(data)]
@@ -0,0 +1,4 @@
+-- Store PCGS graded population alongside each price guide row
+-- Populated by the coin_scraper API refresher from GetCoinFacts responses
+
+ALTER TABLE "CoinPriceGuide" ADD COLUMN IF NOT EXISTS "population" INTEGER;
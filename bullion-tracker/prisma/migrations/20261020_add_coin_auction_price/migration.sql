@@ -0,0 +1,28 @@
+-- Realized auction prices ingested from the PCGS AuctionPrices API
+-- One row per auction lot; lotKey dedupes lots seen in repeated fetches
+
+CREATE TABLE IF NOT EXISTS "CoinAuctionPrice" (
+    "id" TEXT NOT NULL,
+    "coinReferenceId" TEXT NOT NULL,
+    "pcgsNumber" INTEGER NOT NULL,
+    "gradeCode" VARCHAR(10),
+    "saleDate" DATE NOT NULL,
+    "price" DECIMAL(12,2) NOT NULL,
+    "auctionHouse" VARCHAR(100),
+    "saleName" VARCHAR(200),
+    "lotNumber" VARCHAR(30),
+    "certNumber" VARCHAR(20),
+    "lotKey" VARCHAR(40) NOT NULL,
+    "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "CoinAuctionPrice_pkey" PRIMARY KEY ("id"),
+    CONSTRAINT "CoinAuctionPrice_coinReferenceId_fkey" FOREIGN KEY ("coinReferenceId")
+        REFERENCES "CoinReference"("id") ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS "CoinAuctionPrice_lotKey_key"
+ON "CoinAuctionPrice"("lotKey");
+
+-- Valuation lookups and the per-coin incremental watermark (MAX saleDate)
+CREATE INDEX IF NOT EXISTS "CoinAuctionPrice_pcgsNumber_gradeCode_saleDate_idx"
+ON "CoinAuctionPrice"("pcgsNumber", "gradeCode", "saleDate");
@@ -0,0 +1,53 @@
+-- Latest known price per (coin, grade), kept current by a trigger on CoinPriceGuide
+-- Staleness and refresh-candidate queries read this instead of grouping all price history
+
+CREATE TABLE IF NOT EXISTS "CoinLatestPrice" (
+    "coinReferenceId" TEXT NOT NULL,
+    "gradeCode" VARCHAR(10) NOT NULL,
+    "pcgsPrice" DECIMAL(12,2),
+    "population" INTEGER,
+    "priceDate" DATE NOT NULL,
+    "updatedAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "CoinLatestPrice_pkey" PRIMARY KEY ("coinReferenceId", "gradeCode"),
+    CONSTRAINT "CoinLatestPrice_coinReferenceId_fkey" FOREIGN KEY ("coinReferenceId")
+        REFERENCES "CoinReference"("id") ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS "CoinLatestPrice_priceDate_idx"
+ON "CoinLatestPrice"("priceDate");
+
+-- Every CoinPriceGuide writer (scraper, API refresher, seed scripts, web app)
+-- goes through this trigger. Rows older than the stored date are ignored, and a
+-- NULL price or population keeps the last known value.
+CREATE OR REPLACE FUNCTION coin_latest_price_update() RETURNS trigger AS $$
+BEGIN
+  INSERT INTO "CoinLatestPrice" ("coinReferenceId", "gradeCode", "pcgsPrice", "population", "priceDate", "updatedAt")
+  VALUES (NEW."coinReferenceId", NEW."gradeCode", NEW."pcgsPrice", NEW.population, NEW."priceDate", NOW())
+  ON CONFLICT ("coinReferenceId", "gradeCode") DO UPDATE SET
+    "pcgsPrice" = COALESCE(EXCLUDED."pcgsPrice", "CoinLatestPrice"."pcgsPrice"),
+    population = COALESCE(EXCLUDED.population, "CoinLatestPrice".population),
+    "priceDate" = EXCLUDED."priceDate",
+    "updatedAt" = NOW()
+  WHERE EXCLUDED."priceDate" >= "CoinLatestPrice"."priceDate";
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS coin_latest_price_trigger ON "CoinPriceGuide";
+CREATE TRIGGER coin_latest_price_trigger
+AFTER INSERT OR UPDATE ON "CoinPriceGuide"
+FOR EACH ROW EXECUTE FUNCTION coin_latest_price_update();
+
+-- Backfill from existing price history, matching what the trigger would
+-- produce had it seen every row: latest date, latest non-NULL price and population
+INSERT INTO "CoinLatestPrice" ("coinReferenceId", "gradeCode", "pcgsPrice", "population", "priceDate")
+SELECT
+    "coinReferenceId",
+    "gradeCode",
+    (ARRAY_AGG("pcgsPrice" ORDER BY "priceDate" DESC) FILTER (WHERE "pcgsPrice" IS NOT NULL))[1],
+    (ARRAY_AGG(population ORDER BY "priceDate" DESC) FILTER (WHERE population IS NOT NULL))[1],
+    MAX("priceDate")
+FROM "CoinPriceGuide"
+GROUP BY "coinReferenceId", "gradeCode"
+ON CONFLICT ("coinReferenceId", "gradeCode") DO NOTHING;
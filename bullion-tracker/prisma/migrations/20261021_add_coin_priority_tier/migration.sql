@@ -0,0 +1,8 @@
+-- Store each coin's refresh priority tier (0 = P0 ... 3 = P3) instead of deriving
+-- it from series names at query time. Values are written from coin_scraper's
+-- COIN_SERIES by scripts/sync_priorities.py and by the scraper on save.
+
+ALTER TABLE "CoinReference" ADD COLUMN IF NOT EXISTS "priorityTier" INTEGER;
+
+CREATE INDEX IF NOT EXISTS "CoinReference_priorityTier_idx"
+ON "CoinReference"("priorityTier");
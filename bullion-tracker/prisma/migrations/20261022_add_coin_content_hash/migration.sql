@@ -0,0 +1,7 @@
+-- Hash of each coin's CoinFacts detail page (data-bearing region only) and
+-- the last time the page was fetched. The scraper skips parsing and saving
+-- when a page still hashes the same, touching only "lastVerifiedAt", so
+-- "updatedAt" keeps meaning "data last changed".
+
+ALTER TABLE "CoinReference" ADD COLUMN IF NOT EXISTS "contentHash" VARCHAR(64);
+ALTER TABLE "CoinReference" ADD COLUMN IF NOT EXISTS "lastVerifiedAt" TIMESTAMP(3);